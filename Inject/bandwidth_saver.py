@@ -0,0 +1,156 @@
+"""Bandwidth saver - request routing for a low-bandwidth viewer mode"""
+import collections
+import re
+import threading
+
+
+# Only these requests go through the Python route handler; everything else is untouched
+ROUTE_PATTERN = re.compile(
+    r'^https?://('
+    r'[^/]*googleusercontent\.com/'
+    r'|[^/]*googlevideo\.com/'
+    r'|[^/]*google-analytics\.com/'
+    r'|csi\.gstatic\.com/'
+    r'|play\.google\.com/log'
+    r'|[^/]*\.google\.com/.*gen_204'
+    r'|[^/]*\.google\.com/log'
+    r')'
+)
+
+# Video streams: dedicated hosts, or googleusercontent media with a video suffix (=dv, =m18, =m22, =m37 ...)
+VIDEO_PATTERN = re.compile(r'googlevideo\.com/|video-downloads\.googleusercontent\.com/|=(dv|m\d+)(-[^/?#]*)?(\?|$)')
+BEACON_PATTERN = re.compile(r'google-analytics\.com/|csi\.gstatic\.com/|play\.google\.com/log|gen_204|\.google\.com/log')
+
+# Image size options after the last '=' in googleusercontent URLs, e.g. =w1920-h1080-no, =s0, =w2400-h1600-k-no
+SIZE_OPTIONS_PATTERN = re.compile(r'=((?:[a-z]+\d*-?)+)(\?[^#]*)?$')
+
+MAX_PENDING_SCALES = 500  # rewritten requests awaiting a response; oldest dropped (failed/cancelled loads)
+
+
+def _requested_size(options):
+    """Return (width, height) requested by an options string; 0 means original size."""
+    width = height = None
+    for opt in options.split('-'):
+        m = re.fullmatch(r'([wsh])(\d+)', opt)
+        if not m:
+            continue
+        kind, value = m.group(1), int(m.group(2))
+        if kind == 's':
+            width = height = value
+        elif kind == 'w':
+            width = value
+        else:
+            height = value
+    if width is None and height is None:
+        return None
+    return (width if width is not None else height, height if height is not None else width)
+
+
+def rewrite_image_url(url, max_size):
+    """Return (new_url, scale) with size options capped at max_size px; (url, 1.0) if untouched.
+
+    scale is the approximate pixel-count ratio original/new, used to estimate bytes saved.
+    """
+    m = SIZE_OPTIONS_PATTERN.search(url)
+    if not m:
+        return url, 1.0
+    size = _requested_size(m.group(1))
+    if size is None:
+        return url, 1.0
+    width, height = size
+    longest = max(width, height)
+    if longest != 0 and longest <= max_size:
+        return url, 1.0
+    # s0 / w0 means "original"; assume a 12 MP photo (4000 px long side)
+    longest = longest or 4000
+    query = m.group(2) or ''
+    new_url = url[:m.start()] + f'=w{max_size}-h{max_size}-no' + query
+    return new_url, (longest / max_size) ** 2
+
+
+class BandwidthSaver:
+    """page/context.route handler that shrinks photos and drops video and telemetry.
+
+    Note: Playwright disables the HTTP cache while any route is registered.
+    """
+
+    def __init__(self, max_image_size=1024, block_video=True, block_beacons=True):
+        self.max_image_size = max_image_size
+        self.block_video = block_video
+        self.block_beacons = block_beacons
+        self._lock = threading.Lock()
+        self._scales = collections.OrderedDict()  # original request URL -> scale
+        self.counts = {'rewritten': 0, 'video_blocked': 0, 'beacons_blocked': 0, 'passed': 0}
+        self.bytes_received = 0
+        self.bytes_saved_estimate = 0
+
+    def install(self, context):
+        """Register the route handler and response accounting on the context."""
+        context.route(ROUTE_PATTERN, self._handle)
+        context.on('response', self._on_response)
+        print(f'[BANDWIDTH] Low-bandwidth mode: images capped at {self.max_image_size}px, '
+              f'video {"blocked" if self.block_video else "allowed"}, '
+              f'beacons {"blocked" if self.block_beacons else "allowed"}')
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _handle(self, route):
+        request = route.request
+        url = request.url
+        try:
+            if self.block_beacons and BEACON_PATTERN.search(url):
+                self._count('beacons_blocked')
+                route.abort()
+                return
+            if self.block_video and (request.resource_type == 'media' or VIDEO_PATTERN.search(url)):
+                self._count('video_blocked')
+                route.abort()
+                return
+            if request.resource_type == 'image' and 'googleusercontent.com/' in url:
+                new_url, scale = rewrite_image_url(url, self.max_image_size)
+                if new_url != url:
+                    with self._lock:
+                        self.counts['rewritten'] += 1
+                        # Responses report the original request URL, not the one continue_() sent
+                        self._scales[url] = scale
+                        while len(self._scales) > MAX_PENDING_SCALES:
+                            self._scales.popitem(last=False)
+                    route.continue_(url=new_url)
+                    return
+            self._count('passed')
+            route.continue_()
+        except Exception as e:
+            # Never break the page over accounting; let the request through untouched
+            print(f'[BANDWIDTH] route error for {url[:80]}: {e}')
+            try:
+                route.continue_()
+            except Exception:
+                pass
+
+    def _on_response(self, response):
+        with self._lock:
+            scale = self._scales.pop(response.request.url, None) or self._scales.pop(response.url, None)
+        if scale is None:
+            return
+        try:
+            size = int(response.headers.get('content-length', 0))
+        except (TypeError, ValueError):
+            size = 0
+        with self._lock:
+            self.bytes_received += size
+            self.bytes_saved_estimate += int(size * (scale - 1))
+
+    def report(self):
+        """Return printable lines with request counts and estimated bytes saved."""
+        with self._lock:
+            counts = dict(self.counts)
+            received = self.bytes_received
+            saved = self.bytes_saved_estimate
+        return [
+            f'[BANDWIDTH] Images rewritten to <= {self.max_image_size}px: {counts["rewritten"]} '
+            f'({received / 1e6:.1f} MB received, ~{saved / 1e6:.1f} MB saved)',
+            f'[BANDWIDTH] Video streams blocked: {counts["video_blocked"]}, '
+            f'beacons blocked: {counts["beacons_blocked"]}, passed through: {counts["passed"]}',
+        ]
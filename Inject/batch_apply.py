@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Batch apply - run a manifest of description edits without the Tk UI.
+
+Manifest: one JSON object per line.
+    {"photo": "AF1QipN...", "op": "append", "text": "Dennis "}
+    {"url": "https://photos.google.com/photo/AF1QipN...", "op": "set", "text": "Beach, 1998"}
+    {"photo": "AF1QipM...", "op": "remove_name", "text": "Billy Keefer"}
+    {"photo": "AF1QipK...", "op": "ensure", "text": "Dennis Laura "}
+ops: append, set, delete_all, remove_name (no text = the last name), and
+ensure (make the description equal text with the smallest edit; photos that
+already match are only read, and recorded as skipped)
+
+Each record's outcome (status, description before/after, latency) is
+appended to the output file as soon as it is done, so --resume after a
+crash or Ctrl+C skips everything already applied and retries failures.
+
+--tabs N spreads the manifest over N tabs of the same Chrome (see
+tab_pool.py); results are then written in completion order, not manifest order.
+
+Usage:
+    python inject.py batch --manifest edits.jsonl [--output results.jsonl] [--headless] [--resume] [--tabs 4]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import cli_options
+from latency_stats import LatencyStats
+from photo_ids import photo_id_from_url
+
+
+DONE_STATUSES = ('ok', 'skipped')
+REPORT_INTERVAL = 10.0  # seconds between live throughput lines
+
+
+def read_manifest(path):
+    """Yield (line number, record dict or None, problem) for each non-blank manifest line."""
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f'bad JSON: {e}'
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, 'record is not an object'
+                continue
+            photo = record.get('photo') or record.get('url') or record.get('id')
+            if not photo or not record.get('op'):
+                yield line_no, None, 'record needs "photo" (ID or URL) and "op"'
+                continue
+            yield line_no, dict(record, photo=photo), None
+
+
+def load_done(output_path):
+    """Line numbers the output file already records as done (ok/skipped)."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # partial last line from a crash
+            if result.get('status') in DONE_STATUSES:
+                done.add(result.get('line'))
+    return done
+
+
+class BatchRunner:
+    """Streams a manifest through BrowserController.apply_edit() and records every outcome."""
+
+    def __init__(self, browser, manifest, output, resume=False, verify=False, tabs=1):
+        """Args:
+            browser: A started BrowserController
+            manifest / output: JSONL paths (output is appended to)
+            resume: Skip records the output already has as done
+            verify: Read every description back after the edit
+            tabs: Apply edits on this many tabs in parallel (1 = the controller's own page)
+        """
+        self.browser = browser
+        self.manifest = manifest
+        self.output = output
+        self.resume = resume
+        self.verify = verify
+        self.tabs = tabs
+        self.pool = None
+        self._out = None
+        self.latency = LatencyStats(max_samples=100000)
+        self.counts = {'ok': 0, 'skipped': 0, 'error': 0, 'resumed': 0}
+        self._started = None
+        self._last_report = 0.0
+
+    def run(self):
+        done = load_done(self.output) if self.resume else set()
+        if done:
+            print(f'[BATCH] Resuming: {len(done)} records already done in {self.output}')
+        self._started = time.perf_counter()
+        self._last_report = self._started
+        with open(self.output, 'a', encoding='utf-8') as out:
+            self._out = out
+            try:
+                if self.tabs > 1:
+                    self._run_pool(done)
+                else:
+                    for line_no, record, problem in self._pending(done):
+                        self._write(self._apply(line_no, record, problem))
+            except KeyboardInterrupt:
+                print('\n[BATCH] Interrupted; run again with --resume to continue')
+        self._progress(final=True)
+        return self.counts['error'] == 0
+
+    def _pending(self, done):
+        for line_no, record, problem in read_manifest(self.manifest):
+            if line_no in done:
+                self.counts['resumed'] += 1
+                continue
+            yield line_no, record, problem
+
+    def _write(self, result):
+        self._out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self._out.flush()
+        self._progress()
+
+    def _run_pool(self, done):
+        from tab_pool import TabPool
+        self.pool = TabPool(self.browser.cdp_endpoint(), tabs=self.tabs, catalog=self.browser.name_catalog,
+                            journal=self.browser.journal, verify=self.verify)
+
+        def records():
+            for line_no, record, problem in self._pending(done):
+                if problem:
+                    self._write(self._apply(line_no, record, problem))  # nothing to send to a tab
+                else:
+                    yield line_no, record
+
+        def on_result(line_no, record, outcome):
+            result = {'line': line_no, 'ts': time.time(),
+                      'photo_id': photo_id_from_url(record['photo']) or record['photo'], 'op': record['op']}
+            self._write(self._record(result, outcome, outcome.pop('seconds', 0.0)))
+
+        self.pool.run(records(), on_result)
+
+    def _apply(self, line_no, record, problem):
+        result = {'line': line_no, 'ts': time.time()}
+        if problem:
+            result.update(status='error', error=problem)
+            self.counts['error'] += 1
+            return result
+        photo, op = record['photo'], record['op']
+        result.update(photo_id=photo_id_from_url(photo) or photo, op=op)
+        start = time.perf_counter()
+        outcome = self.browser.apply_edit(photo, op, record.get('text'), verify=self.verify)
+        return self._record(result, outcome, time.perf_counter() - start)
+
+    def _record(self, result, outcome, seconds):
+        line_no, op = result['line'], result['op']
+        status = outcome.get('status', 'error')
+        self.latency.record(op, status, seconds)
+        self.counts[status] = self.counts.get(status, 0) + 1
+        result.update(outcome, ms=round(seconds * 1000, 1))
+        if status == 'error':
+            print(f'[BATCH] line {line_no}: {op} on {result["photo_id"]} failed: {outcome.get("error")}')
+        return result
+
+    def _progress(self, final=False):
+        now = time.perf_counter()
+        if not final and now - self._last_report < REPORT_INTERVAL:
+            return
+        self._last_report = now
+        c = self.counts
+        applied = c['ok'] + c['skipped'] + c['error']
+        minutes = (now - self._started) / 60
+        rate = applied / minutes if minutes > 0 else 0.0
+        print(f'[BATCH] {applied} records in {minutes * 60:.0f} s, {rate:.1f} photos/min '
+              f'(ok {c["ok"]}, skipped {c["skipped"]}, errors {c["error"]}, already done {c["resumed"]})')
+        if final:
+            for line in self.latency.report(title='BATCH'):
+                print(line)
+            for line in (self.pool.report() if self.pool else []):
+                print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='inject.py batch', description='Apply a manifest of description edits (no UI)')
+    parser.add_argument('--manifest', required=True, help='JSONL file of {photo, op, text} records')
+    parser.add_argument('--output', help='JSONL results file (default: <manifest>.results.jsonl)')
+    parser.add_argument('--headless', action='store_true', help='Run Chrome without a window')
+    parser.add_argument('--resume', action='store_true', help='Skip records already done in the results file')
+    parser.add_argument('--verify', action='store_true', help='Read every description back after editing it')
+    parser.add_argument('--tabs', type=int, default=1, metavar='N',
+                        help='Apply edits on N tabs in parallel; slow or failing tabs are closed (default 1)')
+    parser.add_argument('--debug', action='store_true', help='Print page metric samples')
+    cli_options.add_browser_arguments(parser, session_resume=False)
+    args = parser.parse_args(argv)
+    output = args.output or os.path.splitext(args.manifest)[0] + '.results.jsonl'
+
+    from browser_controller import BrowserController
+    # The batch keeps its place in the results file; the UI's session checkpoint is left alone
+    browser = BrowserController(**cli_options.controller_options(args, resume='never',
+                                                                  extra_connections=args.tabs > 1))
+    try:
+        browser.start(headful=not args.headless, timeout=60)
+        ok = BatchRunner(browser, args.manifest, output, resume=args.resume, verify=args.verify,
+                         tabs=max(1, args.tabs)).run()
+    finally:
+        browser.stop()
+    print(f'[BATCH] Results in {output}')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Measure per-photo settle time with and without the animation-free render profile.
+
+Loads test_viewer.html (a local stand-in for the Google Photos viewer with
+animated slide transitions), presses ArrowRight N times and reports:
+  - settle:  arrow key -> new slide's textarea visible and no animations running
+  - wait:    what BrowserController._wait_for_slide_settle would spend per photo
+
+Usage:
+    python bench_settle.py [--photos 30] [--headful] [--viewport 1024x768]
+"""
+import argparse
+import os
+import pathlib
+import time
+
+from playwright.sync_api import sync_playwright
+
+import render_profile
+from render_profile import SETTLE_WAITS, SLIDE_READY_JS
+
+
+SETTLED_JS = """(oldUrl) => {
+    if (location.href === oldUrl) return false;
+    const ta = Array.from(document.querySelectorAll('textarea[aria-label="Description"]'))
+        .find(t => t.closest('[aria-hidden="false"]'));
+    if (!ta || ta.offsetHeight === 0) return false;
+    return document.getAnimations().every(a => a.playState !== 'running');
+}"""
+
+
+def run(browser, no_animations, photos, viewport):
+    """Return (settle_ms list, wait_ms list) for one profile."""
+    options = render_profile.launch_options(no_animations, viewport)
+    context = browser.new_context(**options)
+    if no_animations:
+        render_profile.install_init_script(context)
+    page = context.new_page()
+    page.goto(pathlib.Path(os.path.dirname(os.path.abspath(__file__)), 'test_viewer.html').as_uri())
+    if no_animations:
+        render_profile.apply_to_page(page)
+    page.click('body')
+
+    waits = SETTLE_WAITS['no_animation' if no_animations else 'default']
+    settle_ms = []
+    wait_ms = []
+    for _ in range(photos):
+        old_url = page.url
+        start = time.perf_counter()
+        page.keyboard.press('ArrowRight')
+        page.wait_for_function(SETTLED_JS, arg=old_url, timeout=5000)
+        settle_ms.append((time.perf_counter() - start) * 1000)
+
+        # What the controller would wait on this profile (same logic as _wait_for_slide_settle)
+        old_url = page.url
+        start = time.perf_counter()
+        page.keyboard.press('ArrowRight')
+        if no_animations:
+            try:
+                page.wait_for_function(SLIDE_READY_JS, arg=old_url, timeout=waits['after_arrow'])
+            except Exception:
+                pass  # timed out - same as the fixed wait
+        else:
+            page.wait_for_timeout(waits['after_arrow'])
+        wait_ms.append((time.perf_counter() - start) * 1000 + waits['after_click'])
+        # Let the slide finish before the next press (not part of the measurement)
+        page.wait_for_function(SETTLED_JS, arg=old_url, timeout=5000)
+    context.close()
+    return settle_ms, wait_ms
+
+
+def _avg(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Animation-free profile settle benchmark')
+    parser.add_argument('--photos', type=int, default=30)
+    parser.add_argument('--headful', action='store_true')
+    parser.add_argument('--viewport', metavar='WxH', help='Also shrink the viewport, e.g. 1024x768')
+    args = parser.parse_args()
+    viewport = render_profile.parse_viewport(args.viewport)
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not args.headful)
+        base_settle, base_wait = run(browser, False, args.photos, None)
+        fast_settle, fast_wait = run(browser, True, args.photos, viewport)
+        browser.close()
+
+    print(f'[BENCH] {args.photos} photos per profile')
+    print(f'[BENCH] default       settle {_avg(base_settle):7.1f} ms/photo   controller wait {_avg(base_wait):7.1f} ms/photo')
+    print(f'[BENCH] no-animation  settle {_avg(fast_settle):7.1f} ms/photo   controller wait {_avg(fast_wait):7.1f} ms/photo')
+    print(f'[BENCH] saved per photo: settle {_avg(base_settle) - _avg(fast_settle):7.1f} ms, '
+          f'controller wait {_avg(base_wait) - _avg(fast_wait):7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
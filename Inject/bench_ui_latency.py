@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure Tk event latency while the browser worker is busy, in-thread vs child process.
+
+The load mimics what stalls the UI today: the worker decoding large JSON
+results (dump analysis, extraction on photos with many face chips). It runs
+  - idle:     no load (baseline)
+  - thread:   in a thread of the UI process, like BrowserController's worker
+  - process:  in a child process, like inject.py --process
+and reports, per mode:
+  - key_event:  event_generate('<KeyPress>') -> handler runs
+  - timer:      lateness of a 10 ms root.after tick
+
+Usage:
+    python bench_ui_latency.py [--seconds 5] [--payload-kb 2048]
+"""
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+import tkinter as tk
+
+from latency_stats import LatencyStats
+
+
+def make_payload(kb):
+    """JSON text shaped like a page analysis result, roughly `kb` kilobytes."""
+    chip = {'name': 'Person', 'selector': 'span.Y8X4Pc', 'rect': [10, 20, 30, 40], 'visible': True}
+    count = max(1, kb * 1024 // len(json.dumps(chip)))
+    return json.dumps({'chips': [dict(chip, index=i) for i in range(count)]})
+
+
+def busy_loop(payload, stop):
+    """Decode and re-encode the payload until `stop` is set."""
+    while not stop.is_set():
+        json.dumps(json.loads(payload))
+
+
+def measure(root, seconds, stats, mode):
+    """Sample key-event and timer latency on the Tk mainloop for `seconds`."""
+    end = time.perf_counter() + seconds
+    state = {'sent': None}
+
+    def on_key(_event):
+        if state['sent'] is not None:
+            stats.record('key_event', mode, time.perf_counter() - state['sent'])
+            state['sent'] = None
+
+    def tick(expected):
+        now = time.perf_counter()
+        stats.record('timer', mode, max(0.0, now - expected))
+        if now >= end:
+            root.quit()
+            return
+        state['sent'] = time.perf_counter()
+        root.event_generate('<KeyPress-a>', when='tail')
+        root.after(10, tick, time.perf_counter() + 0.010)
+
+    root.bind('<KeyPress-a>', on_key)
+    root.after(10, tick, time.perf_counter() + 0.010)
+    root.mainloop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UI event latency with a busy browser worker')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--payload-kb', type=int, default=2048)
+    args = parser.parse_args()
+
+    payload = make_payload(args.payload_kb)
+    stats = LatencyStats(max_samples=100000)
+    root = tk.Tk()
+    root.geometry('200x50')
+    root.focus_force()
+
+    measure(root, args.seconds, stats, 'idle')
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(payload, stop), daemon=True)
+    worker.start()
+    measure(root, args.seconds, stats, 'thread')
+    stop.set()
+    worker.join()
+
+    ctx = multiprocessing.get_context('spawn')
+    stop = ctx.Event()
+    child = ctx.Process(target=busy_loop, args=(payload, stop), daemon=True)
+    child.start()
+    measure(root, args.seconds, stats, 'process')
+    stop.set()
+    child.join()
+    root.destroy()
+
+    print(f'[BENCH] {args.seconds:.0f} s per mode, busy worker decoding {args.payload_kb} KB JSON')
+    for line in stats.report(title='BENCH'):
+        print(line)
+    for op in ('key_event', 'timer'):
+        thread = stats.summary(op, 'thread')
+        process = stats.summary(op, 'process')
+        if thread and process:
+            print(f'[BENCH] {op}: p95 {thread["p95"]:.1f} ms in-thread vs {process["p95"]:.1f} ms with a child process')
+
+
+if __name__ == '__main__':
+    main()
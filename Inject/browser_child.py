@@ -0,0 +1,66 @@
+"""Browser child - entry module of the browser worker process started by browser_process.py
+
+A spawned child re-imports the parent's __main__ module. BrowserProcess makes
+this module __main__ while it starts the child, so the child only loads the
+controller and not inject.py with its argparse, tkinter and UI imports.
+"""
+import threading
+
+
+PUBLISH_INTERVAL = 0.1  # seconds between snapshot publishes
+
+
+def child_main(conn, options, shm_name, headful):
+    """Child process: own the BrowserController, serve pipe requests, publish state."""
+    from browser_controller import BrowserController
+    from browser_daemon import BrowserDaemon, BLOCKING_METHODS
+    from browser_process import SharedState
+
+    controller = BrowserController(**options)
+    server = BrowserDaemon(controller)  # dispatch only; no socket
+    state = SharedState(name=shm_name)
+    send_lock = threading.Lock()
+    stopping = threading.Event()
+
+    def reply(message):
+        with send_lock:
+            try:
+                conn.send(message)
+            except (OSError, EOFError):
+                pass
+
+    def handle(request):
+        response = server.dispatch(request)
+        if request.get('id') is not None:
+            reply(response)
+        elif 'error' in response:
+            print(f'[PROCESS] {request.get("method")} ERROR: {response["error"]}')
+
+    def publish():
+        while not stopping.is_set():
+            try:
+                if controller._running:
+                    controller.refresh_state()
+                    state.write(controller.get_state())
+            except Exception as e:
+                print(f'[PROCESS] publish ERROR: {e}')
+            stopping.wait(PUBLISH_INTERVAL)
+
+    controller.launch_async(headful=headful)
+    threading.Thread(target=publish, daemon=True, name='state-publisher').start()
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                break  # parent went away
+            if request.get('method') == 'stop':
+                break
+            if request.get('method') in BLOCKING_METHODS:
+                threading.Thread(target=handle, args=(request,), daemon=True).start()
+            else:
+                handle(request)
+    finally:
+        stopping.set()
+        controller.stop()
+        state.close()
@@ -0,0 +1,263 @@
+"""Browser client - BrowserController-compatible thin client for browser_daemon.py"""
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from browser_daemon import DEFAULT_SOCKET, DAEMON_LOG, encode, socket_alive
+
+
+class BrowserClient:
+    """Same public surface as BrowserController, forwarded to a daemon over its Unix socket.
+
+    stop() only disconnects: the daemon keeps the browser (and the user's place) warm.
+    """
+
+    def __init__(self, socket_path=None, daemon_argv=None):
+        """Args:
+            socket_path: Daemon socket (default ~/.googlephotos_tagger/browser.sock)
+            daemon_argv: Command line to spawn a daemon if none is running (None = never spawn)
+        """
+        self.socket_path = socket_path or DEFAULT_SOCKET
+        self.daemon_argv = daemon_argv
+        self._sock = None
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._reader = None
+        self._running = False
+        self._launch_mode = 'default'
+
+    # ---- connection -------------------------------------------------------
+
+    def connect(self, timeout=15.0):
+        """Connect to the daemon, spawning it first if needed and allowed."""
+        if self._sock:
+            return
+        if not socket_alive(self.socket_path):
+            if not self.daemon_argv:
+                raise RuntimeError(f'No browser daemon on {self.socket_path}')
+            self._spawn_daemon()
+            deadline = time.time() + timeout
+            while not socket_alive(self.socket_path):
+                if time.time() > deadline:
+                    raise RuntimeError(f'Browser daemon did not come up; see {DAEMON_LOG}')
+                time.sleep(0.05)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.socket_path)
+        self._sock = sock
+        self._reader = threading.Thread(target=self._read_loop, args=(sock,), daemon=True,
+                                        name='browser-client')
+        self._reader.start()
+        print(f'[CLIENT] Connected to browser daemon at {self.socket_path}')
+
+    def _spawn_daemon(self):
+        print(f'[CLIENT] Starting browser daemon (log: {DAEMON_LOG})')
+        log = open(DAEMON_LOG, 'ab')
+        subprocess.Popen(self.daemon_argv, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                         start_new_session=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        log.close()
+
+    def _read_loop(self, sock):
+        try:
+            for line in sock.makefile('r', encoding='utf-8'):
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                self._deliver(message)
+        except OSError:
+            pass
+        finally:
+            self._connection_lost()
+
+    def _deliver(self, message):
+        """Hand a response to the caller waiting on its id."""
+        with self._pending_lock:
+            waiter = self._pending.pop(message.get('id'), None)
+        if waiter:
+            ev, res = waiter
+            res.update(message)
+            ev.set()
+
+    def _connection_lost(self):
+        self._running = False
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for ev, res in pending.values():
+            res['error'] = 'connection to browser daemon lost'
+            ev.set()
+
+    def _connected(self):
+        return self._sock is not None
+
+    def _send(self, message):
+        self._sock.sendall(encode(message))
+
+    def _call(self, method, *args, timeout=10.0):
+        """Send a request and wait for its response; raises RuntimeError on daemon-side errors."""
+        if not self._connected():
+            raise RuntimeError('Browser not running')
+        rid = next(self._ids)
+        ev = threading.Event()
+        res = {}
+        with self._pending_lock:
+            self._pending[rid] = (ev, res)
+        try:
+            with self._send_lock:
+                self._send({'id': rid, 'method': method, 'args': list(args)})
+        except OSError as e:
+            with self._pending_lock:
+                self._pending.pop(rid, None)
+            self._running = False
+            raise RuntimeError(f'connection to browser daemon lost: {e}')
+        if not ev.wait(timeout):
+            with self._pending_lock:
+                self._pending.pop(rid, None)
+            raise RuntimeError(f'browser daemon did not answer {method} in {timeout:.0f}s')
+        if 'error' in res:
+            raise RuntimeError(res['error'])
+        return res.get('result')
+
+    # ---- lifecycle ----------------------------------------------------------
+
+    def launch_async(self, headful=True):
+        self.connect()
+        return self._call('launch_async', headful)
+
+    def start(self, headful=True, timeout=30):
+        """Connect and wait until the daemon's browser is ready (instant if already warm)."""
+        self.connect()
+        self._call('start', headful, timeout, timeout=timeout + 5)
+        self._running = True
+
+    def wait_ready(self, timeout=30):
+        self._call('wait_ready', timeout, timeout=timeout + 5)
+        self._running = True
+
+    def stop(self):
+        """Disconnect; the daemon and its browser keep running."""
+        self._running = False
+        sock, self._sock = self._sock, None
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def status(self):
+        return self._call('status')
+
+    def shutdown_daemon(self):
+        """Stop the daemon and its browser."""
+        self._call('shutdown')
+        self.stop()
+
+    # ---- BrowserController API ----------------------------------------------
+
+    def goto_next_photo(self):
+        self._call('goto_next_photo')
+
+    def goto_prev_photo(self):
+        self._call('goto_prev_photo')
+
+    def append_text(self, text):
+        self._call('append_text', text)
+
+    def send_backspace(self):
+        self._call('send_backspace')
+
+    def send_keystroke(self, key):
+        self._call('send_keystroke', key)
+
+    def delete_all_description(self):
+        self._call('delete_all_description')
+
+    def remove_name(self, name):
+        self._call('remove_name', name)
+
+    def remove_last_name(self):
+        self._call('remove_last_name')
+
+    def undo(self):
+        self._call('undo')
+
+    def fast_forward(self, limit=None):
+        self._call('fast_forward', limit)
+
+    def cancel_fast_forward(self):
+        self._call('cancel_fast_forward')
+
+    def jump_to(self, target):
+        self._call('jump_to', target)
+
+    def redo(self):
+        self._call('redo')
+
+    def read_description(self, timeout=5.0):
+        return self._call('read_description', timeout, timeout=timeout + 2)
+
+    def dump_html(self):
+        self._call('dump_html')
+
+    def textarea_registry_stats(self, timeout=5.0):
+        return self._call('textarea_registry_stats', timeout, timeout=timeout + 2)
+
+    def throttle_status(self, timeout=5.0):
+        return self._call('throttle_status', timeout, timeout=timeout + 2)
+
+    def read_names(self, timeout=5.0):
+        return self._call('read_names', timeout, timeout=timeout + 2)
+
+    def read_url(self, timeout=5.0):
+        return self._call('read_url', timeout, timeout=timeout + 2)
+
+    def goto_photo(self, photo, timeout=30.0):
+        return self._call('goto_photo', photo, timeout, timeout=timeout + 2)
+
+    def ensure_description(self, photo, desired, timeout=60.0):
+        return self._call('ensure_description', photo, desired, timeout, timeout=timeout + 2)
+
+    def apply_edit(self, photo, op, text=None, verify=False, timeout=60.0):
+        return self._call('apply_edit', photo, op, text, verify, timeout, timeout=timeout + 2)
+
+    def refresh_state(self):
+        if self._connected():
+            self._call('refresh_state')
+
+    def get_state(self):
+        if not self._connected():
+            return {'url': None, 'description': None, 'names': None}
+        return self._call('get_state')
+
+    def dump_analysis(self):
+        # Output goes to the daemon's console/log
+        self._call('dump_analysis', timeout=60.0)
+
+    def bandwidth_report(self):
+        return self._call('bandwidth_report')
+
+    def latency_report(self):
+        return self._call('latency_report')
+
+    def resume_info(self):
+        return self._call('resume_info')
+
+    def resume_session(self):
+        self._call('resume_session')
+
+    def discard_resume(self):
+        self._call('discard_resume')
+
+
+def daemon_command(argv):
+    """Command line that runs inject.py as a daemon with the same browser options as `argv`."""
+    forwarded = [a for a in argv if a not in ('--connect', '--daemon')]
+    return [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'inject.py'),
+            '--daemon'] + forwarded
@@ -1,18 +1,172 @@
 """Browser controller - extracted from inject_v3.py"""
+import json
+import os
 import time
 import queue
 import threading
 
-try:
-    from playwright.sync_api import sync_playwright
-except Exception:
-    sync_playwright = None
+from bandwidth_saver import BandwidthSaver
+from cdp_fast_path import CDPFastPath
+from description_edit import normalize, plan_edit, utf16_len, utf16_offset
+import chrome_profile
+from chrome_profile import devtools_endpoint
+from edit_journal import EditJournal
+from latency_stats import LatencyStats
+from library_crawler import PHOTO_INDEX_DB, PhotoIndex, parse_user_date
+from name_catalog import NameCatalog
+from page_health import PageHealthMonitor
+from photo_cache import PhotoCache
+from photo_catalog import PhotoCatalog
+from photo_ids import photo_id_from_url, photo_url
+from read_ahead import ReadAhead
+from read_lane import ReadLane
+import render_profile
+from render_profile import SETTLE_WAITS, SLIDE_READY_JS
+from session_checkpoint import SessionCheckpoint, POSITION_COMMANDS, TRACKED_COMMANDS
+import throttle_guard
+from tmpfs_profile import TmpfsProfile, profile_io
+from selector_profile import SelectorProfile, FIND_VIEWER_IMAGE_JS, FIND_NAMES_JS
+import textarea_registry
+from textarea_registry import ACTIVE_DESCRIPTION_EXPR, REGISTRY_STATS_JS, REGISTRY_SET_SELECTORS_JS
+from undo_history import UndoHistory
+
+
+RESUME_MODES = ('ask', 'auto', 'never')
+
+# Operations apply_edit() accepts (batch manifests)
+EDIT_OPS = ('append', 'set', 'ensure', 'delete_all', 'remove_name')
+
+# Focus the description without scrolling and select it from `offset` to the end; returns the value
+SELECT_DESCRIPTION_JS = """(offset) => {
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    if (!ta) return null;
+    ta.focus({preventScroll: true});
+    ta.setSelectionRange(offset, (ta.value || '').length);
+    return ta.value || '';
+}"""
+
+# Untrimmed description value (trailing spaces matter when appending)
+READ_RAW_DESCRIPTION_JS = """() => {
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    return ta ? (ta.value || '') : null;
+}"""
+
+
+FAST_FORWARD_LIMIT = 5000  # photos one fast-forward may skip
+
+# Remember the slide's textarea before an arrow key (fast-forward)
+MARK_OUTGOING_SLIDE_JS = """() => { window.__gpOutgoing = """ + ACTIVE_DESCRIPTION_EXPR + """; }"""
+
+# True once the URL changed and the active textarea is no longer the marked one, i.e. the
+# outgoing slide is aria-hidden and reads/chip scans see the new photo
+NEW_SLIDE_ACTIVE_JS = """(oldUrl) => {
+    if (location.href === oldUrl) return false;
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    return !!ta && ta !== window.__gpOutgoing;
+}"""
+
+
+def _names_config(path='names.json'):
+    """(names list, special_cases dict) from names.json in the working directory."""
+    with open(path) as f:
+        data = json.load(f)
+    return data.get('names', []), data.get('special_cases', {})
+
+
+def names_to_add(found_names, description, special_cases, log=True):
+    """Detected names (after special-case mapping) that the description does not mention yet.
+
+    Skips year-prefixed and '0'-prefixed chip text. Names are returned in page order,
+    each checked against the description plus the names before it.
+    """
+    desc_normalized = ' '.join((description or '').split()).lower()
+    to_add = []
+    for found_name in found_names or []:
+        name_to_check = ' '.join(found_name.split())
+        if name_to_check and name_to_check[0:4].isdigit():
+            if log:
+                print(f'[NAMES] Skipping year-prefixed text: "{name_to_check}"')
+            continue
+        if name_to_check and name_to_check.startswith("0"):
+            if log:
+                print(f'[NAMES] Skipping name starting with 0: "{name_to_check}"')
+            continue
+        if name_to_check in special_cases:
+            mapped_name = special_cases[name_to_check]
+            if log:
+                print(f'[NAMES] Special case: "{name_to_check}" -> "{mapped_name}"')
+            found_name = mapped_name
+        else:
+            found_name = name_to_check
+        if not found_name or found_name.lower() in desc_normalized:
+            if log:
+                print(f'[NAMES] "{found_name}" already in description, skipping')
+            continue
+        to_add.append(found_name)
+        desc_normalized = ' '.join((desc_normalized + ' ' + found_name.lower()).split())
+    return to_add
+
+
+def _edit_already_applied(cmd, arg, expected, live):
+    """True if the live description already shows the result of a replayed edit.
+
+    Args:
+        expected: Description before the edit, as of the last acknowledged command
+        live: Description on the page now
+    """
+    def norm(text):
+        return ' '.join((text or '').split())
+
+    if cmd == 'delete_all':
+        return not norm(live)
+    if cmd == 'backspace' and not expected[-1:].strip():
+        # Deleting trailing whitespace does not show in the (trimmed) live read; replaying it
+        # could delete a letter instead, so treat it as done
+        return True
+    if norm(live) == norm(expected):
+        return False  # page is still where the edit started from
+    if cmd == 'append_text':
+        return norm(live) == norm(expected + arg[0])
+    if cmd == 'backspace':
+        return norm(live) == norm(expected[:-1])
+    return False
 
 
 class BrowserController:
     """Minimal Playwright wrapper for Google Photos with old device spoofing."""
     
-    def __init__(self):
+    def __init__(self, cdp_fast_path=True, compare_every=0, read_lane=False,
+                 no_animations=False, viewport=None, anti_throttle=True, low_bandwidth=None,
+                 startup_timer=None, cdp_port=None, keep_browser=False, tmpfs_profile=False,
+                 recycle_every=50, recycle_mode='reload', recycle_thresholds=None,
+                 journal=True, resume='ask', read_ahead=0, catalog=True, extra_connections=False,
+                 debug=False):
+        """Args:
+            cdp_fast_path: Use raw CDP calls for hot operations (falls back to Playwright on error)
+            compare_every: Every Nth command uses the Playwright path so latencies can be compared (0 = never)
+            read_lane: Serve reads on a second CDP connection so they never wait behind queued input
+            no_animations: Reduced-motion emulation + zero-duration transitions; waits for the slide instead of sleeping
+            viewport: Optional {'width', 'height'} for a smaller viewport (less to render)
+            anti_throttle: Keep timers/rendering at full speed while Chrome is unfocused or occluded
+            low_bandwidth: Cap photo requests at this many px and block video/telemetry (None = off)
+            startup_timer: Optional StartupTimer that receives browser startup phase marks
+            cdp_port: Fixed remote-debugging port (default: Chrome picks one and reports it in DevToolsActivePort)
+            keep_browser: Start Chrome as its own process and leave it running on stop, so the next start attaches
+            tmpfs_profile: Run Chrome from a copy of the profile in /dev/shm, synced back periodically (live
+                databases excluded) and in full once Chrome has closed
+            recycle_every: Sample the tab's heap/DOM metrics every N photos and recycle it past the limits (0 = off)
+            recycle_mode: 'reload' the current photo URL or open a 'new_page' and close the old one
+            recycle_thresholds: {metric: limit} overriding page_health.DEFAULT_THRESHOLDS
+            journal: Record every description edit in the SQLite edit journal (edit_journal.py)
+            resume: What to do with the last session's checkpoint: 'ask' (the UI offers it via
+                resume_info/resume_session), 'auto' (go straight to it at launch) or 'never'
+            read_ahead: Keep a background tab this many photos ahead, caching their descriptions
+                and names so navigation only has to confirm them on the live page (0 = off)
+            catalog: Keep every description and name seen in the searchable catalog (photo_catalog.py)
+            extra_connections: The caller will connect to cdp_endpoint() (batch tabs, crawler), so
+                Chrome needs a debugging port even without read lane, read-ahead or keep_browser
+            debug: Print page metric samples as they are taken
+        """
         self.playwright = None
         self.context = None
         self.page = None
@@ -20,43 +174,132 @@ class BrowserController:
         self._worker = None
         self._running = False
         self._ready_event = threading.Event()
+        self._start_error = None
+        self._startup = startup_timer
+        self._cdp_port = cdp_port
+        self._keep_browser = keep_browser
+        self._attach_mode = False
+        self._attached = False
+        self.browser = None
+        self._endpoint = None
         self._launch_mode = 'default'
         self._last_url = None
         self._last_description = None
+        self._use_cdp_fast_path = cdp_fast_path
+        self._compare_every = compare_every
+        self._cmd_count = 0
+        self._force_playwright = False
+        self._cdp = None
+        self.latency = LatencyStats()
+        self._use_read_lane = read_lane
+        self._read_lane = None
+        self._read_ahead_depth = read_ahead
+        self._read_ahead = None
+        self.photo_cache = PhotoCache()
+        self._last_names = None
+        self._snapshot_event = None
+        self._lane_state = None
+        self.selectors = SelectorProfile()
+        self._registry_selector_seen = {}
+        self._nav_count = 0
+        self._no_animations = no_animations
+        self._viewport = viewport
+        self._waits = SETTLE_WAITS['no_animation' if no_animations else 'default']
+        self._anti_throttle = anti_throttle
+        self._throttle_session = None
+        self._bandwidth = BandwidthSaver(max_image_size=low_bandwidth) if low_bandwidth else None
+        self._tmpfs = None
+        if tmpfs_profile:
+            if TmpfsProfile.available():
+                self._tmpfs = TmpfsProfile(chrome_profile.profile_dir())
+            else:
+                print('[TMPFS] WARNING: /dev/shm not available, using the on-disk profile')
+        self._user_data_dir = self._tmpfs.runtime_dir if self._tmpfs else chrome_profile.profile_dir()
+        self._owns_tmpfs = False
+        self._io_baseline = None
+        self._health = PageHealthMonitor(recycle_every, recycle_thresholds, recycle_mode) if recycle_every else None
+        self.undo_history = UndoHistory()
+        self.name_catalog = NameCatalog()
+        self.photo_catalog = None
+        if catalog:
+            try:
+                self.photo_catalog = PhotoCatalog()
+            except Exception as e:
+                print(f'[CATALOG] WARNING: photo catalog disabled: {e}')
+        self.journal = None
+        if journal:
+            try:
+                self.journal = EditJournal()
+            except Exception as e:
+                print(f'[JOURNAL] WARNING: edit journal disabled: {e}')
+        if resume not in RESUME_MODES:
+            raise ValueError(f'resume must be one of {RESUME_MODES}')
+        self._resume = resume
+        self._checkpoint = SessionCheckpoint()
+        if resume == 'never':
+            self._checkpoint.discard_previous()
+        self._replaying = False
+        self._ff_cancel = threading.Event()
+        self.fast_forward_stats = None
+        self._photo_index = None
+        self.jump_stats = None
+        self._launch_started = None
+        self._debug = debug
+        # Only open a debugging port on the logged-in profile when something will connect to it
+        self._needs_debug_port = bool(read_lane or read_ahead or keep_browser or extra_connections or cdp_port)
 
     def start(self, headful=True, timeout=30):
-        """Start browser worker thread."""
-        if sync_playwright is None:
-            raise RuntimeError('playwright not installed; run pip install -r requirements.txt')
-        
-        # Check if browser is already running
-        import os
-        import pathlib
-        user_data_dir = str(pathlib.Path.home() / '.googlephotos_profile')
-        lock_file = os.path.join(user_data_dir, 'SingletonLock')
-      
-        if os.path.exists(lock_file):
-            print(f'\n[ERROR] Browser appears to be already running!')
-            print(f'[ERROR] Lock file exists: {lock_file}')
-            print(f'[ERROR] Please close any existing browser windows first.')
-            print(f'[ERROR] If no browser is visible, remove the lock file manually.\n')
-            #raise RuntimeError(f'Browser already running (lock file: {lock_file})')
-            return  # Just return instead of raising exception
+        """Start browser worker thread and wait until it is ready (also waits on a launch in progress)."""
+        if self.launch_async(headful=headful):
+            self.wait_ready(timeout=timeout)
 
+    def launch_async(self, headful=True):
+        """Start the browser worker thread without waiting. Returns False if it could not be started.
 
+        Playwright is imported and Chrome launched on the worker thread, so this
+        returns immediately and the caller can build its UI in the meantime.
+        """
         if self._worker and self._worker.is_alive():
-            return
+            return True
+
+        # A Chrome already running on the profile is reused over CDP (warm caches, no cold launch)
+        if chrome_profile.profile_in_use(self._user_data_dir):
+            print('[BROWSER] Chrome is already running on the tagger profile, attaching over CDP')
+            self._attach_mode = True
+        else:
+            self._attach_mode = self._keep_browser
 
         self._running = True
+        self._start_error = None
+        self._launch_started = time.perf_counter()
         self._ready_event.clear()
-        self._worker = threading.Thread(target=self._worker_main, args=(headful,), daemon=True)
+        self._worker = threading.Thread(target=self._worker_main, args=(headful,), daemon=True,
+                                        name='browser-worker')
         self._worker.start()
+        return True
+
+    def wait_ready(self, timeout=30):
+        """Block until the worker has the page up, raising if startup failed or timed out."""
         ready = self._ready_event.wait(timeout=timeout)
+        if self._start_error:
+            raise RuntimeError(self._start_error)
         if not ready:
             raise RuntimeError('Browser worker did not become ready in time')
 
+    def _mark(self, label):
+        if self._startup:
+            self._startup.mark(label)
+
     def stop(self):
         """Stop browser worker."""
+        if self._read_lane:
+            self._read_lane.stop()
+            self._read_lane = None
+        if self._read_ahead:
+            self._read_ahead.stop()
+            for line in self.photo_cache.report():
+                print(line)
+            self._read_ahead = None
         self._cmd_queue.put(('stop', None))
         self._running = False
         if self._worker:
@@ -64,33 +307,67 @@ class BrowserController:
 
     def _worker_main(self, headful):
         """Main worker thread - runs Playwright with old device spoofing."""
-        import pathlib
         try:
+            # Imported here so the UI thread never pays for loading Playwright
+            try:
+                from playwright.sync_api import sync_playwright
+            except Exception:
+                raise RuntimeError('playwright not installed; run pip install -r requirements.txt')
+            self._mark('playwright imported')
             self.playwright = sync_playwright().start()
-            user_data_dir = str(pathlib.Path.home() / '.googlephotos_profile')
+            self._mark('playwright driver started')
+            user_data_dir = self._user_data_dir
+            # Copy the profile out only when this run starts Chrome (a running one already
+            # uses the tmpfs copy); --keep-browser with no Chrome up launches one too
+            if self._tmpfs and not chrome_profile.profile_in_use(user_data_dir):
+                self._tmpfs.prepare()
+                self._owns_tmpfs = True
+                self._mark('profile copied to tmpfs')
+            if self._tmpfs:
+                self._tmpfs.start_periodic_sync()
+            launch_args = [
+                '--disable-blink-features=AutomationControlled',
+                # '--user-agent=' + user_agent,
+                # '--disable-web-security',
+            ]
+            if self._anti_throttle:
+                launch_args.extend(throttle_guard.launch_args())
+            # Debugging port only for second connections (read lane, read-ahead, batch tabs,
+            # --keep-browser attaches); port 0 = Chrome picks one and reports it in DevToolsActivePort
+            if self._needs_debug_port:
+                launch_args.append(f'--remote-debugging-port={self._cdp_port or 0}')
             
             # Default to iOS 12 iPad (most compatible with Google Photos)
             user_agent = 'Mozilla/5.0 (iPad; CPU OS 12_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/12.0 Mobile/15E148 Safari/604.1'
             print('[BROWSER] Mode: iOS 12 iPad')
             print(f'[BROWSER] Using user agent: {user_agent}')
             
-            self.context = self.playwright.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                headless=not headful,
-                channel='chrome',
-                #user_agent=user_agent,
-                #viewport={'width': 1024, 'height': 768},
-                #device_scale_factor=1,
-                #is_mobile=True,
-                #has_touch=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    # '--user-agent=' + user_agent,
-                    # '--disable-web-security',
-                ],
-            )
+            if self._attach_mode:
+                self._connect_existing(user_data_dir, launch_args, headful)
+            else:
+                self.context = self.playwright.chromium.launch_persistent_context(
+                    user_data_dir=user_data_dir,
+                    headless=not headful,
+                    channel='chrome',
+                    #user_agent=user_agent,
+                    #viewport={'width': 1024, 'height': 768},
+                    #device_scale_factor=1,
+                    #is_mobile=True,
+                    #has_touch=True,
+                    args=launch_args,
+                    **render_profile.launch_options(self._no_animations, self._viewport),
+                )
+                self._mark('chrome launched')
+            if self._no_animations:
+                render_profile.install_init_script(self.context)
+            if self._bandwidth:
+                self._bandwidth.install(self.context)
             
-            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+            textarea_registry.install_init_script(self.context)
+            self._attach_page(self._pick_start_page())
+            if self._attached and self._viewport:
+                self.page.set_viewport_size(self._viewport)
+            self._mark('page attached')
             
             # Additional spoofing via CDP
             try:
@@ -105,11 +382,43 @@ class BrowserController:
             except Exception as e:
                 print(f'[BROWSER] Warning: Could not override navigator properties: {e}')
             
-            self.page.goto('https://photos.google.com')
+            resume_state = None
+            if self._resume == 'auto' and self._checkpoint.resume_info():
+                resume_state = self._checkpoint.adopt_previous()
+
+            # Ready as soon as the navigation commits; the app keeps loading while the
+            # user reaches for the keyboard, and every command finds its elements itself
+            if resume_state:
+                pass  # _do_resume() below goes straight to the checkpointed photo
+            elif 'photos.google.com' in self.page.url:
+                # Attached to a tab that is already on Photos: keep the user's place
+                print(f'[BROWSER] Reusing open Google Photos tab: {self.page.url}')
+            else:
+                self.page.goto('https://photos.google.com', wait_until='commit')
+            self._mark('navigation committed')
             
             print('[BROWSER] Started, navigated to Google Photos')
+            if not resume_state:
+                self._checkpoint.set_position(self.page.url, None, save=False)
             self._ready_event.set()
 
+            if self._use_read_lane:
+                self._read_lane = ReadLane(lambda: self._endpoint or devtools_endpoint(user_data_dir),
+                                           url_hint=lambda: self._last_url or self.page.url,
+                                           latency=self.latency,
+                                           selector_profile=self.selectors)
+                self._read_lane.start()
+
+            if self._read_ahead_depth:
+                self._read_ahead = ReadAhead(lambda: self._endpoint or devtools_endpoint(user_data_dir),
+                                             self.photo_cache, depth=self._read_ahead_depth,
+                                             latency=self.latency, selector_profile=self.selectors,
+                                             catalog=self.photo_catalog)
+                self._read_ahead.start()
+
+            if resume_state:
+                self._do_resume(resume_state)
+
             # Command loop
             while self._running:
                 try:
@@ -119,15 +428,24 @@ class BrowserController:
 
                 if cmd == 'stop':
                     break
-                elif cmd == 'next':
+
+                self._cmd_count += 1
+                self._force_playwright = bool(self._compare_every) and self._cmd_count % self._compare_every == 0
+
+                if cmd == 'next':
                     self._do_next()
+                elif cmd == 'fast_forward':
+                    self._do_fast_forward(arg)
+                elif cmd == 'jump_to':
+                    self._do_jump_to(arg)
                 elif cmd == 'prev':
                     self._do_prev()
                 elif cmd == 'append_x':
                     pass
                 elif cmd == 'append_text':
+                    text, op = arg if isinstance(arg, tuple) else (arg, 'append')
                     try:
-                        self._do_append_text(arg)
+                        self._do_append_text(text, op)
                     except Exception as e:
                         print(f'[APPEND_TEXT] ERROR: {e}')
                 elif cmd == 'read_desc':
@@ -135,6 +453,14 @@ class BrowserController:
                     desc = self._sample_description()
                     res['description'] = desc
                     ev.set()
+                elif cmd == 'throttle_status':
+                    ev, res = arg
+                    res['status'] = self._throttle_status()
+                    ev.set()
+                elif cmd == 'registry_stats':
+                    ev, res = arg
+                    res['stats'] = self._registry_stats()
+                    ev.set()
                 elif cmd == 'dump_html':
                     self._do_dump_html()
                 elif cmd == 'dump_analysis':
@@ -144,11 +470,94 @@ class BrowserController:
                 elif cmd == 'delete_all':
                     self._do_delete_all()
                 elif cmd == 'keystroke':
-                    self.page.keyboard.press(arg)
+                    self._press_key(arg)
+                elif cmd == 'remove_name':
+                    self._do_remove_name(arg)
+                elif cmd == 'goto_photo':
+                    photo, ev, res = arg
+                    try:
+                        res['url'] = self._do_goto_photo(photo)
+                    except Exception as e:
+                        res['error'] = str(e)
+                    finally:
+                        ev.set()
+                elif cmd == 'ensure':
+                    desired, ev, res = arg
+                    try:
+                        res.update(self._do_ensure_description(desired))
+                    except Exception as e:
+                        # e.g. execution context destroyed mid-read: fail this edit, keep the worker
+                        print(f'[ENSURE] ERROR: {e}')
+                        res.update({'status': 'error', 'error': str(e)})
+                    finally:
+                        ev.set()
+                elif cmd == 'apply_edit':
+                    edit, ev, res = arg
+                    try:
+                        res.update(self._do_apply_edit(*edit))
+                    except Exception as e:
+                        print(f'[APPLY_EDIT] ERROR: {e}')
+                        res.update({'status': 'error', 'error': str(e)})
+                    finally:
+                        ev.set()
+                elif cmd in ('undo', 'redo'):
+                    self._do_undo(redo=cmd == 'redo')
+                elif cmd == 'resume':
+                    state = self._checkpoint.adopt_previous()
+                    if state:
+                        self._do_resume(state)
+
+                if cmd in TRACKED_COMMANDS:
+                    self._ack_command()
+                elif cmd in POSITION_COMMANDS:
+                    self._save_position()
 
+        except Exception as e:
+            if not self._ready_event.is_set():
+                # Startup failed: wake wait_ready() with the reason instead of letting it time out
+                print(f'[BROWSER] ERROR: startup failed: {e}')
+                self._start_error = str(e)
+                self._running = False
+                self._ready_event.set()
+            else:
+                raise
         finally:
+            if self._cdp:
+                self._cdp.detach()
+            if self._health:
+                self._health.detach()
+            if self.latency.operations():
+                for line in self.latency.report():
+                    print(line)
+            try:
+                if self.page:
+                    self._sync_registry_selector_stats()
+            except Exception:
+                pass
+            self.selectors.save()
+            for line in self.selectors.report():
+                print(line)
+            for line in self.bandwidth_report():
+                print(line)
+            for line in self.profile_io_report():
+                print(line)
+            self._checkpoint.close()
+            if self._photo_index:
+                self._photo_index.close()
+            if self.photo_catalog:
+                self.photo_catalog.close()
+                for line in self.photo_catalog.report():
+                    print(line)
+            if self.journal:
+                self.journal.close()
+                for line in self.journal.report():
+                    print(line)
             try:
-                if self.context:
+                if self._attached:
+                    # Disconnect only; Chrome and its warm caches stay up for the next attach
+                    if self.browser:
+                        self.browser.close()
+                elif self.context:
                     self.context.close()
             except Exception:
                 pass
@@ -157,7 +566,149 @@ class BrowserController:
                     self.playwright.stop()
             except Exception:
                 pass
-            print('[BROWSER] Stopped')
+            if self._tmpfs and self._attached:
+                # Chrome keeps running from tmpfs: sync what is safe now, the first launch
+                # after it closes syncs the rest
+                self._tmpfs.stop_periodic_sync()
+                try:
+                    if os.path.isdir(self._user_data_dir):
+                        self._tmpfs.sync_back(live=True)
+                except Exception as e:
+                    print(f'[TMPFS] WARNING: sync failed (last-good copy kept): {e}')
+                print(f'[TMPFS] Profile stays in {self._user_data_dir} until Chrome closes')
+            elif self._owns_tmpfs:
+                self._tmpfs.stop()
+            elif self._tmpfs:
+                self._tmpfs.stop_periodic_sync()
+            print('[BROWSER] Stopped (Chrome left running)' if self._attached else '[BROWSER] Stopped')
+
+    def _connect_existing(self, user_data_dir, launch_args, headful):
+        """Attach to the Chrome running on the profile, starting a detached one first if needed."""
+        endpoint = chrome_profile.live_endpoint(user_data_dir, self._cdp_port)
+        if not endpoint:
+            if chrome_profile.profile_in_use(user_data_dir):
+                raise RuntimeError('Chrome is running on the tagger profile without a DevTools port. '
+                                   'Close it (or restart it with --remote-debugging-port) and try again.')
+            print('[BROWSER] Starting Chrome as a separate process (--keep-browser)')
+            chrome_profile.launch_chrome(user_data_dir, launch_args, headful)
+            endpoint = chrome_profile.wait_for_endpoint(user_data_dir, self._cdp_port)
+            if not endpoint:
+                raise RuntimeError('Chrome did not open its DevTools port in time')
+            self._mark('chrome launched')
+        self.browser = self.playwright.chromium.connect_over_cdp(endpoint)
+        self.context = self.browser.contexts[0] if self.browser.contexts else self.browser.new_context()
+        self._attached = True
+        self._endpoint = endpoint
+        print(f'[BROWSER] Attached to running Chrome at {endpoint}')
+        self._mark('attached over cdp')
+
+    def _pick_start_page(self):
+        """Existing Google Photos tab if there is one, else the first tab, else a new one."""
+        pages = self.context.pages
+        for page in pages:
+            if 'photos.google.com' in page.url:
+                return page
+        return pages[0] if pages else self.context.new_page()
+
+    def _attach_page(self, page):
+        """Make `page` the controlled page and set up per-page helpers."""
+        if self._cdp:
+            self._cdp.detach()
+            self._cdp = None
+        if self._throttle_session:
+            try:
+                self._throttle_session.detach()
+            except Exception:
+                pass
+            self._throttle_session = None
+        self.page = page
+        self._registry_selector_seen = {}
+        if textarea_registry.install(page):
+            self._push_registry_selectors()
+        if self._no_animations:
+            render_profile.apply_to_page(page)
+        if self._anti_throttle:
+            self._throttle_session = throttle_guard.attach(page)
+        if self._use_cdp_fast_path:
+            self._cdp = CDPFastPath(page, latency=self.latency)
+            self._cdp.attach()
+        if self._health:
+            self._health.attach(page)
+
+    def _fast_path(self):
+        """Return the CDP fast path if it should be used for the current command."""
+        if self._cdp and self._cdp.enabled and not self._force_playwright:
+            return self._cdp
+        return None
+
+    def _press_key(self, key):
+        """Press a key via CDP Input.dispatchKeyEvent, falling back to Playwright."""
+        fast = self._fast_path()
+        if fast and fast.press(key):
+            return
+        start = time.perf_counter()
+        self.page.keyboard.press(key)
+        op = f'key:{key}' if len(key) > 1 else 'key:char'
+        self.latency.record(op, 'playwright', time.perf_counter() - start)
+
+    def _push_registry_selectors(self):
+        """Hand the profile's current textarea selector order to the in-page registry."""
+        try:
+            self.page.evaluate(REGISTRY_SET_SELECTORS_JS, self.selectors.ordered('textarea'))
+        except Exception as e:
+            print(f'[SELECTORS] WARNING: could not update registry selectors: {e}')
+
+    def _sync_registry_selector_stats(self):
+        """Fold the registry's per-selector counters into the profile and re-push the order."""
+        stats = self._registry_stats()
+        if not stats:
+            return
+        totals = stats.get('selectorStats') or {}
+        self.selectors.record_totals('textarea', totals, self._registry_selector_seen)
+        self._registry_selector_seen = {k: dict(v) for k, v in totals.items()}
+        if stats.get('selectors') != self.selectors.ordered('textarea'):
+            self._push_registry_selectors()
+
+    def _throttle_status(self):
+        """Probe whether the page is being throttled (worker thread only)."""
+        try:
+            return throttle_guard.probe(self.page, self._throttle_session)
+        except Exception as e:
+            print(f'[THROTTLE] ERROR probing page: {e}')
+            return None
+
+    def _registry_stats(self):
+        """Return the in-page textarea registry counters (worker thread only)."""
+        try:
+            return self.page.evaluate(REGISTRY_STATS_JS)
+        except Exception as e:
+            print(f'[REGISTRY] ERROR reading stats: {e}')
+            return None
+
+    def bandwidth_report(self):
+        """Return printable low-bandwidth mode lines (empty when the mode is off)."""
+        return self._bandwidth.report() if self._bandwidth else []
+
+    def profile_io_report(self):
+        """Return printable lines with Chrome's disk I/O per navigation since the first photo."""
+        if self._io_baseline is None or not self._nav_count:
+            return []
+        now = profile_io(self._user_data_dir)
+        if not now:
+            return []
+        read = now['read_bytes'] - self._io_baseline['read_bytes']
+        written = now['write_bytes'] - self._io_baseline['write_bytes']
+        where = f'tmpfs ({self._user_data_dir})' if self._tmpfs else 'disk'
+        return [
+            f'[PROFILE_IO] Profile on {where}, {now["processes"]} Chrome processes',
+            f'[PROFILE_IO] Disk I/O over {self._nav_count} navigations: read {read / 1e6:.1f} MB, '
+            f'written {written / 1e6:.1f} MB ({read / 1024 / self._nav_count:.0f} KB read, '
+            f'{written / 1024 / self._nav_count:.0f} KB written per photo)',
+        ]
+
+    def latency_report(self):
+        """Return printable CDP vs Playwright latency comparison lines."""
+        return self.latency.report()
 
     def _do_dump_html(self):
         """Dump current page HTML for debugging."""
@@ -192,50 +743,39 @@ class BrowserController:
         try:
             print('[CURSOR] Positioning cursor at END...')
 
+            fast = self._fast_path()
+            if fast:
+                value = fast.position_cursor_at_end()
+                if value is not None:
+                    print(f'[CURSOR] Positioned cursor at END via CDP (text length: {len(value)})')
+                    return
+
+            start = time.perf_counter()
             # Use pure JavaScript to find and position cursor - NO clicking, NO key pressing
             result = self.page.evaluate("""() => {
-            // Helper function to check if element is visually hidden
-            function isElementVisuallyHidden(element) {
-                let current = element;
-                while (current && current.tagName !== 'BODY') {
-                    if (current.getAttribute('aria-hidden') === 'true') {
-                        return true;
-                    }
-                    const style = current.getAttribute('style') || '';
-                    if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
-                        return true;
-                    }
-                    current = current.parentElement;
-                }
-                return false;
-            }
-
-            // Find all description textareas
-            const textareas = document.querySelectorAll('textarea[aria-label="Description"]');
-
-            // Find the visible one
-            for (const ta of textareas) {
-                if (ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
-                    // Focus and position cursor WITHOUT any scrolling
-                    ta.focus();
-                    ta.selectionStart = ta.value.length;
-                    ta.selectionEnd = ta.value.length;
-
-                    // Prevent default scroll behavior
-                    ta.scrollTop = ta.scrollHeight;
-
-                    return {
-                        textLength: ta.value.length,
-                        value: ta.value,
-                        success: true
-                    };
-                }
+            // Active textarea from the in-page registry (full scan if not installed)
+            const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+            if (ta) {
+                // Focus and position cursor WITHOUT any scrolling
+                ta.focus();
+                ta.selectionStart = ta.value.length;
+                ta.selectionEnd = ta.value.length;
+
+                // Prevent default scroll behavior
+                ta.scrollTop = ta.scrollHeight;
+
+                return {
+                    textLength: ta.value.length,
+                    value: ta.value,
+                    success: true
+                };
             }
 
             return null;
         }""")
 
             if result:
+                self.latency.record('cursor_end', 'playwright', time.perf_counter() - start)
                 print(f'[CURSOR] Positioned cursor at END (text length: {result.get("textLength", 0)})')
             else:
                 print('[CURSOR] No visible textarea found')
@@ -243,15 +783,20 @@ class BrowserController:
         except Exception as e:
             print(f'[CURSOR] ERROR: {e}')
     
-    def _do_dump_analysis(self):
-        """Run dump-explorer style analysis on current page."""
+    def _do_dump_analysis(self, evaluate=None):
+        """Run dump-explorer style analysis on current page.
+
+        Args:
+            evaluate: JS evaluate function to use (read lane's when available); defaults to page.evaluate
+        """
+        evaluate = evaluate or self.page.evaluate
         try:
             print('\n' + '='*60)
             print('[ANALYSIS] Starting dump-explorer analysis...')
             print('='*60)
             
             # Execute the analysis JavaScript
-            result = self.page.evaluate("""() => {
+            result = evaluate("""() => {
                 // Helper function to check if element is visually hidden
                 function isElementVisuallyHidden(element) {
                     let current = element;
@@ -599,6 +1144,56 @@ class BrowserController:
             else:
                 print('[ANALYSIS] No visible names found to process')
             
+            # Description textarea registry counters (page global: the read lane reads it in the main world)
+            print(f'\n[ANALYSIS] === DESCRIPTION TEXTAREA REGISTRY ===')
+            on_worker = threading.current_thread() is self._worker
+            registry_stats = self._registry_stats() if on_worker else self._read_lane.read('registry_stats')
+            for line in textarea_registry.format_stats(registry_stats):
+                print(line)
+
+            # Background throttling (Chrome unfocused/occluded behind the Tk window)
+            print(f'\n[ANALYSIS] === BACKGROUND THROTTLING ===')
+            if on_worker:
+                throttle_status = self._throttle_status()
+            else:
+                raw = self._read_lane.read('throttle')
+                throttle_status = throttle_guard.classify(raw, 'read lane') if raw else None
+            for line in throttle_guard.format_status(throttle_status):
+                print(line)
+
+            # Selector hit rates (reordered best-first)
+            print(f'\n[ANALYSIS] === SELECTOR PROFILE ===')
+            for line in self.selectors.report():
+                print(line)
+
+            # Low-bandwidth mode (rewritten images, blocked video/beacons)
+            if self._bandwidth:
+                print(f'\n[ANALYSIS] === LOW-BANDWIDTH MODE ===')
+                for line in self.bandwidth_report():
+                    print(line)
+
+            # Read-ahead cache hit rate
+            if self._read_ahead:
+                print(f'\n[ANALYSIS] === READ-AHEAD CACHE ===')
+                for line in self.photo_cache.report():
+                    print(line)
+
+            # Tab heap/DOM growth and page recycles
+            if self._health:
+                print(f'\n[ANALYSIS] === PAGE HEALTH ===')
+                for line in self.page_health_report():
+                    print(line)
+
+            # Chrome disk I/O per navigation (compare runs with/without --tmpfs-profile)
+            print(f'\n[ANALYSIS] === PROFILE DISK I/O ===')
+            for line in self.profile_io_report() or ['[PROFILE_IO] (no navigations measured yet)']:
+                print(line)
+
+            # CDP fast path vs Playwright latency comparison
+            print(f'\n[ANALYSIS] === OPERATION LATENCY (CDP fast path vs Playwright) ===')
+            for line in self.latency_report():
+                print(line)
+
             print('\n' + '='*60)
             print('[ANALYSIS] Analysis complete')
             print('='*60 + '\n')
@@ -634,22 +1229,19 @@ class BrowserController:
             # Don't fail the operation, log and continue
 
 
-    def _extract_and_add_names(self, avoid_scroll=True):
+    def _extract_and_add_names(self, avoid_scroll=True, cached=None):
         """Extract names from webpage section and add to description if not already there.
         
         Args:
             avoid_scroll: If True, skip clicking/positioning to avoid scrolling the right panel
+            cached: PhotoCache entry the live description was confirmed against; its names
+                are used instead of scanning the page
         """
         try:
             print('[NAMES] Extracting names from webpage...')
 
             # Load names and special cases from names.json
-            import json
-            import os
-            with open('names.json') as f:
-                data = json.load(f)
-                names_list = data.get('names', [])
-                special_cases = data.get('special_cases', {})
+            names_list, special_cases = _names_config()
 
             print(f'[NAMES] Loaded special cases: {special_cases}')
 
@@ -664,65 +1256,47 @@ class BrowserController:
 
             # JS logic to extract all candidates with visibility check
             # CRITICAL CHANGE: Search entire document, not just sidebar
-            js_find_names = r"""() => {
-            let foundNames = [];
-
-            // Helper function to check if element is visually hidden
-            function isElementVisuallyHidden(element) {
-                let current = element;
-                while (current && current.tagName !== 'BODY') {
-                    if (current.getAttribute('aria-hidden') === 'true') {
-                        return true;
-                    }
-                    const style = current.getAttribute('style') || '';
-                    if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
-                        return true;
-                    }
-                    current = current.parentElement;
-                }
-                return false;
-            }
-
-            // 1. Search for face/people tags (span.Y8X4Pc)
-            const allSpanNames = document.querySelectorAll('span.Y8X4Pc');
-            for (const span of allSpanNames) {
-                if (span.textContent && !isElementVisuallyHidden(span) && span.offsetHeight > 0) {
-                    foundNames.push(span.textContent.trim());
-                }
-            }
-
-            // 2. Search for album names that might be people (div.DgVY7 > div.AJM7gb)
-            const allAlbumDivs = document.querySelectorAll('div.DgVY7');
-            for (const albumDiv of allAlbumDivs) {
-                const nameDiv = albumDiv.querySelector('div.AJM7gb');
-                if (nameDiv && nameDiv.textContent && !isElementVisuallyHidden(nameDiv) && nameDiv.offsetHeight > 0) {
-                    const text = nameDiv.textContent.trim();
-                    // Filter out year-prefixed albums (they're not people names)
-                    if (!text.match(/^\d{4}/)) {
-                        foundNames.push(text);
-                    }
-                }
-            }
+            # Selectors come from the profile, best-performing first
+            chip_selectors = self.selectors.ordered_groups('face_chips', 'album_chips')
+
+            # With a read lane, scan names there while this lane samples the description
+            lane_read = None
+            if cached:
+                print('[NAMES] Using names from the read-ahead cache')
+                scan = {'names': cached.get('names')}
+            elif self._read_lane and self._read_lane.ready:
+                lane_read = self._read_lane.submit(('evaluate', FIND_NAMES_JS, chip_selectors))
+            else:
+                scan = self.page.evaluate(FIND_NAMES_JS, chip_selectors)
 
-            return foundNames.length > 0 ? foundNames : null;
-        }"""
+            # Retrieve the current description (already confirmed when it came from the cache)
+            current_desc = self._last_description if cached else self._sample_description()
 
-            found_names = self.page.evaluate(js_find_names)
+            if lane_read:
+                ev, res = lane_read
+                if ev.wait(5.0) and 'error' not in res:
+                    scan = res.get('value')
+                else:
+                    scan = self.page.evaluate(FIND_NAMES_JS, chip_selectors)
+            scan = scan or {}
+            for group, attempts in (scan.get('attempts') or {}).items():
+                self.selectors.record(group, attempts)
+            found_names = scan.get('names')
+            self._last_names = found_names
+            if not cached:
+                photo_id = photo_id_from_url(self._last_url or '')
+                if photo_id:
+                    self.photo_cache.put(photo_id, url=self._last_url, description=current_desc, names=found_names)
+                    self._catalog_record(self._last_url, names=found_names)
 
             if not found_names:
                 print('[NAMES] No name sections found on webpage')
                 return
 
             print(f'[NAMES] Found names in webpage: {found_names}')
-
-            # Retrieve the current description
-            current_desc = self._sample_description() 
             if not current_desc:
                 current_desc = ''
 
-            # Normalize description early for comparison
-            desc_normalized = ' '.join(current_desc.split()).lower()
-
             print(f'[NAMES] Current description: {repr(current_desc)[:80]}')
 
             if not avoid_scroll:
@@ -731,45 +1305,13 @@ class BrowserController:
             else:
                 print('[NAMES] Skipping cursor positioning to avoid scroll')
                 
-            for found_name in found_names:
-                print(f'[NAMES] Processing: {repr(found_name)}')
-                
-                # Normalize spaces
-                name_to_check = ' '.join(found_name.split())
-                
-                # 1. Year/Digit Prefix Check
-                if name_to_check and name_to_check[0:4].isdigit():
-                    print(f'[NAMES] Skipping year-prefixed text: "{name_to_check}"')
-                    continue
-
-                if name_to_check and name_to_check.startswith("0"):
-                    print(f'[NAMES] Skipping name starting with 0: "{name_to_check}"')
-                    continue
-                
-                # 2. Special Case Mapping
-                if name_to_check in special_cases:
-                    mapped_name = special_cases[name_to_check]
-                    print(f'[NAMES] Special case: "{name_to_check}" -> "{mapped_name}"')
-                    found_name = mapped_name
-                else:
-                    found_name = name_to_check # Use the cleaned version
-                    
-                # 3. Duplication Check
-                # Use the mapped name (or cleaned original) for duplication check
-                if found_name.lower() in desc_normalized: 
-                    print(f'[NAMES] "{found_name}" already in description, skipping')
-                    continue
-                
-                # 4. Append to description
+            # Year-prefixed chips skipped, special cases mapped, names already there left out
+            for found_name in names_to_add(found_names, current_desc, special_cases):
                 if not avoid_scroll:
                     self._position_cursor_at_end()
                     
                 print(f'[NAMES] Adding " {found_name}" to description')
-                self.append_text(' ' + found_name + ' ')
-                
-                # Update normalized description for subsequent duplication checks in this loop
-                current_desc += ' ' + found_name + ' '
-                desc_normalized = ' '.join(current_desc.split()).lower()
+                self._queue_append(' ' + found_name + ' ', 'extraction')
                 
             if not avoid_scroll:
                 print('[NAMES] Positioning cursor at END after adding all names')
@@ -796,64 +1338,49 @@ class BrowserController:
         
         try:
             print(f'[{label}] Step 1: Starting navigation...')
-            
-            # Find and click the main viewer image
-            result = self.page.evaluate("""() => {
-                // Look for the main image in the viewer - be more specific
-                // Try multiple selectors in order of likelihood
-                const selectors = [
-                    'img[alt="View photo"]',
-                    'img[alt*="View"]',
-                    'img[role="button"]',
-                    'img[jsname]'
-                ];
-                
-                for (let selector of selectors) {
-                    const imgs = document.querySelectorAll(selector);
-                    for (let img of imgs) {
-                        const rect = img.getBoundingClientRect();
-                        const style = window.getComputedStyle(img);
-                        
-                        // Must be visible and reasonably sized
-                        if (rect.width > 100 && rect.height > 100 && style.display !== 'none' && style.visibility !== 'hidden') {
-                            // Click the center
-                            return {
-                                x: rect.left + rect.width / 2,
-                                y: rect.top + rect.height / 2,
-                                width: rect.width,
-                                height: rect.height,
-                                selector: selector,
-                                found: true
-                            };
-                        }
-                    }
-                }
-                return { found: false };
-            }""")
-            
-            print(f'[{label}] Step 2: Image location found')
-            
-            if result and result.get('found'):
-                x = result['x']
-                y = result['y']
-                width = result.get('width', 0)
-                height = result.get('height', 0)
-                selector = result.get('selector', 'unknown')
-                print(f'[{label}] Step 3a: Found via "{selector}", size {int(width)}x{int(height)}, clicking center at ({int(x)}, {int(y)})')
-                self.page.mouse.click(x, y)
-                print(f'[{label}] Step 3b: Click completed')
-                self.page.wait_for_timeout(100)
-                print(f'[{label}] Step 3c: Wait after click completed')
-            else:
-                print(f'[{label}] Step 3: WARNING: Could not find image to click')
+            self._click_viewer_image(label)
             
             # Now send arrow key
             print(f'[{label}] Step 4a: About to send {arrow_key}')
-            self.page.keyboard.press(arrow_key)
+            old_url = self.page.url
+            # The read-ahead tab already walked this step: no fixed sleep, the cache gets confirmed below
+            expected = (self.photo_cache.neighbour(photo_id_from_url(old_url), direction)
+                        if self._read_ahead else None)
+            self._press_key(arrow_key)
             print(f'[{label}] Step 4b: Arrow key sent')
-            self.page.wait_for_timeout(500)
+            self._wait_for_slide_settle(old_url, quick=bool(expected))
             print(f'[{label}] Step 4c: Wait after arrow key completed')
-            
+            self._arrive(label, direction, quick=bool(expected))
+        except Exception as e:
+            print(f'[{label}] ERROR: {e}')
+
+    def _click_viewer_image(self, label):
+        """Click the centre of the main photo so arrow keys go to the viewer, not the textarea."""
+        # Find and click the main viewer image
+        # Selectors come from the profile, best hit rate first
+        result = self.page.evaluate(FIND_VIEWER_IMAGE_JS, self.selectors.ordered('viewer_image'))
+        if result:
+            self.selectors.record('viewer_image', result.get('attempts'))
+        
+        print(f'[{label}] Step 2: Image location found')
+        
+        if result and result.get('found'):
+            x = result['x']
+            y = result['y']
+            width = result.get('width', 0)
+            height = result.get('height', 0)
+            selector = result.get('selector', 'unknown')
+            print(f'[{label}] Step 3a: Found via "{selector}", size {int(width)}x{int(height)}, clicking center at ({int(x)}, {int(y)})')
+            self.page.mouse.click(x, y)
+            print(f'[{label}] Step 3b: Click completed')
+            self.page.wait_for_timeout(self._waits['after_click'])
+            print(f'[{label}] Step 3c: Wait after click completed')
+        else:
+            print(f'[{label}] Step 3: WARNING: Could not find image to click')
+
+    def _arrive(self, label, direction, quick=False):
+        """Set up the photo the viewer just moved to: sample, extract names, focus the textarea."""
+        try:
             try:
                 self._last_url = self.page.url
                 print(f'[{label}] Step 5: URL updated')
@@ -862,22 +1389,243 @@ class BrowserController:
             
             # Just read description, don't interact with textarea (no clicking, no pressing keys)
             print(f'[{label}] Step 6a: About to sample description...')
-            desc = self._sample_description()
-            print(f'[{label}] Step 6b: Description sampled')
+            desc, cached = self._confirm_cached_photo(quick=quick)
+            print(f'[{label}] Step 6b: Description sampled{" (matches read-ahead cache)" if cached else ""}')
             self._last_description = desc
             print(f'[{label}] Step 6c: New description: {repr(desc)[:100]}')
+            if self._read_ahead:
+                self._read_ahead.follow(self._last_url, direction)
             
-            print(f'[{label}] Step 7a: About to extract and add names...')
-            self._extract_and_add_names()
-            print(f'[{label}] Step 7b: Extract and add names completed')
+            if self._replaying:
+                # The names extraction added the first time are pending entries of their own
+                print(f'[{label}] Step 7: Replaying, skipping name extraction')
+            else:
+                print(f'[{label}] Step 7a: About to extract and add names...')
+                self._extract_and_add_names(cached=cached)
+                print(f'[{label}] Step 7b: Extract and add names completed')
             
             print(f'[{label}] Step 8: Focusing textarea for keystroke input...')
             self._position_cursor_at_end()
             print(f'[{label}] Step 8b: Textarea focused and cursor positioned at end')
+
+            if self._io_baseline is None:
+                self._io_baseline = profile_io(self._user_data_dir) or {}
+            self._nav_count += 1
+            if self._nav_count % 20 == 0:
+                self._sync_registry_selector_stats()
+                status = self._throttle_status()
+                if status and status.get('throttled'):
+                    for line in throttle_guard.format_status(status):
+                        print(line)
+            if self._health and self._health.due(self._nav_count):
+                self._check_page_health()
             
         except Exception as e:
             print(f'[{label}] ERROR: {e}')
 
+    def _check_page_health(self):
+        """Sample page metrics; recycle the page if a limit is crossed.
+
+        Runs on the worker between commands, right after a navigation, so no
+        edit is ever in progress when the page goes away.
+        """
+        metrics = self._health.sample(self._nav_count)
+        if metrics is None:
+            return
+        if self._debug:
+            print(self._health.format_sample(self._nav_count, metrics))
+        reasons = self._health.over_threshold(metrics)
+        if reasons:
+            self._recycle_page(reasons, metrics)
+
+    def _recycle_page(self, reasons, before=None):
+        """Reload the current photo (or move it to a fresh tab) to drop accumulated heap and DOM."""
+        url = self.page.url
+        mode = self._health.mode if self._health else 'reload'
+        print(f'[HEALTH] Recycling page ({mode}) at photo {self._nav_count}: {"; ".join(reasons)}')
+        start = time.perf_counter()
+        try:
+            self._sync_registry_selector_stats()
+        except Exception:
+            pass
+        try:
+            if mode == 'new_page':
+                old = self.page
+                new = self.context.new_page()
+                new.goto(url, wait_until='domcontentloaded')
+                self._attach_page(new)
+                old.close()
+                self.page.wait_for_function('() => !!(' + ACTIVE_DESCRIPTION_EXPR + ')', timeout=15000)
+                self._position_cursor_at_end()
+            else:
+                self._load_photo(url)
+        except Exception as e:
+            print(f'[HEALTH] ERROR: recycle failed: {e}')
+            return
+        seconds = time.perf_counter() - start
+        self.latency.record('recycle', mode, seconds)
+        after = self._health.sample() if self._health else None
+        if self._health:
+            self._health.record_recycle(self._nav_count, reasons, before, after, seconds)
+        print(f'[HEALTH] Page recycled in {seconds:.1f} s')
+
+    def _load_photo(self, url):
+        """Load a photo URL in the current tab and wait until its description textarea is usable."""
+        self.page.goto(url, wait_until='domcontentloaded')
+        self._registry_selector_seen = {}
+        if self._cdp:
+            self._cdp.invalidate()
+        if textarea_registry.install(self.page):
+            self._push_registry_selectors()
+        self.page.wait_for_function('() => !!(' + ACTIVE_DESCRIPTION_EXPR + ')', timeout=15000)
+        self._position_cursor_at_end()
+
+    # ---- session checkpoint / resume ------------------------------------------
+
+    def _current_url(self):
+        try:
+            return self.page.url
+        except Exception:
+            return self._last_url
+
+    def _ack_command(self):
+        self._checkpoint.ack(self._current_url(), self._last_description)
+
+    def _save_position(self):
+        """Checkpoint where an untracked command (jump, undo, ensure ...) left the page."""
+        self._checkpoint.set_position(self._current_url(), self._last_description)
+
+    def _do_resume(self, state):
+        """Go to the checkpointed photo and replay the commands the last run never finished.
+
+        Each edit is checked against the live description first, so one that
+        did reach the page before the crash is not applied twice.
+        """
+        url = state['url']
+        pending = state.get('pending') or []
+        print(f'[RESUME] Going to {url} ({len(pending)} pending commands)')
+        start = time.perf_counter()
+        try:
+            self._load_photo(url)
+        except Exception as e:
+            # Its commands must not stay at the front of the pending list: every later ack would pop one
+            print(f'[RESUME] ERROR: could not load checkpointed photo: {e}')
+            self._checkpoint.release_previous(state)
+            return
+        self._last_url = self.page.url
+        self._last_description = self._sample_description() or ''
+        self._mark('resume: photo loaded')
+        # Description after the last acknowledged command (what the page should show now)
+        expected = state.get('description')
+        if expected is None:
+            expected = self._last_description
+        replayed = skipped = 0
+        self._replaying = True
+        try:
+            for entry in pending:
+                cmd, arg = entry['cmd'], entry.get('arg')
+                if cmd in ('next', 'prev'):
+                    self._navigate_photo(cmd)
+                    replayed += 1
+                    expected = self._last_description or ''
+                else:
+                    live = self._sample_description() or ''
+                    if _edit_already_applied(cmd, arg, expected, live):
+                        print(f'[RESUME] {cmd} {arg!r} already in the description, skipping')
+                        self._last_description = live
+                        skipped += 1
+                    else:
+                        self._last_description = live
+                        if cmd == 'append_text':
+                            self._do_append_text(*arg)
+                        elif cmd == 'backspace':
+                            self._do_backspace()
+                        elif cmd == 'delete_all':
+                            self._do_delete_all()
+                        replayed += 1
+                    expected = self._last_description or ''
+                self._ack_command()
+        finally:
+            self._replaying = False
+        seconds = time.perf_counter() - start
+        self.latency.record('resume', 'replay' if pending else 'photo', seconds)
+        self._mark('resume: edits replayed')
+        since_launch = self._startup.elapsed('resume: edits replayed') if self._startup else None
+        if since_launch is None and self._launch_started:
+            since_launch = time.perf_counter() - self._launch_started
+        self.resume_stats = {'url': url, 'replayed': replayed, 'skipped': skipped,
+                             'resume_seconds': seconds, 'since_launch_seconds': since_launch}
+        print(f'[RESUME] Back at the checkpointed photo: {replayed} commands replayed, {skipped} already applied, '
+              f'resume took {seconds:.1f} s, productive {since_launch or 0:.1f} s after launch')
+
+    def cdp_endpoint(self):
+        """DevTools HTTP endpoint of the running Chrome (for extra connections such as batch tabs)."""
+        return self._endpoint or devtools_endpoint(self._user_data_dir)
+
+    def resume_info(self):
+        """Return {'url', 'photo_id', 'pending', 'saved', 'clean'} for the last session, or None."""
+        return self._checkpoint.resume_info()
+
+    def resume_session(self):
+        """Queue a resume: go to the last session's photo and replay its pending commands."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        self._cmd_queue.put(('resume', None))
+
+    def discard_resume(self):
+        """Forget the last session's checkpoint (it is overwritten by the first new command)."""
+        self._checkpoint.discard_previous()
+
+    def page_health_report(self):
+        """Return printable heap/DOM trend and recycle lines (empty when monitoring is off)."""
+        return self._health.report() if self._health else []
+
+    def _wait_for_slide_settle(self, old_url, quick=False):
+        """Wait for the next slide after an arrow key.
+
+        Default profile sleeps a fixed time for transitions to finish; the
+        animation-free profile (or quick=True, when the read-ahead cache knows the
+        photo) returns as soon as the new slide's textarea is in the DOM.
+        """
+        start = time.perf_counter()
+        if self._no_animations or quick:
+            try:
+                self.page.wait_for_function(SLIDE_READY_JS, arg=old_url, timeout=self._waits['after_arrow'])
+            except Exception:
+                pass  # timed out - same as the fixed wait
+        else:
+            self.page.wait_for_timeout(self._waits['after_arrow'])
+        self.latency.record('settle', 'no_animation' if self._no_animations else 'cached' if quick else 'default',
+                            time.perf_counter() - start)
+
+    def _confirm_cached_photo(self, quick=False):
+        """Sample the live description and check it against the read-ahead cache.
+
+        Returns (description, cache entry or None). The entry is only returned when
+        the live page agrees with it; otherwise it is marked stale and the caller
+        falls back to scanning the page.
+        """
+        desc = self._sample_description()
+        photo_id = photo_id_from_url(self._last_url or '')
+        cached = self.photo_cache.lookup(photo_id) if (self._read_ahead and photo_id) else None
+        if cached is None:
+            if quick and not self._no_animations:
+                # Landed somewhere other than the predicted neighbour: the fixed settle wait
+                # was skipped, so take it now before the description is trusted
+                self.page.wait_for_timeout(self._waits['after_arrow'])
+                desc = self._sample_description()
+            return desc, None
+        self._last_names = cached.get('names')
+        if quick and normalize(desc) != normalize(cached.get('description')):
+            # Skipped the fixed settle wait: give Photos that long to fill the text in, then compare again
+            self.page.wait_for_timeout(self._waits['after_arrow'])
+            desc = self._sample_description()
+        if normalize(desc) == normalize(cached.get('description')):
+            return desc, cached
+        print(f'[CACHE] Live description {desc!r} differs from the cached {cached.get("description")!r}; using the page')
+        self.photo_cache.mark_stale(photo_id)
+        return desc, None
+
     def _do_next(self):
         """Navigate to next photo."""
         self._navigate_photo('next')
@@ -886,48 +1634,182 @@ class BrowserController:
         """Navigate to previous photo."""
         self._navigate_photo('prev')
 
+    def _do_fast_forward(self, limit=None):
+        """Skip ahead past tagged photos, then set up the first one that needs tagging.
+
+        Per skipped photo: one arrow key, a wait for the next slide, one description
+        read (CDP) and, when the description is not empty, the detected names (from the
+        read-ahead cache if it has them). No clicks, settle sleeps, extraction or cursor
+        positioning. Stops at an empty description, a detected name the description
+        lacks, the end of the album, `limit` photos, or any queued command.
+        """
+        limit = limit or FAST_FORWARD_LIMIT
+        label = 'FAST_FORWARD'
+        start = time.perf_counter()
+        self._ff_cancel.clear()
+        try:
+            _names, special_cases = _names_config()
+        except Exception as e:
+            print(f'[{label}] WARNING: names.json not loaded ({e}); only empty descriptions stop')
+            special_cases = {}
+        skipped = 0
+        reason = None
+        try:
+            self._click_viewer_image(label)
+            while reason is None:
+                if skipped >= limit:
+                    reason = f'skipped the limit of {limit} photos'
+                    break
+                if self._ff_cancel.is_set() or not self._cmd_queue.empty():
+                    reason = 'interrupted'
+                    break
+                step = time.perf_counter()
+                old_url = self.page.url
+                self.page.evaluate(MARK_OUTGOING_SLIDE_JS)
+                self._press_key('ArrowRight')
+                try:
+                    self.page.wait_for_function(SLIDE_READY_JS, arg=old_url, timeout=max(2000, self._waits['after_arrow'] * 4))
+                except Exception:
+                    reason = 'the photo did not change (end of the album?)'
+                    break
+                self._last_url = self.page.url
+                try:
+                    self.page.wait_for_function(NEW_SLIDE_ACTIVE_JS, arg=old_url, timeout=self._waits['after_arrow'])
+                    fresh = True
+                except Exception:
+                    fresh = False
+                reason = self._needs_tagging(special_cases, fresh)
+                if reason is None:
+                    skipped += 1
+                    self.latency.record('fast_forward', 'skip', time.perf_counter() - step)
+        except Exception as e:
+            reason = f'error: {e}'
+        seconds = time.perf_counter() - start
+        per_photo = seconds * 1000 / skipped if skipped else 0
+        self.fast_forward_stats = {'skipped': skipped, 'seconds': seconds, 'reason': reason, 'url': self._last_url}
+        print(f'[{label}] Skipped {skipped} tagged photos in {seconds:.1f} s ({per_photo:.0f} ms per photo); '
+              f'stopped: {reason}')
+        self._arrive(label, 'next')
+
+    def _do_jump_to(self, target):
+        """Go straight to a photo (ID or URL) or to the photo nearest a date.
+
+        A date goes to the photo the library index (library_crawler.py) has
+        closest to it, in one page load; without an index it opens Google
+        Photos' own search for that date and clicks the first result.
+        """
+        label = 'JUMP'
+        target = (target or '').strip()
+        start = time.perf_counter()
+        try:
+            date = parse_user_date(target)
+            if date is None:
+                url = target if '://' in target else photo_url(target)
+                if not photo_id_from_url(url):
+                    raise ValueError(f'not a photo ID, photo URL or date: {target!r}')
+                how = 'photo'
+                self._load_photo(url)
+            else:
+                row = self._index_photo_near(date)
+                if row:
+                    how = f'library index, photo dated {row["date"]}'
+                    self._load_photo(row['url'] or photo_url(row['photo_id']))
+                else:
+                    how = 'Google Photos date search'
+                    self._open_date_search(date)
+            self._nav_count += 1
+            self._arrive(label, 'next')
+            seconds = time.perf_counter() - start
+            self.latency.record('jump', 'index' if how.startswith('library') else how.split()[0].lower(), seconds)
+            self.jump_stats = {'target': target, 'url': self._last_url, 'how': how, 'seconds': seconds}
+            print(f'[{label}] At {self._last_url} via {how} in {seconds:.1f} s')
+        except Exception as e:
+            self.jump_stats = {'target': target, 'error': str(e)}
+            print(f'[{label}] ERROR: {e}')
+
+    def _index_photo_near(self, date):
+        """Library index row dated closest to `date`, or None when there is no index."""
+        if self._photo_index is None:
+            if not os.path.exists(PHOTO_INDEX_DB):
+                return None
+            self._photo_index = PhotoIndex()
+        return self._photo_index.nearest_date(date)
+
+    def _open_date_search(self, date):
+        """Search Google Photos for a date and open the first photo of the results."""
+        import datetime
+        import urllib.parse
+        day = datetime.date.fromisoformat(date)
+        query = f'{day:%B} {day.day}, {day.year}'
+        self.page.goto('https://photos.google.com/search/' + urllib.parse.quote(query),
+                       wait_until='domcontentloaded')
+        tile = self.page.wait_for_selector('a[href*="/photo/"]', timeout=15000)
+        tile.click()  # opens the viewer in the app, no second page load
+        if self._cdp:
+            self._cdp.invalidate()
+        if textarea_registry.install(self.page):
+            self._push_registry_selectors()
+        self.page.wait_for_function('() => !!(' + ACTIVE_DESCRIPTION_EXPR + ')', timeout=15000)
+
+    def _needs_tagging(self, special_cases, fresh=True):
+        """Why the current photo needs work ('empty description', 'missing ...'), or None to skip it.
+
+        fresh=False means the outgoing slide may still be the visible one, so the quick
+        read cannot skip the photo; only the read after the settle wait decides.
+        """
+        if fresh:
+            desc = self._sample_description()
+            self._last_description = desc
+            if (desc or '').strip() and not names_to_add(self._photo_names(), desc, special_cases, log=False):
+                return None
+        # Photos fills the text in after the slide appears: look once more before stopping
+        self.page.wait_for_timeout(self._waits['after_arrow'])
+        desc = self._sample_description()
+        self._last_description = desc
+        if not (desc or '').strip():
+            return 'empty description'
+        missing = names_to_add(self._photo_names(), desc, special_cases, log=False)
+        return f'description lacks {", ".join(missing)}' if missing else None
+
+    def _photo_names(self):
+        """Detected face/album names of the current photo (read-ahead cache first)."""
+        cached = self.photo_cache.peek(photo_id_from_url(self._last_url or ''))
+        if cached and cached.get('names') is not None:
+            return cached['names']
+        scan = self.page.evaluate(FIND_NAMES_JS, self.selectors.ordered_groups('face_chips', 'album_chips')) or {}
+        for group, attempts in (scan.get('attempts') or {}).items():
+            self.selectors.record(group, attempts)
+        names = scan.get('names')
+        self._last_names = names
+        self._catalog_record(self._last_url, names=names)
+        return names
+
     def _sample_description(self):
         """Read current description from page."""
         try:
+            fast = self._fast_path()
+            if fast:
+                result = fast.read_description()
+                if result is not None:
+                    print(f'[SAMPLE] Result (CDP): {repr(result)[:100]}')
+                    self._catalog_record(self.page.url, description=result)
+                    return result
+
             print('[SAMPLE] Executing page.evaluate...')
+            start = time.perf_counter()
             js = """() => {
-    // Helper function to check if element is visually hidden
-    function isElementVisuallyHidden(element) {
-        let current = element;
-        while (current && current.tagName !== 'BODY') {
-            if (current.getAttribute('aria-hidden') === 'true') {
-                return true;
-            }
-            const style = current.getAttribute('style') || '';
-            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
-                return true;
-            }
-            current = current.parentElement;
-        }
-        return false;
-    }
-    
-    // Find all description textareas
-    const textareas = document.querySelectorAll('textarea[aria-label="Description"]');
-    console.log('Found textareas:', textareas.length);
-    
-            // Find the visible one
-    for (let i = 0; i < textareas.length; i++) {
-        const ta = textareas[i];
-
-        // Simple visibility check: offsetHeight > 0 and not hidden
-        if (ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
-            const value = (ta.value || '').trim();
-            console.log(`Selected visible textarea ${i}: value="${value.substring(0,30)}"`);
-            return value;
-        }
+    // Active textarea from the in-page registry (full scan if not installed)
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    if (ta) {
+        return (ta.value || '').trim();
     }
-    
-    console.log('No visible textarea found');
     return null;
 }"""
 
             result = self.page.evaluate(js)
+            if result is not None:
+                self.latency.record('read', 'playwright', time.perf_counter() - start)
+                self._catalog_record(self.page.url, description=result)
             print(f'[SAMPLE] Result: {repr(result)[:100]}')
             return result
 
@@ -938,7 +1820,8 @@ class BrowserController:
     def _focus_textarea(self, x, y):
         """Common logic to focus and position cursor at end of textarea."""
         self.page.mouse.click(x, y)
-        self.page.wait_for_timeout(15)
+        if self._waits['focus_click']:
+            self.page.wait_for_timeout(self._waits['focus_click'])
         
         try:
             self.page.evaluate(
@@ -965,42 +1848,38 @@ class BrowserController:
             print('[FOCUS] WARNING: textarea did not become active within timeout')
 
 
-    def _do_append_text(self, text):
-        """Append arbitrary text to current description WITHOUT scrolling right panel."""
+    def _do_append_text(self, text, op='append'):
+        """Append arbitrary text to current description WITHOUT scrolling right panel.
+
+        Args:
+            op: Journal operation name ('append', or 'extraction' for names added by extraction)
+        """
         try:
             print(f'[APPEND_TEXT] Starting append of: {repr(text)[:50]}')
+
+            start = time.perf_counter()
+            fast = self._fast_path()
+            if fast:
+                previous = fast.append_text(text)
+                if previous is not None:
+                    self._last_description = previous.strip() + text
+                    self._record_edit(op, previous, previous + text, start, text=text, path='cdp')
+                    print(f'[APPEND_SUCCESS] Appended {repr(text)} to description (CDP)')
+                    return
+
+            start = time.perf_counter()
             js_find = """() => {
-    // Helper function to check if element is visually hidden
-    function isElementVisuallyHidden(element) {
-        let current = element;
-        while (current && current.tagName !== 'BODY') {
-            if (current.getAttribute('aria-hidden') === 'true') {
-                return true;
-            }
-            const style = current.getAttribute('style') || '';
-            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
-                return true;
-            }
-            current = current.parentElement;
-        }
-        return false;
-    }
-    
-    // Find all description textareas
-    const textareas = document.querySelectorAll('textarea[aria-label="Description"]');
-    
-    // Find the visible one
-    for (const ta of textareas) {
-        if (ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
-            const rect = ta.getBoundingClientRect();
-            const value = (ta.value || '').trim();
-            
-            return {
-                x: rect.left + rect.width / 2,
-                y: rect.top + rect.height / 2,
-                currentValue: value
-            };
-        }
+    // Active textarea from the in-page registry (full scan if not installed)
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    if (ta) {
+        const rect = ta.getBoundingClientRect();
+        const value = (ta.value || '').trim();
+        
+        return {
+            x: rect.left + rect.width / 2,
+            y: rect.top + rect.height / 2,
+            currentValue: value
+        };
     }
     
     return null;
@@ -1065,6 +1944,8 @@ class BrowserController:
             print('[APPEND_TEXT] Scroll unfrozen')
 
             self._last_description = (current if current else '') + text
+            self.latency.record('append', 'playwright', time.perf_counter() - start)
+            self._record_edit(op, current, self._last_description, start, text=text, path='playwright')
             print(f'[APPEND_SUCCESS] Appended {repr(text)} to description')
             # Ensure cursor is positioned at the end after append
             try:
@@ -1080,39 +1961,31 @@ class BrowserController:
         """Send backspace key to the active textarea WITHOUT scrolling right panel."""
         try:
             print('[BACKSPACE] Starting...')
-            
+
+            start = time.perf_counter()
+            fast = self._fast_path()
+            if fast:
+                before = fast.position_cursor_at_end()
+                if before is not None and fast.press('Backspace'):
+                    self._last_description = before[:-1]
+                    if before:  # nothing to delete, nothing to journal
+                        self._record_edit('backspace', before, before[:-1], start, path='cdp')
+                    print('[BACKSPACE] SUCCESS (CDP)')
+                    return
+
             js_find = """() => {
-    // Helper function to check if element is visually hidden
-    function isElementVisuallyHidden(element) {
-        let current = element;
-        while (current && current.tagName !== 'BODY') {
-            if (current.getAttribute('aria-hidden') === 'true') {
-                return true;
-            }
-            const style = current.getAttribute('style') || '';
-            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
-                return true;
-            }
-            current = current.parentElement;
-        }
-        return false;
-    }
-    
-    // Find all description textareas
-    const textareas = document.querySelectorAll('textarea[aria-label="Description"]');
-    
-    // Find the visible one
-    for (const ta of textareas) {
-        if (ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
-            const rect = ta.getBoundingClientRect();
-            const value = (ta.value || '').trim();
-            
-            return {
-                x: rect.left + rect.width / 2,
-                y: rect.top + rect.height / 2,
-                currentValue: value
-            };
-        }
+    // Active textarea from the in-page registry (full scan if not installed)
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    if (ta) {
+        const rect = ta.getBoundingClientRect();
+        // Untrimmed: after a name append the backspace removes the trailing space
+        const value = ta.value || '';
+        
+        return {
+            x: rect.left + rect.width / 2,
+            y: rect.top + rect.height / 2,
+            currentValue: value
+        };
     }
     
     return null;
@@ -1125,6 +1998,7 @@ class BrowserController:
 
             x = result['x']
             y = result['y']
+            before = result['currentValue']
             
             print(f'[BACKSPACE] Textarea at ({x}, {y})')
 
@@ -1176,18 +2050,18 @@ class BrowserController:
                 if not verified:
                     print('[BACKSPACE] WARNING: cursor verification failed, falling back to End key')
                     self.page.keyboard.press('End')
-                    self.page.wait_for_timeout(50)
+                    self.page.wait_for_timeout(self._waits['end_key'])
 
             except Exception as e:
                 print(f'[BACKSPACE] WARNING: programmatic positioning failed: {e}; falling back to End key')
                 try:
                     self.page.keyboard.press('End')
-                    self.page.wait_for_timeout(50)
+                    self.page.wait_for_timeout(self._waits['end_key'])
                 except Exception:
                     pass
 
             print('[BACKSPACE] Sending backspace')
-            self.page.keyboard.press('Backspace')
+            self._press_key('Backspace')
             self.page.wait_for_timeout(15)
 
             # Unfreeze scroll
@@ -1200,6 +2074,9 @@ class BrowserController:
             }""")
             print('[BACKSPACE] Scroll unfrozen')
 
+            self._last_description = before[:-1]
+            if before:
+                self._record_edit('backspace', before, before[:-1], start, path='playwright')
             print('[BACKSPACE] SUCCESS')
             
         except Exception as e:
@@ -1211,39 +2088,20 @@ class BrowserController:
         """Delete entire description."""
         try:
             print('[DELETE_ALL] Starting...')
+            start = time.perf_counter()
             
             js_find = """() => {
-    // Helper function to check if element is visually hidden
-    function isElementVisuallyHidden(element) {
-        let current = element;
-        while (current && current.tagName !== 'BODY') {
-            if (current.getAttribute('aria-hidden') === 'true') {
-                return true;
-            }
-            const style = current.getAttribute('style') || '';
-            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
-                return true;
-            }
-            current = current.parentElement;
-        }
-        return false;
-    }
-    
-    // Find all description textareas
-    const textareas = document.querySelectorAll('textarea[aria-label="Description"]');
-    
-    // Find the visible one
-    for (const ta of textareas) {
-        if (ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
-            const rect = ta.getBoundingClientRect();
-            const value = (ta.value || '').trim();
-            
-            return {
-                x: rect.left + rect.width / 2,
-                y: rect.top + rect.height / 2,
-                currentValue: value
-            };
-        }
+    // Active textarea from the in-page registry (full scan if not installed)
+    const ta = """ + ACTIVE_DESCRIPTION_EXPR + """;
+    if (ta) {
+        const rect = ta.getBoundingClientRect();
+        const value = (ta.value || '').trim();
+        
+        return {
+            x: rect.left + rect.width / 2,
+            y: rect.top + rect.height / 2,
+            currentValue: value
+        };
     }
     
     return null;
@@ -1264,40 +2122,315 @@ class BrowserController:
             
             print('[DELETE_ALL] Pressing backspace 50 times to clear description')
             for _ in range(150):
-                self.page.keyboard.press('Backspace')
+                self._press_key('Backspace')
             self.page.wait_for_timeout(5)
             print('[DELETE_ALL] SUCCESS')
             
             self._last_description = ''
+            self._record_edit('delete_all', result['currentValue'], '', start, path='playwright')
             
         except Exception as e:
             print(f'[DELETE_ALL] ERROR: {e}')
             import traceback
             traceback.print_exc()
 
+    def _do_set_description(self, value, op='set', offset=0):
+        """Replace the description from `offset` to the end with `value` in one edit (select, insert).
+
+        offset is in UTF-16 units (see description_edit.utf16_offset); 0 replaces
+        all of it. Returns the value it replaced, or None if the textarea could
+        not be found.
+        """
+        start = time.perf_counter()
+        path = 'cdp'
+        previous = None
+        fast = self._fast_path()
+        if fast:
+            previous = fast.replace_text(value, offset)
+        if previous is None:
+            path = 'playwright'
+            try:
+                previous = self.page.evaluate(SELECT_DESCRIPTION_JS, offset)
+                if previous is None:
+                    print(f'[{op.upper()}] FAILED - No textarea found')
+                    return None
+                if value:
+                    self.page.keyboard.insert_text(value)
+                elif utf16_len(previous) > offset:
+                    self._press_key('Backspace')
+            except Exception as e:
+                print(f'[{op.upper()}] ERROR: {e}')
+                return None
+        after = value
+        if offset:
+            # Read back: the kept prefix is whatever the page selected, not a Python slice
+            try:
+                after = self._read_raw_description()
+            except Exception:
+                after = None
+        if after is None:
+            after = previous.encode('utf-16-le')[:offset * 2].decode('utf-16-le', 'ignore') + value
+        self._last_description = after
+        self.latency.record(op, path, time.perf_counter() - start)
+        self._record_edit(op, previous, after, start, text=value, path=path)
+        return previous
+
+    def _read_raw_description(self):
+        """Untrimmed description value with the caret at the end (None if no textarea)."""
+        fast = self._fast_path()
+        if fast:
+            value = fast.position_cursor_at_end()
+            if value is not None:
+                return value
+        return self.page.evaluate(READ_RAW_DESCRIPTION_JS)
+
+    def _do_ensure_description(self, desired, verify=False):
+        """Make the description equal `desired` with the smallest edit; no write if it already is.
+
+        Returns {'status': 'ok' | 'skipped' | 'error', 'edit', 'before', 'after'[, 'error']}.
+        """
+        start = time.perf_counter()
+        current = self._read_raw_description()
+        if current is None:
+            return {'status': 'error', 'error': 'description textarea not found'}
+        kind, offset, text = plan_edit(current, desired)
+        if kind == 'none':
+            self._last_description = current.strip()
+            self.latency.record('ensure', 'none', time.perf_counter() - start)
+            return {'status': 'skipped', 'edit': kind, 'before': current, 'after': current}
+        self._last_description = None  # set again only if the edit goes through
+        if kind == 'append':
+            self._do_append_text(text, 'ensure')
+            if self._last_description is not None:
+                self._last_description = current + text
+        else:
+            self._do_set_description(text, 'ensure', utf16_offset(current, offset))
+        after = self._sample_description() if verify else self._last_description
+        self.latency.record('ensure', kind, time.perf_counter() - start)
+        if normalize(after) != normalize(desired):
+            return {'status': 'error', 'edit': kind, 'before': current, 'after': after,
+                    'error': f'description is {after!r}, expected {desired!r}'}
+        print(f'[ENSURE] {kind} edit: {current!r} -> {desired!r}')
+        return {'status': 'ok', 'edit': kind, 'before': current, 'after': after}
+
+    def _do_goto_photo(self, photo):
+        """Load a photo by ID or URL (no-op if it is already showing). Returns the page URL."""
+        url = photo if '://' in photo else photo_url(photo)
+        target = photo_id_from_url(url)
+        if not target:
+            raise ValueError(f'not a photo ID or URL: {photo!r}')
+        if photo_id_from_url(self.page.url) != target:
+            self._load_photo(url)
+            self._nav_count += 1
+            self._last_description = None  # not read yet; a resume samples it
+        self._last_url = self.page.url
+        return self._last_url
+
+    def _do_apply_edit(self, photo, op, text=None, verify=False):
+        """Go to `photo` and apply one edit. Returns {'status', 'before', 'after'[, 'error']}."""
+        if op not in EDIT_OPS:
+            return {'status': 'error', 'error': f'unknown op {op!r}'}
+        try:
+            self._do_goto_photo(photo)
+        except Exception as e:
+            return {'status': 'error', 'error': f'could not load photo: {e}'}
+        if op == 'ensure':
+            return self._do_ensure_description(text or '', verify)
+        before = self._sample_description()
+        if before is None:
+            return {'status': 'error', 'error': 'description textarea not found'}
+        self._last_description = before
+        text = text or ''
+        if op == 'append':
+            expected = before + text
+            self._do_append_text(text)
+        elif op == 'set':
+            expected = text
+            self._do_set_description(text, 'set')
+        elif op == 'delete_all':
+            expected = ''
+            self._do_set_description('', 'delete_all')
+        else:
+            expected, removed = self.name_catalog.refresh().remove(before, text or None)
+            if removed is None:
+                return {'status': 'skipped', 'before': before, 'after': before,
+                        'error': f'{text!r} is not in the description' if text else 'nothing to remove'}
+            self._do_remove_name(text or None)
+        after = self._sample_description() if verify else self._last_description
+        if ' '.join((after or '').split()) != ' '.join(expected.split()):
+            return {'status': 'error', 'before': before, 'after': after,
+                    'error': f'description is {after!r}, expected {expected!r}'}
+        return {'status': 'ok', 'before': before, 'after': after}
+
+    def ensure_description(self, photo, desired, timeout=60.0):
+        """Make `photo`'s description (None = the current photo) equal `desired`, writing only the difference.
+
+        Returns the same dict as apply_edit(); status 'skipped' means it already matched.
+        """
+        if photo is None:
+            try:
+                return self._call_worker('ensure', desired, timeout)
+            except RuntimeError as e:
+                return {'status': 'error', 'error': str(e)}
+        return self.apply_edit(photo, 'ensure', desired, timeout=timeout)
+
+    def goto_photo(self, photo, timeout=30.0):
+        """Load a photo by ID or URL and wait for its description textarea. Returns the URL."""
+        return self._call_worker('goto_photo', photo, timeout).get('url')
+
+    def apply_edit(self, photo, op, text=None, verify=False, timeout=60.0):
+        """Go to `photo` and apply one edit (see EDIT_OPS), waiting for the result.
+
+        Returns {'status': 'ok' | 'skipped' | 'error', 'before', 'after', 'error'}.
+        verify=True reads the description back instead of trusting the edit path.
+        """
+        try:
+            return self._call_worker('apply_edit', (photo, op, text, verify), timeout)
+        except RuntimeError as e:
+            return {'status': 'error', 'error': str(e)}
+
+    def _call_worker(self, cmd, payload, timeout):
+        """Queue (cmd, (payload, ev, res)) and wait for the worker to fill res."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        ev = threading.Event()
+        res = {}
+        self._cmd_queue.put((cmd, (payload, ev, res)))
+        if not ev.wait(timeout):
+            raise RuntimeError(f'{cmd} timed out after {timeout:.0f} s')
+        if 'error' in res and cmd == 'goto_photo':
+            raise RuntimeError(res['error'])
+        return res
+
+    def _do_remove_name(self, name=None):
+        """Remove the last catalog name (or `name`) from the description in one edit, then verify it."""
+        start = time.perf_counter()
+        current = self._sample_description()
+        if current is None:
+            print('[REMOVE_NAME] FAILED - No textarea found')
+            return
+        desired, removed = self.name_catalog.refresh().remove(current, name)
+        if removed is None:
+            print(f'[REMOVE_NAME] {name!r} is not in the description' if name else '[REMOVE_NAME] Description is empty')
+            return
+        if self._do_set_description(desired, op='remove_name') is None:
+            return
+        # Read back: the page may have rejected or re-ordered the edit
+        after = self._sample_description()
+        seconds = time.perf_counter() - start
+        if ' '.join((after or '').split()) != ' '.join(desired.split()):
+            print(f'[REMOVE_NAME] WARNING: read back {after!r}, expected {desired!r}')
+            self.latency.record('remove_name+verify', 'mismatch', seconds)
+            return
+        self.latency.record('remove_name+verify', 'ok', seconds)
+        print(f'[REMOVE_NAME] Removed {removed!r} in {seconds * 1000:.0f} ms, description now {after!r}')
+
+    def remove_last_name(self):
+        """Queue removal of the last known name (one edit, multi-word names included)."""
+        self.remove_name(None)
+
+    def remove_name(self, name):
+        """Queue removal of the last occurrence of `name` (None = the last known name)."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        self._cmd_queue.put(('remove_name', name))
+
+    def _do_undo(self, redo=False):
+        """Restore the description value before the last edit (or undo) on this photo, in one write."""
+        op = 'redo' if redo else 'undo'
+        try:
+            url = self.page.url
+        except Exception:
+            url = self._last_url
+        key = photo_id_from_url(url) or url
+        restored = self.undo_history.step(key, lambda value: self._do_set_description(value, op), redo=redo)
+        if restored is None:
+            print(f'[{op.upper()}] Nothing to {op} on this photo')
+            return
+        undo_depth, redo_depth = self.undo_history.depth(key)
+        print(f'[{op.upper()}] Description restored to {restored!r} ({undo_depth} undo / {redo_depth} redo left)')
+
     def goto_next_photo(self):
         """Queue next photo command."""
         if not self._running:
             raise RuntimeError('Browser not running')
-        self._cmd_queue.put(('next', None))
+        self._checkpoint.enqueue(self._cmd_queue, 'next', None)
+
+    def fast_forward(self, limit=None):
+        """Queue a fast-forward to the next photo that needs tagging (see _do_fast_forward)."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        self._cmd_queue.put(('fast_forward', limit))
+
+    def jump_to(self, target):
+        """Queue a jump to a photo ID/URL or a date such as '12/1/1998' (see _do_jump_to)."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        self._cmd_queue.put(('jump_to', target))
+
+    def cancel_fast_forward(self):
+        """Stop a running fast-forward after the current photo (any queued command does too)."""
+        self._ff_cancel.set()
 
     def goto_prev_photo(self):
         """Queue prev photo command."""
         if not self._running:
             raise RuntimeError('Browser not running')
-        self._cmd_queue.put(('prev', None))
+        self._checkpoint.enqueue(self._cmd_queue, 'prev', None)
 
     def append_text(self, text):
         """Queue append_text command with provided string."""
+        self._queue_append(text, 'append')
+
+    def _queue_append(self, text, op):
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        self._checkpoint.enqueue(self._cmd_queue, 'append_text', (text, op))
+
+    def _record_edit(self, op, before, after, start, text=None, path=None):
+        """Add an edit to the undo history and the journal (never raises; the edit itself already happened)."""
+        try:
+            url = self.page.url if self.page else self._last_url
+        except Exception:
+            url = self._last_url
+        if op not in ('undo', 'redo'):
+            self.undo_history.record(photo_id_from_url(url) or url, before, after)
+        self.photo_cache.update_description(photo_id_from_url(url or ''), after)
+        if after is not None:
+            self._catalog_record(url, description=after.strip())
+        if not self.journal:
+            return
+        try:
+            self.journal.record(url, op, before, after, time.perf_counter() - start, text=text, path=path)
+        except Exception as e:
+            print(f'[JOURNAL] WARNING: could not record {op}: {e}')
+
+    def _catalog_record(self, url, description=None, names=None):
+        """Update the photo catalog (never raises; it is only a side record)."""
+        if not self.photo_catalog:
+            return
+        try:
+            self.photo_catalog.record(url, description=description, names=names)
+        except Exception as e:
+            print(f'[CATALOG] WARNING: could not record {url}: {e}')
+
+    def undo(self):
+        """Queue an undo of the last edit on the current photo."""
         if not self._running:
             raise RuntimeError('Browser not running')
-        self._cmd_queue.put(('append_text', text))
+        self._cmd_queue.put(('undo', None))
+
+    def redo(self):
+        """Queue a redo of the last undone edit on the current photo."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        self._cmd_queue.put(('redo', None))
 
     def send_backspace(self):
         """Queue backspace command."""
         if not self._running:
             raise RuntimeError('Browser not running')
-        self._cmd_queue.put(('backspace', None))
+        self._checkpoint.enqueue(self._cmd_queue, 'backspace', None)
 
     def send_keystroke(self, key):
         """Send a raw keystroke to the web page without any focus/cursor manipulation."""
@@ -1309,12 +2442,16 @@ class BrowserController:
         """Queue delete all description command."""
         if not self._running:
             raise RuntimeError('Browser not running')
-        self._cmd_queue.put(('delete_all', None))
+        self._checkpoint.enqueue(self._cmd_queue, 'delete_all', None)
 
     def read_description(self, timeout=5.0):
-        """Read current description synchronously."""
+        """Read current description synchronously (read lane first, then worker queue)."""
         if not self._running:
             raise RuntimeError('Browser not running')
+        if self._read_lane and self._read_lane.ready:
+            desc = self._read_lane.read('description', timeout)
+            if desc is not None:
+                return desc
         ev = threading.Event()
         res = {}
         self._cmd_queue.put(('read_desc', (ev, res)))
@@ -1327,20 +2464,79 @@ class BrowserController:
             raise RuntimeError('Browser not running')
         self._cmd_queue.put(('dump_html', None))
 
+    def textarea_registry_stats(self, timeout=5.0):
+        """Debug: return registry rebuild/hit/miss counters from the page (None if unavailable)."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        ev = threading.Event()
+        res = {}
+        self._cmd_queue.put(('registry_stats', (ev, res)))
+        ok = ev.wait(timeout)
+        return res.get('stats') if ok else None
+
+    def throttle_status(self, timeout=5.0):
+        """Return {visibilityState, hasFocus, timerLagMs, rafMs, throttled} for the live page."""
+        if not self._running:
+            raise RuntimeError('Browser not running')
+        ev = threading.Event()
+        res = {}
+        self._cmd_queue.put(('throttle_status', (ev, res)))
+        ok = ev.wait(timeout)
+        return res.get('status') if ok else None
+
+    def read_names(self, timeout=5.0):
+        """Read visible face/album names via the read lane (None if no lane)."""
+        if self._read_lane and self._read_lane.ready:
+            return self._read_lane.read('names', timeout)
+        return None
+
+    def read_url(self, timeout=5.0):
+        """Read the live page URL via the read lane, else the last known URL."""
+        if self._read_lane and self._read_lane.ready:
+            url = self._read_lane.read('url', timeout)
+            if url:
+                return url
+        return self._last_url
+
+    def refresh_state(self):
+        """Ask the read lane to refresh the state snapshot in the background (no-op without lane)."""
+        if not (self._read_lane and self._read_lane.ready):
+            return
+
+        def _apply(snapshot):
+            # Kept apart from _last_url/_last_description: the worker's journal, undo and
+            # checkpoint rely on those, and this callback runs on the lane's thread
+            self._lane_state = snapshot
+
+        if self._snapshot_event and not self._snapshot_event.is_set():
+            return  # previous refresh still in flight
+        self._snapshot_event, _res = self._read_lane.submit('snapshot', callback=_apply)
+
     def get_state(self):
-        """Return current state for UI polling."""
-        return {
+        """Return current state for UI polling (the read lane's latest snapshot where it has one)."""
+        state = {
             'url': self._last_url,
-            'description': self._last_description
+            'description': self._last_description,
+            'names': self._last_names,
         }
+        lane = self._lane_state
+        if lane and lane.get('url'):
+            state['url'] = lane['url']
+            if lane.get('description') is not None:
+                state['description'] = lane['description']
+            state['names'] = lane.get('names')
+        return state
 
     def dump_analysis(self):
         """Run dump-explorer analysis on current page state.
 
-        This enqueues a 'dump_analysis' command for the worker to handle.
-        The worker must implement handling for the 'dump_analysis' command
-        (e.g. a `_do_dump_analysis` method) to perform the actual analysis.
+        With the read lane up the analysis runs on the caller's thread and reads
+        everything through the lane, so it never waits behind queued edits.
+        Otherwise a 'dump_analysis' command is queued for the worker.
         """
         if not self._running:
             raise RuntimeError('Browser not running')
+        if self._read_lane and self._read_lane.ready:
+            self._do_dump_analysis(evaluate=self._read_lane.evaluate)
+            return
         self._cmd_queue.put(('dump_analysis', None))
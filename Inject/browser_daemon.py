@@ -0,0 +1,176 @@
+"""Browser daemon - serve one BrowserController to several clients over a Unix socket
+
+Protocol: one JSON object per line in each direction.
+    request:  {"id": 7, "method": "append_text", "args": ["Dennis "]}
+    response: {"id": 7, "result": null}  or  {"id": 7, "error": "Browser not running"}
+
+Commands from all clients land on the controller's single worker queue, so
+they execute one at a time in arrival order. Clients disconnecting (or the UI
+crashing) leaves the browser running; only the 'shutdown' method stops it.
+"""
+import json
+import os
+import socket
+import threading
+
+from local_data import data_path
+
+
+DEFAULT_SOCKET = data_path('browser.sock')
+DAEMON_LOG = data_path('browser_daemon.log')
+
+# Methods that only enqueue or read cached state: answered inline, in arrival order
+QUEUED_METHODS = {
+    'launch_async', 'goto_next_photo', 'goto_prev_photo', 'append_text', 'send_backspace',
+    'send_keystroke', 'delete_all_description', 'undo', 'redo', 'remove_name', 'remove_last_name',
+    'dump_html', 'refresh_state', 'get_state',
+    'bandwidth_report', 'latency_report', 'resume_info', 'resume_session', 'discard_resume',
+    'fast_forward', 'cancel_fast_forward', 'jump_to',
+}
+# Methods that wait on the browser: answered from a helper thread so they do not
+# hold up the client's later commands
+BLOCKING_METHODS = {
+    'start', 'wait_ready', 'read_description', 'textarea_registry_stats', 'throttle_status',
+    'read_names', 'read_url', 'dump_analysis', 'goto_photo', 'apply_edit', 'ensure_description',
+}
+
+
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def socket_alive(path):
+    """True if a daemon is accepting connections on `path`."""
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(path):
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(0.5)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class BrowserDaemon:
+    """Owns a BrowserController and exposes its command set on a Unix socket."""
+
+    def __init__(self, controller, socket_path=None, headful=True):
+        self.controller = controller
+        self.socket_path = socket_path or DEFAULT_SOCKET
+        self.headful = headful
+        self._server = None
+        self._stopping = threading.Event()
+        self._clients = 0
+        self._lock = threading.Lock()
+
+    def serve_forever(self):
+        """Launch the browser, then accept clients until a client calls 'shutdown'."""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError('browser daemon needs Unix domain sockets (not available on this platform)')
+        if socket_alive(self.socket_path):
+            print(f'[DAEMON] Another daemon is already serving {self.socket_path}')
+            return
+        try:
+            os.unlink(self.socket_path)  # stale socket from a daemon that died
+        except OSError:
+            pass
+
+        # Warm the browser right away; clients' start() just waits for it
+        self.controller.launch_async(headful=self.headful)
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self._server.listen(8)
+        self._server.settimeout(0.5)
+        print(f'[DAEMON] Listening on {self.socket_path}')
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, _addr = self._server.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                conn.settimeout(None)
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True,
+                                 name='daemon-client').start()
+        finally:
+            self._server.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            print('[DAEMON] Stopping browser')
+            self.controller.stop()
+            print('[DAEMON] Stopped')
+
+    def shutdown(self):
+        self._stopping.set()
+
+    def _serve_client(self, conn):
+        with self._lock:
+            self._clients += 1
+            print(f'[DAEMON] Client connected ({self._clients} connected)')
+        write_lock = threading.Lock()
+
+        def reply(message):
+            with write_lock:
+                try:
+                    conn.sendall(encode(message))
+                except OSError:
+                    pass
+
+        try:
+            for line in conn.makefile('r', encoding='utf-8'):
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    reply({'id': None, 'error': f'bad request: {e}'})
+                    continue
+                method = request.get('method')
+                if method in BLOCKING_METHODS:
+                    threading.Thread(target=lambda r=request: reply(self.dispatch(r)), daemon=True).start()
+                else:
+                    reply(self.dispatch(request))
+        except OSError:
+            pass
+        finally:
+            conn.close()
+            with self._lock:
+                self._clients -= 1
+                print(f'[DAEMON] Client disconnected ({self._clients} connected)')
+
+    def dispatch(self, request):
+        """Run one request against the controller and return the response dict."""
+        rid = request.get('id')
+        method = request.get('method')
+        args = request.get('args') or []
+        try:
+            if method == 'ping':
+                return {'id': rid, 'result': 'pong'}
+            if method == 'status':
+                return {'id': rid, 'result': self._status()}
+            if method == 'shutdown':
+                self.shutdown()
+                return {'id': rid, 'result': True}
+            if method not in QUEUED_METHODS and method not in BLOCKING_METHODS:
+                return {'id': rid, 'error': f'unknown method: {method}'}
+            return {'id': rid, 'result': getattr(self.controller, method)(*args)}
+        except Exception as e:
+            return {'id': rid, 'error': str(e)}
+
+    def _status(self):
+        c = self.controller
+        return {
+            'running': c._running,
+            'ready': c._ready_event.is_set() and not c._start_error,
+            'error': c._start_error,
+            'attached': c._attached,
+            'clients': self._clients,
+        }
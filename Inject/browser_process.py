@@ -0,0 +1,254 @@
+"""Browser process - run BrowserController in a child process so the UI never shares its GIL
+
+Commands go to the child over a multiprocessing Pipe (same request/response
+dicts as browser_daemon.py). Input commands are posted without waiting for a
+reply, so a key press costs one pipe write however busy the child is. The
+child publishes the latest URL/description/names into a small shared-memory
+block that get_state() reads without a round trip.
+"""
+import json
+import multiprocessing
+import struct
+import sys
+import threading
+
+from browser_client import BrowserClient
+
+
+STATE_SIZE = 64 * 1024
+
+
+class SharedState:
+    """Seqlock-protected JSON snapshot in shared memory: one writer, any number of readers.
+
+    Layout: uint64 sequence (odd while a write is in progress), uint32 payload
+    length, then the UTF-8 JSON payload.
+    """
+
+    HEADER = struct.Struct('<QI')
+
+    def __init__(self, name=None, size=STATE_SIZE):
+        from multiprocessing import shared_memory
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.HEADER.pack_into(self.shm.buf, 0, 0, 0)
+        else:
+            try:
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Before 3.13 attaches are tracked too; spawned children share the
+                # parent's resource tracker, so this only re-adds the same name
+                self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._seq = 0
+        self._last = None
+
+    def write(self, state):
+        """Publish a snapshot dict (writer side only)."""
+        room = self.shm.size - self.HEADER.size
+        data = self._encode(state)
+        if len(data) > room:
+            # Names lists are the only unbounded part: drop them, then shorten the description
+            # until the whole payload fits (serialized JSON is never cut, it would not parse)
+            description = state.get('description') or ''
+            state = {'url': state.get('url'), 'description': description, 'names': None}
+            data = self._encode(state)
+            while len(data) > room and state['description']:
+                keep = max(0, len(state['description']) * room // len(data) - 1)
+                state['description'] = description[:min(keep, len(state['description']) - 1)]
+                data = self._encode(state)
+            if len(data) > room:
+                print('[PROCESS] WARNING: state snapshot does not fit in shared memory, not published')
+                return
+        buf = self.shm.buf
+        self._seq += 1
+        struct.pack_into('<Q', buf, 0, self._seq)
+        buf[self.HEADER.size:self.HEADER.size + len(data)] = data
+        self._seq += 1
+        self.HEADER.pack_into(buf, 0, self._seq, len(data))
+
+    @staticmethod
+    def _encode(state):
+        return json.dumps(state, separators=(',', ':')).encode('utf-8')
+
+    def read(self):
+        """Return the latest consistent snapshot (the previous one if a write is in progress)."""
+        buf = self.shm.buf
+        for _ in range(3):
+            seq, length = self.HEADER.unpack_from(buf, 0)
+            if seq == 0:
+                return self._last
+            if seq % 2:
+                continue
+            data = bytes(buf[self.HEADER.size:self.HEADER.size + length])
+            if struct.unpack_from('<Q', buf, 0)[0] != seq:
+                continue
+            try:
+                self._last = json.loads(data)
+            except ValueError:
+                continue
+            return self._last
+        return self._last
+
+    def close(self, unlink=False):
+        try:
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+        except Exception:
+            pass
+
+
+class BrowserProcess(BrowserClient):
+    """BrowserController API backed by a child process (see module docstring)."""
+
+    def __init__(self, controller_options=None):
+        """Args:
+            controller_options: BrowserController keyword arguments (must be picklable)
+        """
+        super().__init__()
+        self.controller_options = dict(controller_options or {})
+        self._process = None
+        self._conn = None
+        self._state = None
+
+    # ---- transport (replaces the daemon socket) -----------------------------
+
+    def _connected(self):
+        return self._conn is not None
+
+    def _send(self, message):
+        self._conn.send(message)
+
+    def _post(self, method, *args):
+        """Send a command without waiting for the child to acknowledge it."""
+        if not self._running or not self._conn:
+            raise RuntimeError('Browser not running')
+        try:
+            with self._send_lock:
+                self._conn.send({'id': None, 'method': method, 'args': list(args)})
+        except (OSError, EOFError) as e:
+            self._running = False
+            raise RuntimeError(f'browser process is gone: {e}')
+
+    def _read_loop(self, conn):
+        try:
+            while True:
+                self._deliver(conn.recv())
+        except (EOFError, OSError):
+            pass
+        finally:
+            self._connection_lost()
+
+    # ---- lifecycle ----------------------------------------------------------
+
+    def launch_async(self, headful=True):
+        """Spawn the child process; it starts Chrome right away."""
+        if self._process and self._process.is_alive():
+            return True
+        ctx = multiprocessing.get_context('spawn')  # never fork a process that has Tk and threads
+        self._state = SharedState()
+        parent_conn, child_conn = ctx.Pipe()
+        import browser_child
+        self._process = ctx.Process(target=browser_child.child_main, name='browser-process', daemon=True,
+                                    args=(child_conn, self.controller_options, self._state.name, headful))
+        # spawn re-imports __main__ in the child; make that browser_child rather than
+        # inject.py, which would load argparse, tkinter and the UI for nothing
+        main = sys.modules['__main__']
+        sys.modules['__main__'] = browser_child
+        try:
+            self._process.start()
+        finally:
+            sys.modules['__main__'] = main
+        child_conn.close()
+        self._conn = parent_conn
+        self._reader = threading.Thread(target=self._read_loop, args=(parent_conn,), daemon=True,
+                                        name='browser-process-reader')
+        self._reader.start()
+        print(f'[PROCESS] Browser worker running in child process {self._process.pid}')
+        return True
+
+    def connect(self, timeout=15.0):
+        self.launch_async()
+
+    def start(self, headful=True, timeout=30):
+        self.launch_async(headful=headful)
+        self.wait_ready(timeout=timeout)
+
+    def stop(self):
+        """Stop the browser and the child process."""
+        self._running = False
+        conn, self._conn = self._conn, None
+        if conn:
+            try:
+                with self._send_lock:
+                    conn.send({'id': None, 'method': 'stop', 'args': []})
+            except (OSError, EOFError):
+                pass
+        if self._process:
+            self._process.join(timeout=10)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if conn:
+            conn.close()
+        if self._state:
+            self._state.close(unlink=True)
+            self._state = None
+
+    # ---- fire-and-forget input commands -------------------------------------
+
+    def goto_next_photo(self):
+        self._post('goto_next_photo')
+
+    def goto_prev_photo(self):
+        self._post('goto_prev_photo')
+
+    def append_text(self, text):
+        self._post('append_text', text)
+
+    def send_backspace(self):
+        self._post('send_backspace')
+
+    def send_keystroke(self, key):
+        self._post('send_keystroke', key)
+
+    def delete_all_description(self):
+        self._post('delete_all_description')
+
+    def remove_name(self, name):
+        self._post('remove_name', name)
+
+    def remove_last_name(self):
+        self._post('remove_last_name')
+
+    def undo(self):
+        self._post('undo')
+
+    def fast_forward(self, limit=None):
+        self._post('fast_forward', limit)
+
+    def cancel_fast_forward(self):
+        self._post('cancel_fast_forward')
+
+    def jump_to(self, target):
+        self._post('jump_to', target)
+
+    def redo(self):
+        self._post('redo')
+
+    def dump_html(self):
+        self._post('dump_html')
+
+    def dump_analysis(self):
+        self._post('dump_analysis')
+
+    # ---- state: shared memory, no round trip --------------------------------
+
+    def refresh_state(self):
+        pass  # the child publishes every browser_child.PUBLISH_INTERVAL
+
+    def get_state(self):
+        snapshot = self._state.read() if self._state else None
+        return snapshot or {'url': None, 'description': None, 'names': None}
+
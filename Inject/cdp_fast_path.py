@@ -0,0 +1,195 @@
+"""CDP fast path - raw DevTools protocol calls for the hottest edit operations"""
+import time
+
+from description_edit import utf16_len
+from textarea_registry import ACTIVE_DESCRIPTION_EXPR
+
+
+# Cheap validity check - no layout, just DOM attributes
+_STILL_ACTIVE_CHECK = "if (!this.isConnected || this.closest('[aria-hidden=\"true\"]')) return {stale: true};"
+
+READ_VALUE_FN = "function() { " + _STILL_ACTIVE_CHECK + " return {value: (this.value || '').trim()}; }"
+
+FOCUS_END_FN = ("function() { " + _STILL_ACTIVE_CHECK +
+                " this.focus({preventScroll: true});"
+                " this.selectionStart = this.value.length; this.selectionEnd = this.value.length;"
+                " return {value: this.value || ''}; }")
+
+SELECT_FROM_FN = ("function(offset) { " + _STILL_ACTIVE_CHECK +
+                  " this.focus({preventScroll: true}); this.setSelectionRange(offset, this.value.length);"
+                  " return {value: this.value || ''}; }")
+
+# Only keys that do not produce text; printable characters are sent with `text`
+KEY_DEFINITIONS = {
+    'ArrowLeft': ('ArrowLeft', 37),
+    'ArrowRight': ('ArrowRight', 39),
+    'ArrowUp': ('ArrowUp', 38),
+    'ArrowDown': ('ArrowDown', 40),
+    'Backspace': ('Backspace', 8),
+    'Delete': ('Delete', 46),
+    'End': ('End', 35),
+    'Home': ('Home', 36),
+    'Escape': ('Escape', 27),
+}
+
+
+class CDPFastPath:
+    """Raw CDPSession for one page: remembers the active textarea's objectId.
+
+    Every public method returns None on any protocol error so the caller can
+    fall back to the regular Playwright path.
+    """
+
+    def __init__(self, page, latency=None):
+        self.page = page
+        self.latency = latency
+        self.session = None
+        self.enabled = False
+        self.failures = 0
+        self._object_id = None
+        self._object_url = None
+
+    def attach(self):
+        """Open the CDP session and subscribe to execution context changes."""
+        try:
+            self.session = self.page.context.new_cdp_session(self.page)
+            self.session.on('Runtime.executionContextsCleared', lambda _params: self.invalidate())
+            self.session.on('Runtime.executionContextDestroyed', lambda _params: self.invalidate())
+            self.session.send('Runtime.enable')
+            self.enabled = True
+            print('[CDP] Fast path attached')
+        except Exception as e:
+            self.enabled = False
+            print(f'[CDP] Fast path unavailable, using Playwright only: {e}')
+        return self.enabled
+
+    def detach(self):
+        """Drop the CDP session (page is going away or being replaced)."""
+        self.invalidate()
+        self.enabled = False
+        try:
+            if self.session:
+                self.session.detach()
+        except Exception:
+            pass
+        self.session = None
+
+    def invalidate(self):
+        """Forget the remembered textarea objectId."""
+        self._object_id = None
+        self._object_url = None
+
+    def _resolve_textarea(self):
+        """Return objectId of the active Description textarea, resolving it if needed."""
+        url = self.page.url
+        if self._object_id and self._object_url == url:
+            return self._object_id
+        self.invalidate()
+        resp = self.session.send('Runtime.evaluate', {
+            'expression': ACTIVE_DESCRIPTION_EXPR,
+            'returnByValue': False,
+        })
+        remote = resp.get('result', {})
+        object_id = remote.get('objectId')
+        if not object_id or remote.get('subtype') == 'null':
+            return None
+        self._object_id = object_id
+        self._object_url = url
+        return object_id
+
+    def _call_on_textarea(self, function_declaration, args=()):
+        """Run a function with `this` bound to the textarea; re-resolve once if stale."""
+        for _attempt in range(2):
+            object_id = self._resolve_textarea()
+            if not object_id:
+                return None
+            resp = self.session.send('Runtime.callFunctionOn', {
+                'functionDeclaration': function_declaration,
+                'objectId': object_id,
+                'arguments': [{'value': arg} for arg in args],
+                'returnByValue': True,
+            })
+            if resp.get('exceptionDetails'):
+                raise RuntimeError(resp['exceptionDetails'].get('text', 'callFunctionOn failed'))
+            value = resp.get('result', {}).get('value') or {}
+            if not value.get('stale'):
+                return value
+            self.invalidate()
+        return None
+
+    def _run(self, op, fn):
+        """Time fn() as the 'cdp' path for op; return None on any error."""
+        if not self.enabled or not self.session:
+            return None
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.failures += 1
+            self.invalidate()
+            print(f'[CDP] {op} failed, falling back to Playwright: {e}')
+            return None
+        if result is not None and self.latency:
+            self.latency.record(op, 'cdp', time.perf_counter() - start)
+        return result
+
+    def read_description(self):
+        """Return trimmed description value, or None."""
+        def _read():
+            value = self._call_on_textarea(READ_VALUE_FN)
+            return value.get('value') if value else None
+        return self._run('read', _read)
+
+    def position_cursor_at_end(self):
+        """Focus the textarea (no scroll) with caret at end. Returns current value or None."""
+        def _focus():
+            value = self._call_on_textarea(FOCUS_END_FN)
+            return value.get('value') if value else None
+        return self._run('cursor_end', _focus)
+
+    def append_text(self, text):
+        """Focus textarea at end and insert text. Returns the value before the append, or None."""
+        def _append():
+            value = self._call_on_textarea(FOCUS_END_FN)
+            if not value:
+                return None
+            self.session.send('Input.insertText', {'text': text})
+            return value.get('value', '')
+        return self._run('append', _append)
+
+    def replace_text(self, text, offset=0):
+        """Select the description from `offset` (UTF-16 units) to the end and type `text` over it as one input.
+
+        Returns the old value, or None.
+        """
+        def _replace():
+            value = self._call_on_textarea(SELECT_FROM_FN, (offset,))
+            if not value:
+                return None
+            if text:
+                self.session.send('Input.insertText', {'text': text})
+            elif utf16_len(value.get('value', '')) > offset and not self._dispatch_key('Backspace'):
+                return None  # insertText('') is a no-op; Backspace deletes the selection
+            return value.get('value', '')
+        return self._run('replace', _replace)
+
+    def press(self, key):
+        """Dispatch a key press (keyDown + keyUp). Returns True, or None on error."""
+        return self._run(f'key:{key}' if key in KEY_DEFINITIONS else 'key:char',
+                         lambda: self._dispatch_key(key))
+
+    def _dispatch_key(self, key):
+        if key in KEY_DEFINITIONS:
+            code, vk = KEY_DEFINITIONS[key]
+            down = {'type': 'rawKeyDown', 'key': key, 'code': code,
+                    'windowsVirtualKeyCode': vk, 'nativeVirtualKeyCode': vk}
+        elif len(key) == 1:
+            down = {'type': 'keyDown', 'key': key, 'text': key, 'unmodifiedText': key}
+        else:
+            return None
+        self.session.send('Input.dispatchKeyEvent', down)
+        up = dict(down, type='keyUp')
+        up.pop('text', None)
+        up.pop('unmodifiedText', None)
+        self.session.send('Input.dispatchKeyEvent', up)
+        return True
@@ -0,0 +1,148 @@
+"""Chrome profile helpers - profile location and DevTools endpoint discovery"""
+import os
+import pathlib
+import shutil
+import socket
+import subprocess
+import time
+import urllib.request
+
+
+def profile_dir():
+    """Return the persistent Chrome profile directory used by the tagger."""
+    return str(pathlib.Path.home() / '.googlephotos_profile')
+
+
+def devtools_endpoint(user_data_dir=None):
+    """Return 'http://127.0.0.1:<port>' from Chrome's DevToolsActivePort file, or None.
+
+    Chrome writes this file into the profile when started with
+    --remote-debugging-port (port 0 picks a free one).
+    """
+    user_data_dir = user_data_dir or profile_dir()
+    path = os.path.join(user_data_dir, 'DevToolsActivePort')
+    try:
+        with open(path, encoding='utf-8') as f:
+            port = f.readline().strip()
+    except OSError:
+        return None
+    if not port.isdigit():
+        return None
+    return f'http://127.0.0.1:{port}'
+
+
+def lock_owner_pid(user_data_dir=None):
+    """Return the pid recorded in the profile's SingletonLock ('<host>-<pid>' symlink), or None.
+
+    Only locks taken on this host are reported; Windows uses a plain lockfile
+    and always returns None here.
+    """
+    user_data_dir = user_data_dir or profile_dir()
+    try:
+        target = os.readlink(os.path.join(user_data_dir, 'SingletonLock'))
+    except (OSError, AttributeError, NotImplementedError):
+        return None
+    host, _, pid = target.rpartition('-')
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    return int(pid)
+
+
+def profile_in_use(user_data_dir=None):
+    """True if a live Chrome holds the profile lock (stale locks from crashed Chromes are ignored)."""
+    user_data_dir = user_data_dir or profile_dir()
+    # lexists: SingletonLock is a dangling symlink on Linux/macOS, exists() is always False for it
+    if not os.path.lexists(os.path.join(user_data_dir, 'SingletonLock')):
+        return False
+    pid = lock_owner_pid(user_data_dir)
+    if pid is None:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # e.g. PermissionError: alive, owned by another user
+    return True
+
+
+def endpoint_alive(endpoint, timeout=1.0):
+    """True if a DevTools HTTP endpoint answers /json/version."""
+    try:
+        with urllib.request.urlopen(endpoint + '/json/version', timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+def live_endpoint(user_data_dir=None, port=None):
+    """Return the DevTools endpoint of the Chrome running on the profile, or None.
+
+    Tries the DevToolsActivePort file first, then the fixed port if given.
+    The file survives Chrome crashes, so every candidate is probed.
+    """
+    candidates = [devtools_endpoint(user_data_dir)]
+    if port:
+        candidates.append(f'http://127.0.0.1:{port}')
+    for endpoint in candidates:
+        if endpoint and endpoint_alive(endpoint):
+            return endpoint
+    return None
+
+
+def chrome_executable():
+    """Return the path of the installed Google Chrome (what channel='chrome' uses), or None."""
+    candidates = [
+        '/opt/google/chrome/chrome',
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+        os.path.expandvars(r'%ProgramFiles%\Google\Chrome\Application\chrome.exe'),
+        os.path.expandvars(r'%ProgramFiles(x86)%\Google\Chrome\Application\chrome.exe'),
+        os.path.expandvars(r'%LocalAppData%\Google\Chrome\Application\chrome.exe'),
+    ]
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    for name in ('google-chrome', 'google-chrome-stable', 'chrome'):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def launch_chrome(user_data_dir=None, args=None, headful=True, url='https://photos.google.com'):
+    """Start Chrome on the profile as an independent process that outlives this one.
+
+    args must include --remote-debugging-port so the caller can attach.
+    Returns the Popen object.
+    """
+    executable = chrome_executable()
+    if not executable:
+        raise RuntimeError('Google Chrome not found; install it or run without --keep-browser')
+    user_data_dir = user_data_dir or profile_dir()
+    # A DevToolsActivePort left behind by a crashed Chrome would be picked up as ours
+    try:
+        os.remove(os.path.join(user_data_dir, 'DevToolsActivePort'))
+    except OSError:
+        pass
+    cmd = [executable, f'--user-data-dir={user_data_dir}', '--no-first-run', '--no-default-browser-check']
+    cmd.extend(args or [])
+    if not headful:
+        cmd.append('--headless=new')
+    cmd.append(url)
+    kwargs = {'stdin': subprocess.DEVNULL, 'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(cmd, **kwargs)
+
+
+def wait_for_endpoint(user_data_dir=None, port=None, timeout=20.0):
+    """Poll until Chrome on the profile serves DevTools; return the endpoint or None on timeout."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        endpoint = live_endpoint(user_data_dir, port)
+        if endpoint:
+            return endpoint
+        time.sleep(0.1)
+    return None
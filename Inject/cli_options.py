@@ -0,0 +1,72 @@
+"""CLI options - browser command-line flags shared by the tagger UI and batch mode"""
+from render_profile import parse_viewport
+
+
+def add_browser_arguments(parser, session_resume=True):
+    """Add the BrowserController flags (CDP, rendering, profile, recycling, journal, resume) to `parser`.
+
+    session_resume=False leaves out --resume (batch mode has its own).
+    """
+    parser.add_argument('--no-cdp', action='store_true', help='Disable the raw CDP fast path (Playwright API only)')
+    parser.add_argument('--compare-latency', type=int, default=0, metavar='N',
+                        help='Run every Nth command through Playwright to compare latency with the CDP fast path')
+    parser.add_argument('--read-lane', action='store_true',
+                        help='Serve description/name/URL reads on a second CDP connection, in parallel with edits')
+    parser.add_argument('--read-ahead', type=int, nargs='?', const=2, default=0, metavar='N',
+                        help='Keep a background tab N photos (default 2) ahead, caching their descriptions and '
+                             'names so next/prev only has to confirm them')
+    parser.add_argument('--no-animations', action='store_true',
+                        help='Reduced-motion emulation and zero-duration transitions for faster photo settle times')
+    parser.add_argument('--viewport', metavar='WxH', help='Smaller browser viewport, e.g. 1024x768')
+    parser.add_argument('--allow-throttling', action='store_true',
+                        help='Do not disable Chrome background throttling (default keeps full speed while unfocused)')
+    parser.add_argument('--low-bandwidth', type=int, nargs='?', const=1024, default=None, metavar='PX',
+                        help='Request photos at most PX pixels (default 1024) and block video/telemetry '
+                             '(disables the browser HTTP cache while on)')
+    parser.add_argument('--cdp-port', type=int, default=None, metavar='PORT',
+                        help='Fixed Chrome remote-debugging port (default: Chrome picks a free one)')
+    parser.add_argument('--keep-browser', action='store_true',
+                        help='Run Chrome as its own process and leave it open on exit; the next start attaches to it')
+    parser.add_argument('--tmpfs-profile', action='store_true',
+                        help='Run Chrome from a RAM copy of the profile in /dev/shm, synced back to disk '
+                             'every 5 minutes (open databases excluded) and in full once Chrome has closed')
+    parser.add_argument('--recycle-every', type=int, default=50, metavar='N',
+                        help='Check the tab\'s JS heap/DOM size every N photos and recycle it past the limits (0 = off)')
+    parser.add_argument('--recycle-mode', choices=['reload', 'new-page'], default='reload',
+                        help='Recycle by reloading the current photo, or by opening a fresh tab and closing the old one')
+    parser.add_argument('--max-heap-mb', type=int, default=512, help='Recycle when JS heap use exceeds this (MB)')
+    parser.add_argument('--max-nodes', type=int, default=150000, help='Recycle when the DOM exceeds this many nodes')
+    parser.add_argument('--max-listeners', type=int, default=30000,
+                        help='Recycle when the page has more than this many event listeners')
+    parser.add_argument('--no-journal', action='store_true',
+                        help='Do not record description edits in ~/.googlephotos_tagger/journal.db')
+    parser.add_argument('--no-catalog', action='store_true',
+                        help='Do not keep descriptions and names seen in ~/.googlephotos_tagger/catalog.db')
+    if session_resume:
+        parser.add_argument('--resume', choices=['ask', 'auto', 'never'], default='ask',
+                            help='Going back to the last session\'s photo and replaying its unfinished commands: '
+                                 'ask when the browser is ready, do it automatically at launch, or never')
+
+
+def controller_options(args, **overrides):
+    """BrowserController keyword arguments from parsed flags (picklable)."""
+    options = dict(cdp_fast_path=not args.no_cdp, compare_every=args.compare_latency,
+                   read_lane=args.read_lane, no_animations=args.no_animations,
+                   viewport=parse_viewport(args.viewport),
+                   anti_throttle=not args.allow_throttling,
+                   low_bandwidth=args.low_bandwidth,
+                   cdp_port=args.cdp_port,
+                   keep_browser=args.keep_browser,
+                   tmpfs_profile=args.tmpfs_profile,
+                   recycle_every=args.recycle_every,
+                   recycle_mode=args.recycle_mode.replace('-', '_'),
+                   recycle_thresholds={'JSHeapUsedSize': args.max_heap_mb * 1024 * 1024,
+                                       'Nodes': args.max_nodes,
+                                       'JSEventListeners': args.max_listeners},
+                   journal=not args.no_journal,
+                   resume=getattr(args, 'resume', 'ask'),
+                   read_ahead=args.read_ahead,
+                   catalog=not args.no_catalog,
+                   debug=args.debug)
+    options.update(overrides)
+    return options
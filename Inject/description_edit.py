@@ -0,0 +1,42 @@
+"""Description edit - smallest edit that turns the current description into a desired one"""
+
+
+def normalize(text):
+    """Collapse whitespace; descriptions equal under this need no edit."""
+    return ' '.join((text or '').split())
+
+
+def utf16_len(text):
+    """Length in UTF-16 code units, what JS string indices and setSelectionRange count."""
+    return len((text or '').encode('utf-16-le')) // 2
+
+
+def utf16_offset(text, offset):
+    """Code-point `offset` into `text` as a UTF-16 offset (differs after emoji and other astral characters)."""
+    return utf16_len((text or '')[:offset])
+
+
+def plan_edit(current, desired):
+    """Return (kind, offset, text) turning `current` into `desired`.
+
+    kind is one of:
+        'none'     already matches (ignoring whitespace runs and trailing spaces)
+        'append'   current is a prefix of desired: type `text` at the end
+        'suffix'   keep current[:offset], replace the rest with `text`
+        'replace'  nothing in common at the start: replace everything with `text`
+
+    offset counts code points; pass utf16_offset(current, offset) to the page.
+    """
+    current = current or ''
+    desired = desired or ''
+    if normalize(current) == normalize(desired):
+        return 'none', len(current), ''
+    offset = 0
+    limit = min(len(current), len(desired))
+    while offset < limit and current[offset] == desired[offset]:
+        offset += 1
+    if offset == len(current):
+        return 'append', offset, desired[offset:]
+    if offset == 0:
+        return 'replace', 0, desired
+    return 'suffix', offset, desired[offset:]
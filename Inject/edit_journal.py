@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Edit journal - durable, append-only log of every description edit.
+
+Each edit is one row in a WAL-mode SQLite database (~/.googlephotos_tagger/journal.db):
+photo ID, URL, time, operation (append / backspace / delete_all / extraction / undo / ...),
+the description before and after, and how long the edit took. Rows are
+written by a background thread in batched commits, so recording an edit
+costs the browser worker a queue.put.
+
+Usage:
+    python edit_journal.py                        # last 20 edits
+    python edit_journal.py --photo AF1Qip...      # history of one photo (ID or URL)
+    python edit_journal.py --since 2026-10-01 --until 2026-10-02
+"""
+import argparse
+import datetime
+import time
+
+from local_data import data_path
+from photo_ids import photo_id_from_url
+from sqlite_writer import SqliteWriter
+
+
+JOURNAL_DB = data_path('journal.db')
+
+OPS = ('append', 'backspace', 'delete_all', 'extraction', 'set', 'ensure', 'undo', 'redo', 'remove_name')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS edits (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    photo_id TEXT,
+    url TEXT,
+    op TEXT NOT NULL,
+    text TEXT,
+    before TEXT,
+    after TEXT,
+    latency_ms REAL,
+    path TEXT
+);
+CREATE INDEX IF NOT EXISTS edits_photo ON edits (photo_id, ts);
+CREATE INDEX IF NOT EXISTS edits_ts ON edits (ts);
+"""
+
+COLUMNS = 'id, ts, photo_id, url, op, text, before, after, latency_ms, path'
+
+
+def to_timestamp(value):
+    """Unix time from a number, a datetime/date, or an ISO date/time string (local time)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day).timestamp()
+    return datetime.datetime.fromisoformat(str(value).strip()).timestamp()
+
+
+class EditJournal:
+    """Records description edits and answers queries by photo or time range."""
+
+    def __init__(self, path=None):
+        self.path = path or JOURNAL_DB
+        self._writer = SqliteWriter(self.path, SCHEMA, name='journal-writer')
+        self.recorded = 0
+
+    def record(self, url, op, before, after, seconds=None, text=None, path=None):
+        """Queue one edit; returns immediately.
+
+        Args:
+            url: Photo URL the edit was made on (the photo ID is taken from it)
+            op: One of OPS
+            before / after: Description text before and after the edit (None if unknown)
+            seconds: How long the edit took
+            text: Text typed, for append/extraction
+            path: 'cdp' or 'playwright'
+        """
+        self._writer.execute(
+            f'INSERT INTO edits ({COLUMNS}) VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (time.time(), photo_id_from_url(url), url, op, text, before, after,
+             None if seconds is None else seconds * 1000, path))
+        self.recorded += 1
+
+    def for_photo(self, photo, limit=None):
+        """All edits of one photo (ID or URL), oldest first."""
+        photo_id = photo_id_from_url(photo) or photo
+        sql = f'SELECT {COLUMNS} FROM edits WHERE photo_id = ? ORDER BY ts, id'
+        return self._query(sql, (photo_id,), limit)
+
+    def between(self, start=None, end=None, limit=None):
+        """Edits with start <= time < end, oldest first (either bound may be None)."""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('ts >= ?')
+            params.append(to_timestamp(start))
+        if end is not None:
+            clauses.append('ts < ?')
+            params.append(to_timestamp(end))
+        where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        return self._query(f'SELECT {COLUMNS} FROM edits{where} ORDER BY ts, id', params, limit)
+
+    def recent(self, count=20):
+        """The last `count` edits, oldest first."""
+        rows = self._writer.query(f'SELECT {COLUMNS} FROM edits ORDER BY ts DESC, id DESC LIMIT ?', (count,))
+        return rows[::-1]
+
+    def _query(self, sql, params, limit):
+        if limit:
+            sql += ' LIMIT ?'
+            params = list(params) + [limit]
+        return self._writer.query(sql, params)
+
+    def flush(self, timeout=5.0):
+        return self._writer.flush(timeout)
+
+    def close(self):
+        self._writer.close()
+
+    def report(self):
+        """Printable summary of what this session wrote."""
+        w = self._writer
+        if not self.recorded:
+            return ['[JOURNAL] No edits this session']
+        per_batch = w.commit_seconds * 1000 / w.batches if w.batches else 0
+        return [f'[JOURNAL] {self.recorded} edits journaled to {self.path} '
+                f'({w.batches} commits, {per_batch:.1f} ms per commit)']
+
+
+def format_row(row):
+    when = datetime.datetime.fromtimestamp(row['ts']).strftime('%Y-%m-%d %H:%M:%S')
+    latency = f'{row["latency_ms"]:.0f}ms' if row['latency_ms'] is not None else '-'
+    return (f'{when} {row["photo_id"] or "-"} {row["op"]:<10} {latency:>6} '
+            f'{row["before"]!r} -> {row["after"]!r}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the description edit journal')
+    parser.add_argument('--db', default=JOURNAL_DB, help='Journal database (default: %(default)s)')
+    parser.add_argument('--photo', help='Photo ID or URL')
+    parser.add_argument('--since', help='Start time, e.g. 2026-10-01 or 2026-10-01T09:30')
+    parser.add_argument('--until', help='End time (exclusive)')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    journal = EditJournal(args.db)
+    try:
+        if args.photo:
+            rows = journal.for_photo(args.photo, limit=args.limit)
+        elif args.since or args.until:
+            rows = journal.between(args.since, args.until, limit=args.limit)
+        else:
+            rows = journal.recent(args.limit)
+        for row in rows:
+            print(format_row(row))
+        if not rows:
+            print('No matching edits')
+    finally:
+        journal.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -7,35 +7,99 @@ Google Photos description tagger with old device spoofing
 - Append names to description
 - Backspace functionality
 - Show current photo URL and description
+
+Batch mode (no UI): python inject.py batch --manifest edits.jsonl  (see batch_apply.py)
+Index the library:  python inject.py crawl [--url ALBUM_URL]     (see library_crawler.py)
+Search the catalog: python inject.py query --face Laura --missing Laura  (see photo_catalog.py)
 """
 import argparse
+from startup_timer import StartupTimer
+STARTUP = StartupTimer()  # started before the heavier imports below
+
+import sys
+
+if __name__ == '__main__' and sys.argv[1:2] == ['batch']:
+    # UI-free batch mode: dispatched before tkinter (or the UI modules) are imported
+    from batch_apply import main as batch_main
+    sys.exit(batch_main(sys.argv[2:]))
+if __name__ == '__main__' and sys.argv[1:2] == ['crawl']:
+    from library_crawler import main as crawl_main
+    sys.exit(crawl_main(sys.argv[2:]))
+if __name__ == '__main__' and sys.argv[1:2] == ['query']:
+    from photo_catalog import main as query_main
+    sys.exit(query_main(sys.argv[2:]))
+
 import tkinter as tk
 from browser_controller import BrowserController
+import cli_options
 from keystroke_handler import KeystrokeHandler
 from ui_components import AssistantUI
+STARTUP.mark('modules imported')
 
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Google Photos Tagger')
-parser.add_argument('--debug', action='store_true', help='Enable debug mode (shows READ and DUMP HTML buttons)')
+parser.add_argument('--debug', action='store_true',
+                    help='Enable debug mode (shows READ and DUMP HTML buttons, startup timing breakdown)')
+cli_options.add_browser_arguments(parser)
+parser.add_argument('--daemon', action='store_true',
+                    help='Run only the browser as a daemon serving clients on a Unix socket (no UI)')
+parser.add_argument('--connect', action='store_true',
+                    help='Use the browser daemon (started automatically if not running); '
+                         'closing the UI leaves the browser open')
+parser.add_argument('--process', action='store_true',
+                    help='Run the browser worker in a child process so browser work never stalls the UI')
+parser.add_argument('--socket', metavar='PATH', default=None,
+                    help='Daemon socket path (default ~/.googlephotos_tagger/browser.sock)')
 args = parser.parse_args()
 DEBUG_MODE = args.debug
 
 
+def controller_options():
+    """BrowserController keyword arguments from the command line (picklable)."""
+    return cli_options.controller_options(args)
+
+
+def make_controller():
+    """BrowserController configured from the command line."""
+    return BrowserController(startup_timer=STARTUP, **controller_options())
+
+
 def main():
+    if args.daemon:
+        from browser_daemon import BrowserDaemon
+        BrowserDaemon(make_controller(), socket_path=args.socket).serve_forever()
+        return
+
     # Create components
-    browser = BrowserController()
-    keystroke = KeystrokeHandler(browser)
+    if args.connect:
+        from browser_client import BrowserClient, daemon_command
+        # Connecting (or spawning the daemon) happens in launch_with_mode, off the UI thread
+        browser = BrowserClient(socket_path=args.socket, daemon_argv=daemon_command(sys.argv[1:]))
+    elif args.process:
+        from browser_process import BrowserProcess
+        browser = BrowserProcess(controller_options())
+        browser.launch_async(headful=True)
+        STARTUP.mark('browser process started')
+    else:
+        browser = make_controller()
+        # Launch Chrome first: Playwright is imported and Chrome started on the
+        # browser worker thread while the Tk window is built below
+        browser.launch_async(headful=True)
+        STARTUP.mark('browser launch started')
+    keystroke = KeystrokeHandler(browser, verbose=DEBUG_MODE)
     
     # Create UI
     root = tk.Tk()
-    app = AssistantUI(root, browser, keystroke, debug_mode=DEBUG_MODE)
+    app = AssistantUI(root, browser, keystroke, debug_mode=DEBUG_MODE, startup_timer=STARTUP)
+    STARTUP.mark('ui built')
     
     # Setup shutdown
     root.protocol('WM_DELETE_WINDOW', app.shutdown)
     
-    # Auto-launch browser at startup
-    root.after(500, lambda: app.launch_with_mode('default'))
+    # Wait for the launch started above off the UI thread, then enable the controls
+    root.after_idle(lambda: STARTUP.mark('ui shown'))
+    app.launch_with_mode('default')
     
     # Run
     root.mainloop()
@@ -7,10 +7,14 @@ import re
 class KeystrokeHandler:
     """Manages keyboard shortcuts from names.json."""
     
-    def __init__(self, browser_controller, names_file=None):
-        """Initialize keystroke handler with browser controller and optional names file path."""
+    def __init__(self, browser_controller, names_file=None, verbose=False):
+        """Initialize keystroke handler with browser controller and optional names file path.
+
+        verbose prints every registered shortcut (slow with long names.json files; debug only).
+        """
         self.browser = browser_controller
         self.names_file = names_file
+        self.verbose = verbose
         self.shortcuts = {}
         self.names_list = []  # Store original names list for UI
         self._load_shortcuts()
@@ -28,6 +32,8 @@ class KeystrokeHandler:
         # Arrow keys for navigation
         self.shortcuts['Left'] = ('prev', None)
         self.shortcuts['Right'] = ('next', None)
+        # Ctrl+Right skips ahead to the next photo that still needs tagging
+        self.shortcuts[('Right', 'ctrl')] = ('fast_forward', None)
         
         # Delete all shortcut
         self.shortcuts['='] = ('delete_all', None)
@@ -37,6 +43,11 @@ class KeystrokeHandler:
         
         # Tab to add "Dennis " and go next
         self.shortcuts['Tab'] = ('tab_dennis', None)
+
+        # Undo / redo the last edit on this photo (a name with (Z) or (Y) takes the key over)
+        self.shortcuts[('z', 'ctrl')] = ('undo', None)
+        self.shortcuts[('Z', 'ctrl')] = ('redo', None)
+        self.shortcuts[('y', 'ctrl')] = ('redo', None)
         
         # Note: n, N, p, P are NOT registered - they pass through as natural keystrokes
         
@@ -69,8 +80,9 @@ class KeystrokeHandler:
                 self.shortcuts[(shortcut_key.lower(), 'ctrl')] = ('name', pushed)
                 # Register Ctrl+UPPERCASE -> add name and advance
                 self.shortcuts[(shortcut_key.upper(), 'ctrl')] = ('name_and_next', pushed)
-                print(f'[KEYSTROKE] Registered Ctrl+{shortcut_key.lower()} -> {pushed}')
-                print(f'[KEYSTROKE] Registered Ctrl+{shortcut_key.upper()} -> {pushed} + NEXT')
+                if self.verbose:
+                    print(f'[KEYSTROKE] Registered Ctrl+{shortcut_key.lower()} -> {pushed}')
+                    print(f'[KEYSTROKE] Registered Ctrl+{shortcut_key.upper()} -> {pushed} + NEXT')
             
             # Extract numbered groups like "(1) Dennis Laura " and strip numeric prefix
             num_match = re.search(r'\((\d+)\)', label)
@@ -82,18 +94,21 @@ class KeystrokeHandler:
                     # Register Ctrl+number and just number -> just add name
                     self.shortcuts[(group_num, 'ctrl')] = ('name', stripped_label + ' ')
                     self.shortcuts[group_num] = ('name', stripped_label + ' ')
-                    print(f'[KEYSTROKE] Registered {group_num} -> {stripped_label} (stripped)')
+                    if self.verbose:
+                        print(f'[KEYSTROKE] Registered {group_num} -> {stripped_label} (stripped)')
                     
                     # Register shifted version -> add name and advance
                     shifted_symbol = [k for k, v in SHIFTED_NUMBER_MAP.items() if v == group_num]
                     if shifted_symbol:
                         self.shortcuts[shifted_symbol[0]] = ('name_and_next', stripped_label + ' ')
-                        print(f'[KEYSTROKE] Registered {shifted_symbol[0]} -> {stripped_label} + NEXT')
+                        if self.verbose:
+                            print(f'[KEYSTROKE] Registered {shifted_symbol[0]} -> {stripped_label} + NEXT')
                 else:
                     # Empty group, register as-is
                     self.shortcuts[(group_num, 'ctrl')] = ('name', pushed)
                     self.shortcuts[group_num] = ('name', pushed)
-                    print(f'[KEYSTROKE] Registered {group_num} -> (empty)')
+                    if self.verbose:
+                        print(f'[KEYSTROKE] Registered {group_num} -> (empty)')
     
     def _load_names(self):
         """Load names from names.json file."""
@@ -154,6 +169,9 @@ class KeystrokeHandler:
             Tuple of (action_type, action_data) or None
         """
         # Handle BackSpace and Delete keysyms FIRST (most reliable, before keycode)
+        if keysym == 'BackSpace' and ctrl:
+            print('[DELETE_TYPE] Ctrl+BackSpace detected - removing last name')
+            return ('remove_last_name', None)
         if keysym == 'BackSpace':
             print('[DELETE_TYPE] BackSpace key detected - deleting one char')
             return ('backspace', None)
@@ -161,15 +179,18 @@ class KeystrokeHandler:
             print('[DELETE_TYPE] Delete key detected - clearing entire description')
             return ('delete_all', None)
         
-        # Try direct lookup first (before keycode, to avoid '3' being confused with 0x33 keycode)
-        if key in self.shortcuts:
-            return self.shortcuts[key]
-        
-        # Try Ctrl+ combination
+        # Try Ctrl+ combination first, so Ctrl+Right is not taken for a plain Right
         if ctrl:
             ctrl_key = (key, 'ctrl')
             if ctrl_key in self.shortcuts:
                 return self.shortcuts[ctrl_key]
+            # X11 reports Ctrl+letter as a control character; the keysym is the letter
+            if keysym and (keysym, 'ctrl') in self.shortcuts:
+                return self.shortcuts[(keysym, 'ctrl')]
+        
+        # Then direct lookup (before keycode, to avoid '3' being confused with 0x33 keycode)
+        if key in self.shortcuts:
+            return self.shortcuts[key]
         
         # No match found - return None for natural typing
         return None
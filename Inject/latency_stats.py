@@ -0,0 +1,61 @@
+"""Latency stats - per-operation timing for comparing code paths"""
+import threading
+
+
+class LatencyStats:
+    """Collects per-operation, per-path latencies and prints a comparison table."""
+
+    def __init__(self, max_samples=500):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, op, path, seconds):
+        """Record one sample (in seconds) for operation `op` taken via `path`."""
+        with self._lock:
+            samples = self._samples.setdefault((op, path), [])
+            samples.append(seconds * 1000.0)
+            if len(samples) > self.max_samples:
+                del samples[0]
+
+    def summary(self, op, path):
+        """Return dict with count/avg/p50/p95 in milliseconds, or None if no samples."""
+        with self._lock:
+            samples = sorted(self._samples.get((op, path), []))
+        if not samples:
+            return None
+        return {
+            'count': len(samples),
+            'avg': sum(samples) / len(samples),
+            'p50': samples[len(samples) // 2],
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+
+    def operations(self):
+        """Return sorted list of operation names seen so far."""
+        with self._lock:
+            return sorted({op for op, _ in self._samples})
+
+    def paths(self):
+        """Return sorted list of path names seen so far."""
+        with self._lock:
+            return sorted({path for _, path in self._samples})
+
+    def report(self, title='LATENCY'):
+        """Return printable report lines comparing every path for every operation."""
+        lines = [f'[{title}] op              path         count    avg ms    p50 ms    p95 ms']
+        ops = self.operations()
+        if not ops:
+            lines.append(f'[{title}]   (no samples yet)')
+            return lines
+        for op in ops:
+            summaries = {}
+            for path in self.paths():
+                s = self.summary(op, path)
+                if s:
+                    summaries[path] = s
+                    lines.append(f'[{title}] {op:<15} {path:<12} {s["count"]:>5} {s["avg"]:>9.1f} {s["p50"]:>9.1f} {s["p95"]:>9.1f}')
+            if 'cdp' in summaries and 'playwright' in summaries and summaries['cdp']['p50'] > 0:
+                speedup = summaries['playwright']['p50'] / summaries['cdp']['p50']
+                lines.append(f'[{title}] {op:<15} -> cdp is {speedup:.1f}x faster (p50)')
+        return lines
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Library crawler - walk a Google Photos grid and index every photo ID in order.
+
+The library (or an album / face-group page) is a virtualized grid: only the
+tiles near the viewport exist in the DOM. The crawler scrolls it one screen at
+a time. A MutationObserver in the page collects only the newly added chunks,
+so each step handles the new tiles and not the whole grid again. Every photo
+is stored with its position, date heading and URL in a WAL-mode SQLite index
+(~/.googlephotos_tagger/photo_index.db). A checkpoint (position, date
+heading, scroll offset) is saved after every chunk, so an interrupted crawl
+picks up where it stopped. Running it again on a finished grid walks it from
+the top, adds photos uploaded since and renumbers the positions.
+
+Usage:
+    python inject.py crawl                                  # whole library
+    python inject.py crawl --url https://photos.google.com/album/AF1Qip...
+    python inject.py crawl --restart                        # ignore the checkpoint
+    python library_crawler.py --locate AF1QipN...           # position of a photo in the index
+"""
+import argparse
+import datetime
+import re
+import sys
+import time
+
+import cli_options
+from local_data import data_path
+from photo_ids import photo_id_from_url
+from sqlite_writer import SqliteWriter
+
+
+PHOTO_INDEX_DB = data_path('photo_index.db')
+LIBRARY_URL = 'https://photos.google.com/'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    photo_id TEXT NOT NULL,
+    url TEXT,
+    date_heading TEXT,
+    date TEXT,
+    seen REAL,
+    PRIMARY KEY (source, photo_id)
+);
+CREATE INDEX IF NOT EXISTS photos_order ON photos (source, position);
+CREATE INDEX IF NOT EXISTS photos_date ON photos (source, date);
+CREATE INDEX IF NOT EXISTS photos_id ON photos (photo_id);
+CREATE TABLE IF NOT EXISTS crawls (
+    source TEXT PRIMARY KEY,
+    position INTEGER,
+    last_photo_id TEXT,
+    date_heading TEXT,
+    scroll_top REAL,
+    started REAL,
+    updated REAL,
+    finished REAL
+);
+"""
+
+REPORT_INTERVAL = 10.0  # seconds between throughput lines
+IDLE_ROUNDS = 8         # scrolls in a row with nothing new before the crawl counts as finished
+
+# Installs window.__gpCrawl: a MutationObserver queues added subtrees; take() returns
+# only the photo tiles and date headings in those, sorted top to bottom
+CRAWL_INSTALL_JS = r"""() => {
+    if (window.__gpCrawl) return true;
+    const PHOTO = /\/photo\/([A-Za-z0-9_-]{10,})/;
+    const DATE = /^(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*,\s*)?(?:[A-Z][a-z]{2,8}\.?\s+\d{1,2}(?:,\s*\d{4})?|Today|Yesterday)$/;
+    const seen = new Set();
+    let pending = [document.body];
+    let scroller = null;
+    const observer = new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            for (const n of m.addedNodes) {
+                if (n.nodeType === 1) pending.push(n);
+            }
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+
+    function findScroller() {
+        if (scroller && scroller.isConnected) return scroller;
+        const link = document.querySelector('a[href*="/photo/"]');
+        for (let el = link && link.parentElement; el; el = el.parentElement) {
+            const style = getComputedStyle(el);
+            if (el.scrollHeight > el.clientHeight + 10 && /(auto|scroll)/.test(style.overflowY)) {
+                return (scroller = el);
+            }
+        }
+        return (scroller = document.scrollingElement);
+    }
+
+    function offsetTop(el, box, base) {
+        return el.getBoundingClientRect().top - box.top + base;
+    }
+
+    window.__gpCrawl = {
+        hasPending() { return pending.length > 0; },
+        take() {
+            const sc = findScroller();
+            const box = sc === document.scrollingElement ? {top: 0} : sc.getBoundingClientRect();
+            const base = sc.scrollTop;
+            const roots = pending;
+            pending = [];
+            const tiles = [];
+            const headings = [];
+            for (const root of roots) {
+                if (!root.isConnected) continue;
+                const links = root.matches('a[href*="/photo/"]') ? [root] : root.querySelectorAll('a[href*="/photo/"]');
+                for (const a of links) {
+                    const m = a.href.match(PHOTO);
+                    if (!m || seen.has(m[1])) continue;
+                    seen.add(m[1]);
+                    const r = a.getBoundingClientRect();
+                    tiles.push({id: m[1], url: a.href, label: a.getAttribute('aria-label') || '',
+                                top: r.top - box.top + base, left: r.left});
+                }
+                for (const el of root.querySelectorAll('*')) {
+                    if (el.childElementCount) continue;
+                    const text = (el.textContent || '').trim();
+                    if (text.length < 40 && DATE.test(text)) {
+                        headings.push({text: text, top: offsetTop(el, box, base)});
+                    }
+                }
+            }
+            tiles.sort((x, y) => x.top - y.top || x.left - y.left);
+            headings.sort((x, y) => x.top - y.top);
+            return {tiles: tiles, headings: headings, scrollTop: base};
+        },
+        scroll(to) {
+            const sc = findScroller();
+            const before = sc.scrollTop;
+            sc.scrollTop = (to === undefined || to === null) ? before + sc.clientHeight * 0.9 : to;
+            return {before: before, after: sc.scrollTop,
+                    atEnd: sc.scrollTop + sc.clientHeight >= sc.scrollHeight - 2};
+        },
+    };
+    return true;
+}"""
+
+# The day may not end inside a longer number ('Dec 1998' is not December 19)
+MONTH_DAY_RE = re.compile(r'([A-Z][a-z]{2,8})\.?\s+(\d{1,2})(?!\d)(?:,\s*(\d{4}))?')
+
+
+def parse_date(text, today=None, require_year=False):
+    """ISO date ('1998-12-01') from a grid heading or tile label, or None.
+
+    Understands 'Tue, Dec 1, 1998', 'December 1, 1998', 'Dec 1' (this year),
+    'Today', 'Yesterday', and tile labels like 'Photo - Dec 1, 1998, 3:04:05 PM'.
+    require_year=True only accepts dates that carry their year.
+    """
+    if not text:
+        return None
+    today = today or datetime.date.today()
+    if text.strip() == 'Today' and not require_year:
+        return today.isoformat()
+    if text.strip() == 'Yesterday' and not require_year:
+        return (today - datetime.timedelta(days=1)).isoformat()
+    for match in MONTH_DAY_RE.finditer(text):
+        month, day, year = match.groups()
+        if require_year and not year:
+            continue
+        for fmt in ('%b', '%B'):
+            try:
+                month_no = datetime.datetime.strptime(month[:3] if fmt == '%b' else month, fmt).month
+                date = datetime.date(int(year or today.year), month_no, int(day))
+                if not year and date > today:
+                    date = date.replace(year=today.year - 1)  # headings drop the year only for the last 12 months
+                return date.isoformat()
+            except ValueError:
+                continue
+    return None
+
+
+def parse_user_date(text):
+    """ISO date from what a user types: '12/1/1998' (month first), '1998-12-01', 'Dec 1, 1998',
+    '12/1998', 'Dec 1998' or '1998' (first day of the month/year). None if it is not a date."""
+    text = (text or '').strip()
+    for fmt in ('%m/%d/%Y', '%m/%d/%y', '%Y-%m-%d', '%Y/%m/%d', '%b %d, %Y', '%B %d, %Y',
+                '%m/%Y', '%Y-%m', '%b %Y', '%B %Y', '%Y'):
+        try:
+            return datetime.datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    if re.search(r'\d{4}', text):
+        return parse_date(text, require_year=True)
+    return None
+
+
+def normalize_source(url):
+    """Grid URL without query/fragment, used as the index key of a crawl."""
+    return (url or LIBRARY_URL).split('#')[0].split('?')[0].rstrip('/') + '/'
+
+
+class PhotoIndex:
+    """Ordered photo IDs per crawled grid (library, album, face group), with crawl checkpoints."""
+
+    def __init__(self, path=None):
+        self.path = path or PHOTO_INDEX_DB
+        self._writer = SqliteWriter(self.path, SCHEMA, name='index-writer')
+
+    def add(self, source, position, photo_id, url, date_heading, date):
+        self._writer.execute(
+            'INSERT OR IGNORE INTO photos (source, position, photo_id, url, date_heading, date, seen) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (source, position, photo_id, url, date_heading, date, time.time()))
+
+    def save_checkpoint(self, source, position, last_photo_id, date_heading, scroll_top, started, finished=None):
+        self._writer.execute(
+            'INSERT OR REPLACE INTO crawls (source, position, last_photo_id, date_heading, scroll_top, '
+            'started, updated, finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (source, position, last_photo_id, date_heading, scroll_top, started, time.time(), finished))
+
+    def checkpoint(self, source):
+        rows = self._writer.query('SELECT * FROM crawls WHERE source = ?', (source,))
+        return rows[0] if rows else None
+
+    def ids(self, source):
+        return {row['photo_id'] for row in self._writer.query('SELECT photo_id FROM photos WHERE source = ?', (source,))}
+
+    def count(self, source=None):
+        source = source or normalize_source(LIBRARY_URL)
+        return self._writer.query('SELECT COUNT(*) AS n FROM photos WHERE source = ?', (source,))[0]['n']
+
+    def sources(self):
+        """[{source, photos, position, updated, finished}] for every crawled grid."""
+        return self._writer.query(
+            'SELECT c.source, (SELECT COUNT(*) FROM photos p WHERE p.source = c.source) AS photos, '
+            'c.position, c.updated, c.finished FROM crawls c ORDER BY c.updated DESC')
+
+    def locate(self, photo, source=None):
+        """{'source', 'position', 'total', 'url', 'date', 'date_heading'} of a photo, or None."""
+        photo_id = photo_id_from_url(photo) or photo
+        params = [photo_id]
+        where = 'photo_id = ?'
+        if source:
+            where += ' AND source = ?'
+            params.append(normalize_source(source))
+        rows = self._writer.query(f'SELECT source, position, url, date, date_heading FROM photos WHERE {where} '
+                                  'ORDER BY source = ? DESC LIMIT 1', params + [normalize_source(LIBRARY_URL)])
+        if not rows:
+            return None
+        row = rows[0]
+        row['total'] = self.count(row['source'])
+        return row
+
+    def nearest_date(self, date, source=None):
+        """The photo dated closest to `date` (ISO), first in grid order on ties; library photos first."""
+        sql = 'SELECT source, position, photo_id, url, date FROM photos WHERE date IS NOT NULL'
+        params = []
+        if source:
+            sql += ' AND source = ?'
+            params.append(normalize_source(source))
+        sql += ' ORDER BY source = ? DESC, abs(julianday(date) - julianday(?)), position LIMIT 1'
+        rows = self._writer.query(sql, params + [normalize_source(LIBRARY_URL), date])
+        return rows[0] if rows else None
+
+    def renumber(self, source, order):
+        """Set positions to the grid order of a full re-crawl (`order`: photo IDs top to bottom).
+
+        Indexed photos the re-crawl did not see (deleted since) keep their relative order after them.
+        """
+        # Seen photos go negative first so the shift below only moves the unseen ones
+        for i, photo_id in enumerate(order):
+            self._writer.execute('UPDATE photos SET position = ? WHERE source = ? AND photo_id = ?',
+                                 (-1 - i, source, photo_id))
+        self._writer.execute('UPDATE photos SET position = position + ? WHERE source = ? AND position >= 0',
+                             (len(order), source))
+        self._writer.execute('UPDATE photos SET position = -1 - position WHERE source = ? AND position < 0',
+                             (source,))
+        self._writer.flush()
+
+    def clear(self, source):
+        """Forget a grid's photos and checkpoint (for a fresh crawl)."""
+        self._writer.execute('DELETE FROM photos WHERE source = ?', (source,))
+        self._writer.execute('DELETE FROM crawls WHERE source = ?', (source,))
+        self._writer.flush()
+
+    def flush(self, timeout=5.0):
+        return self._writer.flush(timeout)
+
+    def close(self):
+        self._writer.close()
+
+
+class LibraryCrawler:
+    """Scrolls one grid page to the end, adding every new tile to a PhotoIndex."""
+
+    def __init__(self, page, index, source=None, resume=True, pause=0.6):
+        """Args:
+            page: Playwright page to crawl with (a tab of its own)
+            index: PhotoIndex
+            source: Library, album or face-group URL (default: the whole library)
+            resume: Continue from the saved checkpoint for this URL
+            pause: Longest wait (s) for new tiles after each scroll
+        """
+        self.page = page
+        self.index = index
+        self.source = normalize_source(source)
+        self.resume = resume
+        self.pause = pause
+        self.position = 0
+        self.date_heading = None
+        self.last_id = None
+        self.added = 0
+        self.already = 0
+        self.chunks = 0
+        self.scrolls = 0
+        self._started = None
+        self._last_report = 0.0
+
+    def run(self):
+        """Crawl until the grid stops growing; returns True if the end was reached."""
+        state = self.index.checkpoint(self.source) if self.resume else None
+        started = (state or {}).get('started') or time.time()
+        known = self.index.ids(self.source) if state else set()
+        # A finished grid is walked again from the top: new uploads can be anywhere above the
+        # old end (the top, or mid-grid for older dates), so every position is renumbered after
+        refresh = bool(state and state.get('finished'))
+        order = [] if refresh else None
+        if refresh:
+            print(f'[CRAWL] {self.source} was crawled to the end; checking it again from the top '
+                  f'for new photos ({len(known)} already indexed)')
+            started = time.time()
+        elif state:
+            self.position = state['position'] or 0
+            self.date_heading = state['date_heading']
+            self.last_id = state['last_photo_id']
+            print(f'[CRAWL] Resuming {self.source} at photo {self.position} ({len(known)} already indexed)')
+        page = self.page
+        page.goto(self.source, wait_until='domcontentloaded')
+        page.wait_for_selector('a[href*="/photo/"]', timeout=30000)
+        page.evaluate(CRAWL_INSTALL_JS)
+        if state and state.get('scroll_top') and not refresh:
+            page.evaluate('(top) => window.__gpCrawl.scroll(top)', state['scroll_top'])
+            self._wait_for_tiles()
+
+        self._started = time.perf_counter()
+        self._last_report = self._started
+        idle = 0
+        finished = False
+        scroll_top = 0 if refresh else (state or {}).get('scroll_top') or 0
+        # An interrupted refresh stays a refresh (starts from the top again)
+        keep_finished = state['finished'] if refresh else None
+        try:
+            while True:
+                chunk = page.evaluate('() => window.__gpCrawl.take()')
+                new = self._store(chunk, known, order)
+                if chunk['tiles']:
+                    self.chunks += 1
+                    scroll_top = chunk['scrollTop']
+                    self.last_id = chunk['tiles'][-1]['id']
+                    self.index.save_checkpoint(self.source, self.position, self.last_id,
+                                               self.date_heading, scroll_top, started, finished=keep_finished)
+                moved = page.evaluate('() => window.__gpCrawl.scroll()')
+                self.scrolls += 1
+                idle = 0 if (new or moved['after'] != moved['before']) else idle + 1
+                if idle >= IDLE_ROUNDS or (moved['atEnd'] and idle >= 2):
+                    finished = True
+                    break
+                self._wait_for_tiles()
+                self._progress()
+        except KeyboardInterrupt:
+            print('\n[CRAWL] Interrupted; run again to continue from the checkpoint')
+        self.index.save_checkpoint(self.source, self.position, self.last_id, self.date_heading, scroll_top, started,
+                                   finished=time.time() if finished else keep_finished)
+        self.index.flush()
+        if finished and refresh:
+            self.index.renumber(self.source, order)
+        self._progress(final=True)
+        return finished
+
+    def _wait_for_tiles(self):
+        try:
+            self.page.wait_for_function('() => window.__gpCrawl.hasPending()', timeout=self.pause * 1000)
+            self.page.wait_for_timeout(50)  # let the rest of the chunk render
+        except Exception:
+            pass  # nothing loaded within the pause; the idle count decides when to stop
+
+    def _store(self, chunk, known, order=None):
+        """Index a chunk's new tiles in grid order, each under the latest heading above it.
+
+        order: during a refresh, collects every tile's ID (known or new) in grid order, and
+        positions count all of them, so new photos land next to their neighbours.
+        """
+        headings = chunk['headings']
+        h = 0
+        new = 0
+        for tile in chunk['tiles']:
+            while h < len(headings) and headings[h]['top'] <= tile['top'] + 1:
+                self.date_heading = headings[h]['text']
+                h += 1
+            if order is not None:
+                order.append(tile['id'])
+            if tile['id'] in known:
+                self.already += 1
+                if order is not None:
+                    self.position += 1
+                continue
+            known.add(tile['id'])
+            date = parse_date(tile['label']) or parse_date(self.date_heading)
+            self.index.add(self.source, self.position, tile['id'], tile['url'], self.date_heading, date)
+            self.position += 1
+            self.added += 1
+            new += 1
+        if h < len(headings):
+            self.date_heading = headings[-1]['text']
+        return new
+
+    def _progress(self, final=False):
+        now = time.perf_counter()
+        if not final and now - self._last_report < REPORT_INTERVAL:
+            return
+        self._last_report = now
+        seconds = now - self._started
+        rate = self.added / seconds if seconds > 0 else 0.0
+        print(f'[CRAWL] {self.position} photos indexed ({self.added} new this run, {self.already} already known), '
+              f'{rate:.0f} photos/s, {self.chunks} chunks in {self.scrolls} scrolls, '
+              f'at {self.date_heading or "?"}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='inject.py crawl',
+                                     description='Index the photo IDs of the library, an album or a face group')
+    parser.add_argument('--url', default=LIBRARY_URL, help='Grid page to crawl (default: the whole library)')
+    parser.add_argument('--restart', action='store_true', help='Forget this page\'s index and checkpoint first')
+    parser.add_argument('--headless', action='store_true', help='Run Chrome without a window')
+    parser.add_argument('--db', default=PHOTO_INDEX_DB, help='Index database (default: %(default)s)')
+    parser.add_argument('--debug', action='store_true', help='Print page metric samples')
+    cli_options.add_browser_arguments(parser, session_resume=False)
+    args = parser.parse_args(argv)
+
+    from browser_controller import BrowserController
+    from playwright.sync_api import sync_playwright
+    index = PhotoIndex(args.db)
+    source = normalize_source(args.url)
+    if args.restart:
+        index.clear(source)
+    browser = BrowserController(**cli_options.controller_options(args, resume='never', extra_connections=True))
+    playwright = cdp = page = None
+    try:
+        browser.start(headful=not args.headless, timeout=60)
+        # A tab of its own on this thread; the controller's page stays where it is
+        playwright = sync_playwright().start()
+        cdp = playwright.chromium.connect_over_cdp(browser.cdp_endpoint())
+        page = cdp.contexts[0].new_page()
+        finished = LibraryCrawler(page, index, source).run()
+    finally:
+        for step in (lambda: page and page.close(), lambda: cdp and cdp.close(),
+                     lambda: playwright and playwright.stop()):
+            try:
+                step()
+            except Exception:
+                pass
+        browser.stop()
+        index.close()
+    print(f'[CRAWL] Index in {args.db}' + ('' if finished else ' (incomplete; run again to continue)'))
+    return 0 if finished else 1
+
+
+def locate_main(argv=None):
+    parser = argparse.ArgumentParser(description='Look up photos in the local photo index')
+    parser.add_argument('--db', default=PHOTO_INDEX_DB, help='Index database (default: %(default)s)')
+    parser.add_argument('--locate', metavar='PHOTO', help='Photo ID or URL')
+    args = parser.parse_args(argv)
+    index = PhotoIndex(args.db)
+    try:
+        if args.locate:
+            row = index.locate(args.locate)
+            if not row:
+                print('Photo is not in the index')
+                return 1
+            print(f'{row["source"]}: photo {row["position"] + 1} of {row["total"]}, '
+                  f'{row["total"] - row["position"] - 1} after it ({row["date"] or row["date_heading"] or "no date"})')
+            return 0
+        for row in index.sources():
+            state = 'complete' if row['finished'] else 'partial'
+            print(f'{row["source"]}: {row["photos"]} photos ({state})')
+        return 0
+    finally:
+        index.close()
+
+
+if __name__ == '__main__':
+    sys.exit(locate_main())
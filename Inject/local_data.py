@@ -0,0 +1,15 @@
+"""Local data - where the tagger keeps its own files (stats, journals, indexes)"""
+import os
+import pathlib
+
+
+def data_dir():
+    """Return (and create) the tagger's data directory, ~/.googlephotos_tagger."""
+    path = pathlib.Path.home() / '.googlephotos_tagger'
+    path.mkdir(parents=True, exist_ok=True)
+    return str(path)
+
+
+def data_path(filename):
+    """Return the full path of `filename` inside the data directory."""
+    return os.path.join(data_dir(), filename)
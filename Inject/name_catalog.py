@@ -0,0 +1,108 @@
+"""Name catalog - known names from names.json (shortcut names and special cases) for matching descriptions"""
+import json
+import os
+import re
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+NAMES_PATHS = ['names.json', os.path.join(ROOT, 'names.json'), os.path.join(ROOT, '..', 'poc', 'names.json')]
+
+
+def clean_name(raw):
+    """'(B)illy Keefer ' -> 'Billy Keefer', '(1) Dennis ' -> 'Dennis'."""
+    return ''.join(c for c in re.sub(r'^\(\d+\)\s*', '', raw) if c not in '()').strip()
+
+
+class NameCatalog:
+    """Every name a description can contain as one token: shortcut names plus special cases.
+
+    Multi-word names ("Billy Keefer") are single tokens, so removing one
+    takes one edit instead of a backspace per character.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.names = []
+        self.special_cases = {}
+        self._patterns = []
+        self._loaded = None  # (path, mtime) of the file read
+        self.reload()
+
+    def reload(self):
+        """(Re)read names.json; keeps an empty catalog if none is found."""
+        data = {}
+        self._loaded = None
+        for path in ([self.path] if self.path else NAMES_PATHS):
+            if os.path.exists(path):
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        data = json.load(f)
+                    self._loaded = (path, os.path.getmtime(path))
+                    break
+                except Exception as e:
+                    print(f'[NAMES] Failed to load {path}: {e}')
+        if isinstance(data, list):
+            data = {'names': data}
+        self.special_cases = dict(data.get('special_cases') or {})
+        names = []
+        for raw in list(data.get('names') or []) + list(self.special_cases) + list(self.special_cases.values()):
+            name = clean_name(raw)
+            if name and not name.isdigit() and name.lower() not in {n.lower() for n in names}:
+                names.append(name)
+        self.names = names
+        # Longest first so "Billy Keefer" wins over a plain "Billy" at the same place
+        self._patterns = [(name, re.compile(r'(?<!\w)' + re.escape(name) + r'(?!\w)', re.IGNORECASE))
+                          for name in sorted(names, key=len, reverse=True)]
+        return self
+
+    def refresh(self):
+        """Reload if names.json changed on disk since it was read."""
+        if self._loaded:
+            path, mtime = self._loaded
+            try:
+                if os.path.getmtime(path) == mtime:
+                    return self
+            except OSError:
+                pass
+        return self.reload()
+
+    def canonical(self, name):
+        """Special-case mapping ('Jeff Hegel' -> 'Jeff'), else the name itself."""
+        name = ' '.join(name.split())
+        return self.special_cases.get(name, name)
+
+    def find(self, description, name=None):
+        """Return (start, end) of the last catalog name in `description` (or of `name`), or None."""
+        best = None
+        if name:
+            patterns = [(name, re.compile(r'(?<!\w)' + re.escape(' '.join(name.split())) + r'(?!\w)',
+                                          re.IGNORECASE))]
+        else:
+            patterns = self._patterns
+        for _name, pattern in patterns:
+            for m in pattern.finditer(description or ''):
+                if best is None or (m.end(), m.end() - m.start()) > (best[1], best[1] - best[0]):
+                    best = (m.start(), m.end())
+        return best
+
+    def remove(self, description, name=None):
+        """Remove the last catalog name (or the last occurrence of `name`) from `description`.
+
+        Without `name` and with no catalog name present, the last word goes.
+        Returns (new description, removed text); removed is None if nothing matched.
+        """
+        description = description or ''
+        span = self.find(description, name)
+        if span is None and not name:
+            words = list(re.finditer(r'\S+', description))
+            span = (words[-1].start(), words[-1].end()) if words else None
+        if span is None:
+            return description, None
+        start, end = span
+        head, tail = description[:start], description[end:]
+        if tail.strip():
+            # Name in the middle: drop it and one of the spaces around it
+            new = head.rstrip() + ' ' + tail.lstrip() if head.strip() else tail.lstrip()
+        else:
+            new = head  # keep the separator before it, ready for the next append
+        return new, description[start:end]
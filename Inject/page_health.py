@@ -0,0 +1,137 @@
+"""Page health - sample the tab's heap/DOM size and decide when to recycle the page"""
+import time
+
+
+# CDP Performance.getMetrics names we track
+METRICS = ('JSHeapUsedSize', 'JSHeapTotalSize', 'Nodes', 'JSEventListeners', 'Documents')
+
+# Recycle when any of these is crossed (bytes / counts)
+DEFAULT_THRESHOLDS = {
+    'JSHeapUsedSize': 512 * 1024 * 1024,
+    'Nodes': 150000,
+    'JSEventListeners': 30000,
+}
+
+RECYCLE_MODES = ('reload', 'new_page')
+
+
+def _fmt(name, value):
+    if value is None:
+        return '-'
+    if name.startswith('JSHeap'):
+        return f'{value / (1024 * 1024):.0f}MB'
+    return f'{int(value)}'
+
+
+class PageHealthMonitor:
+    """Samples Performance.getMetrics every N photos and keeps the trend and recycle history."""
+
+    def __init__(self, every=50, thresholds=None, mode='reload', max_history=200):
+        """Args:
+            every: Sample every N navigations (0 = off)
+            thresholds: {metric: limit}; crossing any limit asks for a recycle
+            mode: 'reload' the current photo URL, or 'new_page' (open a fresh tab, close the old one)
+        """
+        if mode not in RECYCLE_MODES:
+            raise ValueError(f'recycle mode must be one of {RECYCLE_MODES}')
+        self.every = every
+        self.thresholds = dict(DEFAULT_THRESHOLDS if thresholds is None else thresholds)
+        self.mode = mode
+        self.max_history = max_history
+        self.history = []    # (nav_count, unix time, metrics)
+        self.recycles = []   # (nav_count, unix time, reasons, before, after, seconds)
+        self._session = None
+
+    def attach(self, page):
+        """Open a CDP session with the Performance domain on `page`."""
+        self.detach()
+        try:
+            self._session = page.context.new_cdp_session(page)
+            self._session.send('Performance.enable')
+        except Exception as e:
+            print(f'[HEALTH] WARNING: page metrics unavailable: {e}')
+            self._session = None
+
+    def detach(self):
+        if self._session:
+            try:
+                self._session.detach()
+            except Exception:
+                pass
+        self._session = None
+
+    def due(self, nav_count):
+        return bool(self.every) and nav_count > 0 and nav_count % self.every == 0
+
+    def sample(self, nav_count=None):
+        """Return {metric: value} for the page (None if unavailable) and add it to the history."""
+        if not self._session:
+            return None
+        try:
+            resp = self._session.send('Performance.getMetrics')
+        except Exception as e:
+            print(f'[HEALTH] WARNING: Performance.getMetrics failed: {e}')
+            return None
+        metrics = {m['name']: m['value'] for m in resp.get('metrics', []) if m['name'] in METRICS}
+        if nav_count is not None:
+            self.history.append((nav_count, time.time(), metrics))
+            if len(self.history) > self.max_history:
+                del self.history[0]
+        return metrics
+
+    def over_threshold(self, metrics):
+        """Return a list of 'Metric value > limit' reasons (empty if healthy)."""
+        reasons = []
+        for name, limit in self.thresholds.items():
+            value = (metrics or {}).get(name)
+            if value is not None and limit and value > limit:
+                reasons.append(f'{name} {_fmt(name, value)} > {_fmt(name, limit)}')
+        return reasons
+
+    def record_recycle(self, nav_count, reasons, before, after, seconds):
+        self.recycles.append((nav_count, time.time(), reasons, before, after, seconds))
+
+    def format_sample(self, nav_count, metrics):
+        """One-line summary of a sample, with growth since the previous one."""
+        previous = self.history[-2][2] if len(self.history) > 1 else None
+        parts = []
+        for name in ('JSHeapUsedSize', 'Nodes', 'JSEventListeners'):
+            value = (metrics or {}).get(name)
+            part = f'{name}={_fmt(name, value)}'
+            if previous and value is not None and previous.get(name) is not None:
+                delta = value - previous[name]
+                part += f' ({"+" if delta >= 0 else "-"}{_fmt(name, abs(delta))})'
+            parts.append(part)
+        return f'[HEALTH] photo {nav_count}: ' + ', '.join(parts)
+
+    def report(self):
+        """Return printable lines: recent samples, growth per 100 photos, recycle events."""
+        if not self.history:
+            return ['[HEALTH] (no page metrics sampled yet)']
+        lines = [f'[HEALTH] {"photo":>6} {"heap":>8} {"nodes":>8} {"listeners":>10}']
+        for nav, _ts, metrics in self.history[-10:]:
+            lines.append(f'[HEALTH] {nav:>6} {_fmt("JSHeapUsedSize", metrics.get("JSHeapUsedSize")):>8} '
+                         f'{_fmt("Nodes", metrics.get("Nodes")):>8} '
+                         f'{_fmt("JSEventListeners", metrics.get("JSEventListeners")):>10}')
+        # Growth since the last recycle (or the first sample)
+        since = self.recycles[-1][0] if self.recycles else None
+        window = [h for h in self.history if since is None or h[0] > since]
+        if len(window) >= 2 and window[-1][0] > window[0][0]:
+            photos = window[-1][0] - window[0][0]
+            growth = []
+            for name in ('JSHeapUsedSize', 'Nodes', 'JSEventListeners'):
+                a, b = window[0][2].get(name), window[-1][2].get(name)
+                if a is not None and b is not None:
+                    growth.append(f'{name} {"+" if b >= a else "-"}{_fmt(name, abs(b - a) * 100 / photos)}')
+            lines.append(f'[HEALTH] Growth per 100 photos: {", ".join(growth)}')
+        limits = ', '.join(f'{name} {_fmt(name, limit)}' for name, limit in self.thresholds.items())
+        lines.append(f'[HEALTH] Recycle mode: {self.mode}, limits: {limits}')
+        if not self.recycles:
+            lines.append('[HEALTH] No recycles this session')
+        for nav, _ts, reasons, before, after, seconds in self.recycles:
+            lines.append(f'[HEALTH] Recycled at photo {nav} in {seconds:.1f} s ({"; ".join(reasons)}): '
+                         f'heap {_fmt("JSHeapUsedSize", (before or {}).get("JSHeapUsedSize"))} -> '
+                         f'{_fmt("JSHeapUsedSize", (after or {}).get("JSHeapUsedSize"))}, '
+                         f'nodes {_fmt("Nodes", (before or {}).get("Nodes"))} -> '
+                         f'{_fmt("Nodes", (after or {}).get("Nodes"))}')
+        return lines
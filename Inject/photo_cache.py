@@ -0,0 +1,89 @@
+"""Photo cache - descriptions and detected names per photo ID, shared by the read-ahead lane and the worker"""
+import collections
+import threading
+import time
+
+
+class PhotoCache:
+    """LRU map photo ID -> {'url', 'description', 'names', 'fetched', 'next', 'prev'}.
+
+    'next'/'prev' link to the neighbouring photo IDs the read-ahead page saw,
+    so the worker knows which photo an arrow key will land on.
+    """
+
+    def __init__(self, max_photos=500):
+        self.max_photos = max_photos
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.fetched = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def put(self, photo_id, **fields):
+        """Add or update an entry (fields: url, description, names)."""
+        if not photo_id:
+            return
+        with self._lock:
+            entry = self._entries.pop(photo_id, {})
+            entry.update(fields, fetched=time.time())
+            self._entries[photo_id] = entry
+            self.fetched += 1
+            while len(self._entries) > self.max_photos:
+                self._entries.popitem(last=False)
+
+    def link(self, from_id, to_id, direction='next'):
+        """Record that `direction` from `from_id` lands on `to_id`."""
+        back = 'prev' if direction == 'next' else 'next'
+        with self._lock:
+            if from_id in self._entries:
+                self._entries[from_id][direction] = to_id
+            if to_id in self._entries:
+                self._entries[to_id][back] = from_id
+
+    def neighbour(self, photo_id, direction='next'):
+        with self._lock:
+            entry = self._entries.get(photo_id)
+            return entry.get(direction) if entry else None
+
+    def peek(self, photo_id):
+        """Entry copy without counting a hit or miss (None if not cached)."""
+        with self._lock:
+            entry = self._entries.get(photo_id)
+            return dict(entry) if entry else None
+
+    def lookup(self, photo_id):
+        """Entry copy for a photo the worker just landed on; counts hits and misses."""
+        with self._lock:
+            entry = self._entries.get(photo_id)
+            if entry is None or 'description' not in entry:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(photo_id)
+            self.hits += 1
+            return dict(entry)
+
+    def update_description(self, photo_id, description):
+        """Keep a cached description current after an edit (no-op for photos not cached)."""
+        with self._lock:
+            if photo_id in self._entries:
+                self._entries[photo_id]['description'] = description
+
+    def mark_stale(self, photo_id):
+        """The live page disagreed with the cache: drop the entry's content, keep its links."""
+        with self._lock:
+            entry = self._entries.get(photo_id)
+            if entry:
+                entry.pop('description', None)
+                entry.pop('names', None)
+            self.stale += 1
+            self.hits -= 1
+
+    def report(self):
+        looked_up = self.hits + self.misses + self.stale
+        rate = self.hits / looked_up if looked_up else 0.0
+        return [f'[CACHE] {len(self._entries)} photos cached, {self.fetched} fetched; '
+                f'{self.hits} hits, {self.misses} misses, {self.stale} stale ({rate:.0%} served from cache)']
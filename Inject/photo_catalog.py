@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Photo catalog - local copy of every description and detected name seen, with full-text search.
+
+Each photo is one row in a WAL-mode SQLite database
+(~/.googlephotos_tagger/catalog.db) holding the description and detected
+face/album names it had when it was last seen. An FTS5 index over both
+columns is kept in sync by triggers. The browser worker updates the catalog
+whenever it samples a description, scans names or makes an edit, and the
+read-ahead tab does the same for the photos it walks past. Photo dates come
+from the library index (library_crawler.py) at query time, and
+--import-index adds every indexed photo, seen or not.
+
+Usage:
+    python inject.py query --year 1998 --face Laura --missing Laura
+    python inject.py query --text beach --since 2001-06-01 --until 2001-09-01
+    python inject.py query --face Laura --missing Laura --export laura.jsonl   # batch manifest
+    python inject.py query --import-index
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from library_crawler import PHOTO_INDEX_DB
+from local_data import data_path
+from photo_ids import photo_id_from_url
+from sqlite_writer import SqliteWriter
+
+
+CATALOG_DB = data_path('catalog.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    id INTEGER PRIMARY KEY,
+    photo_id TEXT NOT NULL UNIQUE,
+    url TEXT,
+    description TEXT,
+    names TEXT,
+    updated REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS photos_fts USING fts5(
+    description, names, content='photos', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS photos_ai AFTER INSERT ON photos BEGIN
+    INSERT INTO photos_fts (rowid, description, names) VALUES (new.id, new.description, new.names);
+END;
+CREATE TRIGGER IF NOT EXISTS photos_ad AFTER DELETE ON photos BEGIN
+    INSERT INTO photos_fts (photos_fts, rowid, description, names) VALUES ('delete', old.id, old.description, old.names);
+END;
+CREATE TRIGGER IF NOT EXISTS photos_au AFTER UPDATE ON photos BEGIN
+    INSERT INTO photos_fts (photos_fts, rowid, description, names) VALUES ('delete', old.id, old.description, old.names);
+    INSERT INTO photos_fts (rowid, description, names) VALUES (new.id, new.description, new.names);
+END;
+"""
+
+# Unknown fields (None) keep what the catalog already has
+UPSERT_SQL = """
+INSERT INTO photos (photo_id, url, description, names, updated) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (photo_id) DO UPDATE SET
+    url = coalesce(excluded.url, url),
+    description = coalesce(excluded.description, description),
+    names = coalesce(excluded.names, names),
+    updated = excluded.updated
+WHERE excluded.description IS NOT NULL OR excluded.names IS NOT NULL OR url IS NULL
+"""
+
+DATE_EXPR = '(SELECT i.date FROM idx.photos i WHERE i.photo_id = p.photo_id ORDER BY i.source = ? DESC LIMIT 1)'
+
+
+def fts_phrase(text):
+    """Quote user text as one FTS5 phrase (no query syntax gets through)."""
+    return '"' + str(text).replace('"', '""') + '"'
+
+
+class PhotoCatalog:
+    """Keeps descriptions and names per photo and answers full-text queries over them."""
+
+    def __init__(self, path=None, index_path=None):
+        self.path = path or CATALOG_DB
+        self.index_path = index_path or PHOTO_INDEX_DB
+        self._writer = SqliteWriter(self.path, SCHEMA, name='catalog-writer')
+        self.recorded = 0
+
+    def record(self, photo, description=None, names=None):
+        """Queue an update for one photo (ID or URL); None leaves a field as it was."""
+        photo_id = photo_id_from_url(photo or '') or photo
+        if not photo_id:
+            return
+        if isinstance(names, (list, tuple)):
+            names = ', '.join(names)
+        url = photo if '://' in (photo or '') else None
+        self._writer.execute(UPSERT_SQL, (photo_id, url, description, names, time.time()))
+        self.recorded += 1
+
+    def import_index(self, source=None):
+        """Add a row for every photo in the library index (fields stay unknown until seen)."""
+        if not os.path.exists(self.index_path):
+            return 0
+        rows = self._writer.query('SELECT DISTINCT photo_id, url FROM idx.photos' +
+                                  (' WHERE source = ?' if source else ''),
+                                  (source,) if source else (), attach={'idx': self.index_path})
+        for row in rows:
+            self._writer.execute('INSERT OR IGNORE INTO photos (photo_id, url) VALUES (?, ?)',
+                                 (row['photo_id'], row['url']))
+        self._writer.flush(30)
+        return len(rows)
+
+    def search(self, text=None, face=None, missing=None, empty=False, unseen=False,
+               year=None, since=None, until=None, limit=None):
+        """Photos matching every given condition, oldest first (undated last).
+
+        Args:
+            text: Words/phrase that must be in the description
+            face: Name that must be among the detected names
+            missing: Name that must NOT be in the description
+            empty: Only photos whose description is known to be empty
+            unseen: Only photos whose description has never been read
+            year / since / until: Photo date filters ('1998', '1998-12-01'; until is exclusive)
+        Returns:
+            list of {'photo_id', 'url', 'description', 'names', 'date'}
+        """
+        have_index = os.path.exists(self.index_path)
+        date_expr = DATE_EXPR if have_index else 'NULL'
+        clauses, params = [], []
+        if have_index:
+            params.append('https://photos.google.com/')  # library dates first, then albums
+        match = []
+        if text:
+            match.append(f'description : {fts_phrase(text)}')
+        if face:
+            match.append(f'names : {fts_phrase(face)}')
+        if match:
+            clauses.append('p.id IN (SELECT rowid FROM photos_fts WHERE photos_fts MATCH ?)')
+            params.append(' AND '.join(match))
+        if missing:
+            clauses.append('p.id NOT IN (SELECT rowid FROM photos_fts WHERE photos_fts MATCH ?)')
+            params.append(f'description : {fts_phrase(missing)}')
+        if empty:
+            clauses.append("trim(p.description) = ''")
+        if unseen:
+            clauses.append('p.description IS NULL')
+        date_clauses = []
+        if year:
+            date_clauses.append(('date >= ?', f'{int(year):04d}-01-01'))
+            date_clauses.append(('date < ?', f'{int(year) + 1:04d}-01-01'))
+        if since:
+            date_clauses.append(('date >= ?', since))
+        if until:
+            date_clauses.append(('date < ?', until))
+        where = ' AND '.join(clauses) or '1'
+        sql = (f'SELECT photo_id, url, description, names, date FROM '
+               f'(SELECT p.photo_id, p.url, p.description, p.names, {date_expr} AS date '
+               f'FROM photos p WHERE {where})')
+        if date_clauses:
+            sql += ' WHERE ' + ' AND '.join(c for c, _ in date_clauses)
+            params += [v for _, v in date_clauses]
+        sql += ' ORDER BY date IS NULL, date, photo_id'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return self._writer.query(sql, params, attach={'idx': self.index_path} if have_index else None)
+
+    def count(self):
+        return self._writer.query('SELECT COUNT(*) AS n FROM photos')[0]['n']
+
+    def flush(self, timeout=5.0):
+        return self._writer.flush(timeout)
+
+    def close(self):
+        self._writer.close()
+
+    def report(self):
+        if not self.recorded:
+            return ['[CATALOG] No catalog updates this session']
+        return [f'[CATALOG] {self.recorded} catalog updates written to {self.path}']
+
+
+def export_manifest(rows, path, op='append', text=None):
+    """Write rows as a batch manifest ({photo, op, text} per line); returns the record count."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            record = {'photo': row['photo_id'], 'op': op}
+            if text is not None:
+                record['text'] = text
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='inject.py query', description='Search the local description catalog')
+    parser.add_argument('--text', help='Words that must be in the description')
+    parser.add_argument('--face', help='Name that must be among the detected face/album names')
+    parser.add_argument('--missing', help='Name that must not be in the description')
+    parser.add_argument('--empty', action='store_true', help='Only photos with an empty description')
+    parser.add_argument('--unseen', action='store_true', help='Only indexed photos whose description was never read')
+    parser.add_argument('--year', type=int, help='Photo year (dates come from the library index)')
+    parser.add_argument('--since', help='First photo date, e.g. 1998-12-01')
+    parser.add_argument('--until', help='Photo date to stop before')
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--export', metavar='PATH', help='Write the matches as a batch manifest')
+    parser.add_argument('--op', default=None, help='Manifest op (default: append the --missing name)')
+    parser.add_argument('--op-text', default=None, help='Manifest text (default: the --missing name plus a space)')
+    parser.add_argument('--import-index', action='store_true', help='Add every photo in the library index first')
+    parser.add_argument('--db', default=CATALOG_DB, help='Catalog database (default: %(default)s)')
+    parser.add_argument('--index-db', default=PHOTO_INDEX_DB, help='Library index (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    catalog = PhotoCatalog(args.db, args.index_db)
+    try:
+        if args.import_index:
+            print(f'[CATALOG] {catalog.import_index()} indexed photos imported')
+        start = time.perf_counter()
+        rows = catalog.search(text=args.text, face=args.face, missing=args.missing, empty=args.empty,
+                              unseen=args.unseen, year=args.year, since=args.since, until=args.until,
+                              limit=args.limit)
+        ms = (time.perf_counter() - start) * 1000
+        if args.export:
+            op = args.op or 'append'
+            text = args.op_text if args.op_text is not None else (args.missing + ' ' if args.missing else None)
+            if op == 'append' and not text:
+                parser.error('--export needs --op-text (or --missing) for append')
+            export_manifest(rows, args.export, op, text)
+            print(f'[CATALOG] {len(rows)} photos written to {args.export} (op {op}); '
+                  f'run: python inject.py batch --manifest {args.export}')
+        else:
+            for row in rows:
+                print(f'{row["date"] or "----------"} {row["photo_id"]} {row["description"]!r} '
+                      f'[{row["names"] or ""}]')
+        print(f'[CATALOG] {len(rows)} of {catalog.count()} photos matched in {ms:.1f} ms')
+        return 0
+    finally:
+        catalog.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
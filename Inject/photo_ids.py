@@ -0,0 +1,19 @@
+"""Photo IDs - stable photo identifiers from Google Photos URLs"""
+import re
+
+
+# /photo/<id>, also inside /u/1/..., /album/<album>/photo/<id>, /share/<share>/photo/<id>
+PHOTO_ID_RE = re.compile(r'/photo/([A-Za-z0-9_-]{10,})')
+
+
+def photo_id_from_url(url):
+    """Return the photo ID in a Google Photos viewer URL, or None."""
+    if not url:
+        return None
+    m = PHOTO_ID_RE.search(url)
+    return m.group(1) if m else None
+
+
+def photo_url(photo_id):
+    """Viewer URL for a photo ID."""
+    return f'https://photos.google.com/photo/{photo_id}'
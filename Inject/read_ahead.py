@@ -0,0 +1,233 @@
+"""Read ahead - a background tab that walks ahead of the user and caches the next photos' descriptions and names"""
+import threading
+import time
+
+from photo_ids import photo_id_from_url
+from read_lane import READ_DESCRIPTION_EXPR
+from render_profile import SLIDE_READY_JS
+from selector_profile import DEFAULT_SELECTORS, FIND_NAMES_JS, FIND_VIEWER_IMAGE_JS
+import textarea_registry
+from textarea_registry import ACTIVE_DESCRIPTION_EXPR
+import throttle_guard
+
+
+ARROW_KEYS = {'next': 'ArrowRight', 'prev': 'ArrowLeft'}
+SLIDE_TIMEOUT = 10000  # ms for the hidden page to reach the next photo
+DESCRIPTION_READS = 6  # reads 150 ms apart until two agree (Photos fills the text in late)
+
+
+class ReadAhead:
+    """Keeps a hidden tab `depth` photos ahead of the interactive page and fills a PhotoCache.
+
+    Like ReadLane it runs its own Playwright driver on its own thread over
+    connect_over_cdp; the tab is created in the background so the user's tab
+    keeps the foreground. follow() is called after every navigation; only the
+    newest position matters, so an older walk is abandoned as soon as it moves.
+    """
+
+    def __init__(self, endpoint_resolver, cache, depth=2, latency=None, selector_profile=None, catalog=None):
+        """Args:
+            endpoint_resolver: callable returning the DevTools HTTP endpoint (or None while not ready)
+            cache: PhotoCache to fill
+            depth: Photos to stay ahead of the interactive page
+            latency: optional LatencyStats; fetches are recorded under path 'read_ahead'
+            selector_profile: optional SelectorProfile for viewer image and chip selectors
+            catalog: optional PhotoCatalog that also gets every fetched description and names
+        """
+        self._endpoint_resolver = endpoint_resolver
+        self.cache = cache
+        self.depth = depth
+        self.latency = latency
+        self.selector_profile = selector_profile
+        self.catalog = catalog
+        self._thread = None
+        self._running = False
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._target = None  # (url, direction), newest wins
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._page = None
+        self._guard = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self, timeout=15):
+        """Start the read-ahead thread; returns immediately."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._main, args=(timeout,), daemon=True, name='read-ahead')
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def follow(self, url, direction='next'):
+        """The interactive page is now on `url`, moving in `direction`: walk ahead from there."""
+        if direction not in ARROW_KEYS or not photo_id_from_url(url or ''):
+            return
+        with self._lock:
+            self._target = (url, direction)
+        self._wake.set()
+
+    def _moved(self, url):
+        with self._lock:
+            return self._target is not None and self._target[0] != url
+
+    def _main(self, timeout):
+        from playwright.sync_api import sync_playwright
+        try:
+            endpoint = None
+            deadline = time.time() + timeout
+            while self._running and not endpoint and time.time() < deadline:
+                endpoint = self._endpoint_resolver()
+                if not endpoint:
+                    time.sleep(0.2)
+            if not endpoint:
+                print('[READ_AHEAD] No DevTools endpoint, read-ahead disabled')
+                return
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.connect_over_cdp(endpoint)
+            self._page = self._open_background_page(self._browser.contexts[0])
+            # Background tabs get throttled and never have focus; arrow keys and timers need both
+            self._guard = throttle_guard.attach(self._page)
+            self._ready.set()
+            print(f'[READ_AHEAD] Ready, staying {self.depth} photos ahead')
+
+            walked = None
+
+            while self._running:
+                self._wake.wait(0.5)
+                self._wake.clear()
+                with self._lock:
+                    target = self._target
+                if not (self._running and target) or target == walked:
+                    continue
+                try:
+                    self._walk(*target)
+                except Exception as e:
+                    print(f'[READ_AHEAD] ERROR: {e}')
+                walked = target
+        except Exception as e:
+            print(f'[READ_AHEAD] ERROR: {e}')
+        finally:
+            self._ready.clear()
+            for step in (lambda: self._guard and self._guard.detach(),
+                         lambda: self._page and self._page.close(),
+                         lambda: self._browser and self._browser.close(),  # disconnect only
+                         lambda: self._playwright and self._playwright.stop()):
+                try:
+                    step()
+                except Exception:
+                    pass
+            print('[READ_AHEAD] Stopped')
+
+    def _open_background_page(self, context):
+        """New tab that does not take the foreground from the user's tab."""
+        try:
+            session = self._browser.new_browser_cdp_session()
+            with context.expect_page(timeout=10000) as info:
+                session.send('Target.createTarget', {'url': 'about:blank', 'background': True})
+            session.detach()
+            return info.value
+        except Exception as e:
+            print(f'[READ_AHEAD] Background tab unavailable ({e}), using a normal tab')
+            return context.new_page()
+
+    def _walk(self, url, direction):
+        """Fetch whatever is missing in the `depth` photos after `url`."""
+        current = photo_id_from_url(url)
+        for _ in range(self.depth):
+            if self._moved(url) or not self._running:
+                return  # the user went somewhere else; start over from there
+            ahead = self.cache.neighbour(current, direction)
+            entry = self.cache.peek(ahead) if ahead else None
+            if entry and 'description' in entry:
+                current = ahead
+                continue
+            ahead = self._fetch_after(current, direction, self._url_in_context(current, url))
+            if not ahead:
+                return  # end of the album, or the page would not move
+            current = ahead
+
+    def _url_in_context(self, photo_id, followed_url):
+        """Viewer URL for `photo_id` inside the album/search the user is browsing.
+
+        A bare /photo/<id> URL would make the arrow keys walk library order
+        instead of the album or face group the interactive page is in.
+        """
+        cached = (self.cache.peek(photo_id) or {}).get('url')
+        if cached and photo_id_from_url(cached) == photo_id:
+            return cached
+        return followed_url.replace(photo_id_from_url(followed_url), photo_id)
+
+    def _fetch_after(self, photo_id, direction, url):
+        """Step the hidden page from `photo_id` (opening `url` if it is elsewhere) to its neighbour and cache it."""
+        start = time.perf_counter()
+        page = self._page
+        if photo_id_from_url(page.url) != photo_id:
+            page.goto(url, wait_until='domcontentloaded')
+            textarea_registry.install(page)
+            page.wait_for_function('() => !!(' + ACTIVE_DESCRIPTION_EXPR + ')', timeout=15000)
+            if not self.cache.peek(photo_id):
+                self._store(photo_id, page.url)
+        old_url = page.url
+        if not self._step(old_url, direction):
+            return None
+        ahead = photo_id_from_url(page.url)
+        if not ahead or ahead == photo_id:
+            return None
+        self._store(ahead, page.url)
+        self.cache.link(photo_id, ahead, direction)
+        if self.latency:
+            self.latency.record('prefetch', 'read_ahead', time.perf_counter() - start)
+        return ahead
+
+    def _store(self, photo_id, url):
+        description, names = self._stable_description(), self._read_names()
+        self.cache.put(photo_id, url=url, description=description, names=names)
+        if self.catalog:
+            self.catalog.record(url, description=description, names=names)
+
+    def _step(self, old_url, direction):
+        """Arrow key to the neighbouring photo; clicks the photo first if the key alone did not move."""
+        page = self._page
+        for attempt in range(2):
+            if attempt:
+                selectors = (self.selector_profile.ordered('viewer_image') if self.selector_profile
+                             else DEFAULT_SELECTORS['viewer_image'])
+                image = page.evaluate(FIND_VIEWER_IMAGE_JS, selectors)
+                if image and image.get('found'):
+                    page.mouse.click(image['x'], image['y'])
+            page.keyboard.press(ARROW_KEYS[direction])
+            try:
+                page.wait_for_function(SLIDE_READY_JS, arg=old_url, timeout=SLIDE_TIMEOUT // 2)
+                return True
+            except Exception:
+                continue
+        return False
+
+    def _stable_description(self):
+        """Description once a few reads in a row agree (Photos fills it in after the slide appears)."""
+        value = None
+        for _ in range(DESCRIPTION_READS):
+            previous, value = value, self._page.evaluate(READ_DESCRIPTION_EXPR)
+            if value is not None and value == previous:
+                break
+            self._page.wait_for_timeout(150)
+        return value
+
+    def _read_names(self):
+        if self.selector_profile:
+            selectors = self.selector_profile.ordered_groups('face_chips', 'album_chips')
+        else:
+            selectors = {g: DEFAULT_SELECTORS[g] for g in ('face_chips', 'album_chips')}
+        scan = self._page.evaluate(FIND_NAMES_JS, selectors) or {}
+        return scan.get('names')
@@ -0,0 +1,266 @@
+"""Read lane - read-only page queries on a second CDP connection"""
+import json
+import queue
+import threading
+import time
+
+from selector_profile import DEFAULT_SELECTORS, FIND_NAMES_JS
+from textarea_registry import ACTIVE_DESCRIPTION_EXPR, REGISTRY_STATS_JS
+from throttle_guard import THROTTLE_PROBE_EXPR
+
+
+READ_DESCRIPTION_EXPR = ("(() => { const ta = " + ACTIVE_DESCRIPTION_EXPR + ";"
+                         " return ta ? (ta.value || '').trim() : null; })()")
+
+READ_URL_EXPR = "location.href"
+
+QUERIES = {
+    'description': READ_DESCRIPTION_EXPR,
+    'url': READ_URL_EXPR,
+}
+
+# Read in the page's main world: they need page globals or measure the page's own timers
+MAIN_WORLD_QUERIES = {
+    'registry_stats': '(' + REGISTRY_STATS_JS + ')()',
+    'throttle': THROTTLE_PROBE_EXPR,
+}
+
+WORLD_NAME = 'gphotos-tagger-read-lane'
+
+
+class ReadLane:
+    """Serves description/name/URL reads concurrently with the input lane.
+
+    Runs its own Playwright driver on its own thread, connected to the same
+    Chrome via connect_over_cdp, and evaluates in an isolated world so reads
+    never touch focus, selection or scroll of the page the user is editing.
+    """
+
+    def __init__(self, endpoint_resolver, url_hint=None, latency=None, selector_profile=None):
+        """Args:
+            endpoint_resolver: callable returning the DevTools HTTP endpoint (or None while not ready)
+            url_hint: callable returning the input lane's current URL, used to pick the same tab
+            latency: optional LatencyStats; reads are recorded under path 'read_lane'
+            selector_profile: optional SelectorProfile for face/album chip selectors
+        """
+        self._endpoint_resolver = endpoint_resolver
+        self._url_hint = url_hint
+        self.latency = latency
+        self.selector_profile = selector_profile
+        self._queue = queue.Queue()
+        self._thread = None
+        self._running = False
+        self._ready = threading.Event()
+        self._playwright = None
+        self._browser = None
+        self._page = None
+        self._session = None
+        self._context_id = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self, timeout=15):
+        """Start the lane thread; returns immediately (use `ready` to check)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._lane_main, args=(timeout,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._queue.put(('stop', None))
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def submit(self, kind, callback=None):
+        """Queue a read without waiting. Returns (event, result_dict)."""
+        ev = threading.Event()
+        res = {}
+        self._queue.put((kind, (ev, res, callback)))
+        return ev, res
+
+    def read(self, kind, timeout=5.0):
+        """Blocking read of 'description', 'names', 'url', 'snapshot', 'registry_stats' or 'throttle'."""
+        if not self.ready:
+            return None
+        ev, res = self.submit(kind)
+        if not ev.wait(timeout):
+            return None
+        return res.get('value')
+
+    def evaluate(self, js_function, arg=None, timeout=30.0):
+        """Run a read-only `(arg) => {...}` function source in the isolated world."""
+        if not self.ready:
+            raise RuntimeError('Read lane not ready')
+        ev, res = self.submit(('evaluate', js_function, arg))
+        if not ev.wait(timeout):
+            raise RuntimeError('Read lane evaluate timed out')
+        if 'error' in res:
+            raise RuntimeError(res['error'])
+        return res.get('value')
+
+    def _lane_main(self, timeout):
+        from playwright.sync_api import sync_playwright
+        try:
+            endpoint = None
+            deadline = time.time() + timeout
+            while self._running and not endpoint and time.time() < deadline:
+                endpoint = self._endpoint_resolver()
+                if not endpoint:
+                    time.sleep(0.2)
+            if not endpoint:
+                print('[READ_LANE] No DevTools endpoint, read lane disabled')
+                return
+
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.connect_over_cdp(endpoint)
+            self._page = self._find_page()
+            if not self._page:
+                print('[READ_LANE] Could not find Google Photos tab, read lane disabled')
+                return
+            self._session = self._page.context.new_cdp_session(self._page)
+            self._create_world()
+            self._ready.set()
+            print(f'[READ_LANE] Ready on {endpoint}')
+
+            while self._running:
+                try:
+                    kind, arg = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if kind == 'stop':
+                    break
+                ev, res, callback = arg
+                try:
+                    res['value'] = self._serve(kind)
+                except Exception as e:
+                    res['error'] = str(e)
+                    print(f'[READ_LANE] {kind} ERROR: {e}')
+                ev.set()
+                if callback and 'error' not in res:
+                    try:
+                        callback(res['value'])
+                    except Exception as e:
+                        print(f'[READ_LANE] callback ERROR: {e}')
+        except Exception as e:
+            print(f'[READ_LANE] ERROR: {e}')
+        finally:
+            self._ready.clear()
+            self._fail_pending()
+            try:
+                if self._browser:
+                    self._browser.close()  # disconnects only; Chrome keeps running
+            except Exception:
+                pass
+            try:
+                if self._playwright:
+                    self._playwright.stop()
+            except Exception:
+                pass
+            print('[READ_LANE] Stopped')
+
+    def _fail_pending(self):
+        while True:
+            try:
+                kind, arg = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if kind != 'stop':
+                ev, res, _callback = arg
+                res['error'] = 'read lane stopped'
+                ev.set()
+
+    def _find_page(self):
+        """Pick the tab the input lane is driving (same URL), else the first Photos tab."""
+        pages = [p for ctx in self._browser.contexts for p in ctx.pages]
+        hint = self._url_hint() if self._url_hint else None
+        for page in pages:
+            if hint and page.url == hint:
+                return page
+        for page in pages:
+            if page.url.startswith('https://photos.google.com'):
+                return page
+        return pages[0] if pages else None
+
+    def _reattach(self):
+        """Follow the input lane to its new tab after the old one was closed."""
+        page = self._find_page()
+        if not page:
+            raise RuntimeError('Google Photos tab is gone')
+        try:
+            self._session.detach()
+        except Exception:
+            pass
+        self._page = page
+        self._session = page.context.new_cdp_session(page)
+        print(f'[READ_LANE] Reattached to {page.url}')
+
+    def _create_world(self):
+        tree = self._session.send('Page.getFrameTree')
+        frame_id = tree['frameTree']['frame']['id']
+        world = self._session.send('Page.createIsolatedWorld', {
+            'frameId': frame_id,
+            'worldName': WORLD_NAME,
+        })
+        self._context_id = world['executionContextId']
+
+    def _eval(self, expression, main_world=False):
+        """Evaluate in the isolated world, recreating it once if the page navigated.
+
+        main_world=True evaluates in the page's own context (read-only queries only)
+        and awaits a returned promise.
+        """
+        for attempt in range(2):
+            params = {'expression': expression, 'returnByValue': True}
+            if main_world:
+                params['awaitPromise'] = True
+            else:
+                if self._context_id is None:
+                    self._create_world()
+                params['contextId'] = self._context_id
+            try:
+                resp = self._session.send('Runtime.evaluate', params)
+            except Exception:
+                if attempt:
+                    raise
+                if self._page.is_closed():
+                    self._reattach()  # input lane recycled the tab
+                self._context_id = None
+                continue
+            if resp.get('exceptionDetails'):
+                raise RuntimeError(resp['exceptionDetails'].get('text', 'evaluate failed'))
+            return resp.get('result', {}).get('value')
+        return None
+
+    def _serve(self, kind):
+        start = time.perf_counter()
+        if isinstance(kind, tuple) and kind[0] == 'evaluate':
+            arg = kind[2] if len(kind) > 2 else None
+            value = self._eval('(' + kind[1] + ')(' + json.dumps(arg) + ')')
+            kind = 'evaluate'
+        elif kind == 'names':
+            value = self._read_names()
+        elif kind == 'snapshot':
+            value = {name: self._eval(expr) for name, expr in QUERIES.items()}
+            value['names'] = self._read_names()
+        elif kind in MAIN_WORLD_QUERIES:
+            value = self._eval(MAIN_WORLD_QUERIES[kind], main_world=True)
+        else:
+            value = self._eval(QUERIES[kind])
+        if self.latency:
+            self.latency.record(f'lane:{kind}', 'read_lane', time.perf_counter() - start)
+        return value
+
+    def _read_names(self):
+        if self.selector_profile:
+            selectors = self.selector_profile.ordered_groups('face_chips', 'album_chips')
+        else:
+            selectors = {g: DEFAULT_SELECTORS[g] for g in ('face_chips', 'album_chips')}
+        scan = self._eval('(' + FIND_NAMES_JS + ')(' + json.dumps(selectors) + ')') or {}
+        if self.selector_profile:
+            for group, attempts in (scan.get('attempts') or {}).items():
+                self.selector_profile.record(group, attempts)
+        return scan.get('names')
@@ -0,0 +1,103 @@
+"""Render profile - animation-free rendering for faster slide settle times"""
+import json
+
+
+# Zero every transition/animation so the next slide and its info panel are
+# final as soon as they are in the DOM.
+NO_ANIMATION_CSS = """*, *::before, *::after {
+    transition-duration: 0s !important;
+    transition-delay: 0s !important;
+    animation-duration: 0s !important;
+    animation-delay: 0s !important;
+    animation-iteration-count: 1 !important;
+    scroll-behavior: auto !important;
+}"""
+
+# Init scripts run before the document has a <head>; wait for the root element.
+NO_ANIMATION_INIT_JS = """(() => {
+    const css = %s;
+    const inject = () => {
+        if (document.getElementById('__gp_no_animation')) return true;
+        const root = document.head || document.documentElement;
+        if (!root) return false;
+        const style = document.createElement('style');
+        style.id = '__gp_no_animation';
+        style.textContent = css;
+        root.appendChild(style);
+        return true;
+    };
+    if (!inject()) {
+        new MutationObserver((_m, obs) => { if (inject()) obs.disconnect(); })
+            .observe(document, {childList: true, subtree: true});
+    }
+})()"""
+
+# Fixed waits (ms) in BrowserController. With animations off most of the time
+# was spent waiting for transitions that no longer run.
+SETTLE_WAITS = {
+    'default': {
+        'after_click': 100,     # _navigate_photo: image click -> arrow key
+        'after_arrow': 500,     # _navigate_photo: arrow key -> sample description
+        'focus_click': 15,      # _focus_textarea: click -> programmatic focus
+        'end_key': 50,          # _do_backspace: End-key fallback
+    },
+    'no_animation': {
+        'after_click': 20,
+        'after_arrow': 500,     # upper bound only; we return as soon as the slide is in the DOM
+        'focus_click': 0,
+        'end_key': 10,
+    },
+}
+
+# (oldUrl) => true once the URL changed and a visible slide's textarea (not an aria-hidden
+# preloaded neighbour) exists. Scans directly rather than through the registry so
+# polling does not count as registry lookups.
+SLIDE_READY_JS = """(oldUrl) => {
+    if (location.href === oldUrl) return false;
+    const selector = window.__gpDescRegistry ? window.__gpDescRegistry.selectors.join(', ')
+                                             : 'textarea[aria-label="Description"]';
+    for (const ta of document.querySelectorAll(selector)) {
+        if (ta.offsetHeight > 0 && !ta.closest('[aria-hidden="true"]')) return true;
+    }
+    return false;
+}"""
+
+
+def parse_viewport(text):
+    """Parse 'WIDTHxHEIGHT' into a Playwright viewport dict (None for empty)."""
+    if not text:
+        return None
+    width, _, height = text.lower().partition('x')
+    return {'width': int(width), 'height': int(height)}
+
+
+def launch_options(no_animations=False, viewport=None):
+    """Extra launch_persistent_context kwargs for the render profile."""
+    options = {}
+    if no_animations:
+        options['reduced_motion'] = 'reduce'
+    if viewport:
+        options['viewport'] = viewport
+    return options
+
+
+def install_init_script(context):
+    """Install the animation-killing stylesheet into every future document of the context."""
+    try:
+        context.add_init_script(script=NO_ANIMATION_INIT_JS % json.dumps(NO_ANIMATION_CSS))
+        return True
+    except Exception as e:
+        print(f'[RENDER] WARNING: could not add no-animation init script: {e}')
+        return False
+
+
+def apply_to_page(page):
+    """Emulate prefers-reduced-motion and inject the stylesheet into the current document."""
+    try:
+        page.emulate_media(reduced_motion='reduce')
+        page.evaluate(NO_ANIMATION_INIT_JS % json.dumps(NO_ANIMATION_CSS))
+        print('[RENDER] Animation-free profile active (reduced motion + zero-duration transitions)')
+        return True
+    except Exception as e:
+        print(f'[RENDER] WARNING: could not apply animation-free profile: {e}')
+        return False
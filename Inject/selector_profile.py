@@ -0,0 +1,217 @@
+"""Selector profile - data-driven DOM selectors with hit-rate statistics"""
+import json
+import os
+import threading
+
+from local_data import data_path
+
+
+# Candidate selectors per element group, in the original (hand-tuned) order.
+# The profile reorders them by observed hit rate and speed.
+DEFAULT_SELECTORS = {
+    'viewer_image': [
+        'img[alt="View photo"]',
+        'img[alt*="View"]',
+        'img[role="button"]',
+        'img[jsname]',
+    ],
+    'textarea': [
+        'textarea[aria-label="Description"]',
+        'textarea.tL9Q4c',
+    ],
+    'face_chips': [
+        'span.Y8X4Pc',
+    ],
+    'album_chips': [
+        'div.DgVY7 div.AJM7gb',  # descendant, like the original DgVY7 + querySelector lookup
+    ],
+}
+
+# (selectors) => {found, x, y, width, height, selector, attempts}
+FIND_VIEWER_IMAGE_JS = """(selectors) => {
+    const attempts = [];
+    for (const selector of selectors) {
+        const t0 = performance.now();
+        const imgs = document.querySelectorAll(selector);
+        for (const img of imgs) {
+            const rect = img.getBoundingClientRect();
+            const style = window.getComputedStyle(img);
+
+            // Must be visible and reasonably sized
+            if (rect.width > 100 && rect.height > 100 && style.display !== 'none' && style.visibility !== 'hidden') {
+                attempts.push({selector: selector, hit: true, ms: performance.now() - t0});
+                return {
+                    x: rect.left + rect.width / 2,
+                    y: rect.top + rect.height / 2,
+                    width: rect.width,
+                    height: rect.height,
+                    selector: selector,
+                    found: true,
+                    attempts: attempts
+                };
+            }
+        }
+        attempts.push({selector: selector, hit: false, ms: performance.now() - t0});
+    }
+    return { found: false, attempts: attempts };
+}"""
+
+# ({face_chips, album_chips}) => {names, attempts: {face_chips: [...], album_chips: [...]}}
+FIND_NAMES_JS = r"""(sel) => {
+    function isElementVisuallyHidden(element) {
+        let current = element;
+        while (current && current.tagName !== 'BODY') {
+            if (current.getAttribute('aria-hidden') === 'true') {
+                return true;
+            }
+            const style = current.getAttribute('style') || '';
+            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
+                return true;
+            }
+            current = current.parentElement;
+        }
+        return false;
+    }
+
+    // First selector in each group that yields visible text wins
+    function collect(selectors, attempts, keep) {
+        for (const selector of selectors) {
+            const t0 = performance.now();
+            const found = [];
+            for (const el of document.querySelectorAll(selector)) {
+                if (el.textContent && !isElementVisuallyHidden(el) && el.offsetHeight > 0) {
+                    const text = el.textContent.trim();
+                    if (keep(text)) found.push(text);
+                }
+            }
+            attempts.push({selector: selector, hit: found.length > 0, ms: performance.now() - t0});
+            if (found.length) return found;
+        }
+        return [];
+    }
+
+    const attempts = {face_chips: [], album_chips: []};
+    // 1. Face/people tags
+    const faces = collect(sel.face_chips, attempts.face_chips, (text) => !!text);
+    // 2. Album names that might be people - skip year-prefixed albums
+    const albums = collect(sel.album_chips, attempts.album_chips, (text) => !!text && !text.match(/^\d{4}/));
+    const names = faces.concat(albums);
+    return {names: names.length > 0 ? names : null, attempts: attempts};
+}"""
+
+
+def _empty():
+    return {'tries': 0, 'hits': 0, 'total_ms': 0.0}
+
+
+class SelectorProfile:
+    """Keeps selector lists per element group and reorders them by measured performance.
+
+    Lifetime counters are persisted to JSON; session counters start at zero on
+    each run so a selector that suddenly stops matching shows up in the report.
+    """
+
+    def __init__(self, path=None, groups=None):
+        self.path = path or data_path('selector_stats.json')
+        self._groups = {g: list(s) for g, s in (groups or DEFAULT_SELECTORS).items()}
+        self._lifetime = {}
+        self._session = {}
+        self._dirty = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for group, selectors in data.get('stats', {}).items():
+            for selector, counters in selectors.items():
+                self._lifetime.setdefault(group, {})[selector] = dict(_empty(), **counters)
+                # Selectors learned in earlier sessions stay candidates
+                if group in self._groups and selector not in self._groups[group]:
+                    self._groups[group].append(selector)
+        print(f'[SELECTORS] Loaded selector stats from {self.path}')
+
+    def save(self):
+        """Write lifetime counters to disk."""
+        with self._lock:
+            data = json.loads(json.dumps({'stats': self._lifetime}))
+            self._dirty = 0
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f'[SELECTORS] WARNING: could not save stats: {e}')
+
+    def _score(self, group, selector):
+        c = self._lifetime.get(group, {}).get(selector)
+        if not c or not c['tries']:
+            return (0.5, 0.0)  # untried: middle of the pack, keeps original order
+        return (c['hits'] / c['tries'], -c['total_ms'] / c['tries'])
+
+    def ordered(self, group):
+        """Return the group's selectors, best (highest hit rate, then fastest) first."""
+        with self._lock:
+            selectors = self._groups.get(group, [])
+            return sorted(selectors, key=lambda s: self._score(group, s), reverse=True)
+
+    def ordered_groups(self, *groups):
+        """Return {group: ordered selectors} for passing into page scripts."""
+        return {g: self.ordered(g) for g in groups}
+
+    def _add(self, group, selector, tries, hits, ms):
+        for table in (self._lifetime, self._session):
+            c = table.setdefault(group, {}).setdefault(selector, _empty())
+            c['tries'] += tries
+            c['hits'] += hits
+            c['total_ms'] += ms
+
+    def _mark_dirty(self):
+        self._dirty += 1
+        if self._dirty >= 50:
+            self._dirty = 0
+            return True
+        return False
+
+    def record(self, group, attempts):
+        """Record attempts from a page script: [{selector, hit, ms}, ...]."""
+        with self._lock:
+            for a in attempts or []:
+                self._add(group, a['selector'], 1, 1 if a.get('hit') else 0, float(a.get('ms') or 0.0))
+            should_save = self._mark_dirty()
+        if should_save:
+            self.save()
+
+    def record_totals(self, group, totals, previous):
+        """Record cumulative in-page counters {selector: {tries, hits, ms}} as a delta over `previous`."""
+        with self._lock:
+            for selector, now in (totals or {}).items():
+                before = previous.get(selector, {'tries': 0, 'hits': 0, 'ms': 0.0})
+                if now['tries'] < before['tries']:
+                    before = {'tries': 0, 'hits': 0, 'ms': 0.0}  # page reloaded, counters restarted
+                if now['tries'] > before['tries']:
+                    self._add(group, selector, now['tries'] - before['tries'],
+                              now['hits'] - before['hits'], now['ms'] - before['ms'])
+            should_save = self._mark_dirty()
+        if should_save:
+            self.save()
+
+    def report(self):
+        """Return printable lines: session vs lifetime hit rate and avg time per selector."""
+        lines = ['[SELECTORS] group          selector                              session hits/tries  avg ms   lifetime hit%']
+        for group in self._groups:
+            for selector in self.ordered(group):
+                with self._lock:
+                    s = self._session.get(group, {}).get(selector, _empty())
+                    l = self._lifetime.get(group, {}).get(selector, _empty())
+                avg = s['total_ms'] / s['tries'] if s['tries'] else 0.0
+                life = f'{l["hits"] / l["tries"]:.0%}' if l['tries'] else '-'
+                lines.append(f'[SELECTORS] {group:<14} {selector:<38} {s["hits"]:>6}/{s["tries"]:<6} {avg:>9.2f} {life:>10}')
+                # A selector that used to work but misses every time this session: the DOM changed
+                if l['tries'] >= 20 and l['hits'] / l['tries'] > 0.5 and s['tries'] >= 5 and s['hits'] == 0:
+                    lines.append(f'[SELECTORS]   WARNING: "{selector}" stopped matching this session (DOM change?)')
+        return lines
@@ -0,0 +1,146 @@
+"""Session checkpoint - current photo and unacknowledged commands, kept on disk as they change"""
+import json
+import os
+import threading
+import time
+
+from local_data import data_path
+from photo_ids import photo_id_from_url
+
+
+CHECKPOINT_FILE = data_path('session.json')
+
+# Worker commands that change what the user is looking at or the description
+TRACKED_COMMANDS = ('next', 'prev', 'append_text', 'backspace', 'delete_all')
+# Also change the photo or description but are not replayed: the position after them is saved instead
+POSITION_COMMANDS = ('undo', 'redo', 'remove_name', 'fast_forward', 'jump_to', 'ensure', 'apply_edit', 'goto_photo')
+
+
+class SessionCheckpoint:
+    """Photo URL + description after the last acknowledged command, and every command still queued.
+
+    enqueue() records a command and puts it on the worker queue under one
+    lock, so the pending list is always in queue order and ack() just drops
+    the oldest entry. A writer thread saves the latest state atomically
+    (temp file + fsync + rename); nothing is written until the session issues
+    its first command, so the previous run's checkpoint survives until then.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CHECKPOINT_FILE
+        self.previous = self.load(self.path)  # left by the last run, until adopted or discarded
+        self._state = {'url': None, 'description': None, 'pending': [], 'saved': None, 'clean': False}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._written = False
+        self._thread = threading.Thread(target=self._write_loop, daemon=True, name='checkpoint-writer')
+        self._thread.start()
+
+    @staticmethod
+    def load(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) and state.get('url') else None
+        except (OSError, ValueError):
+            return None
+
+    # ---- worker side ------------------------------------------------------
+
+    def enqueue(self, cmd_queue, cmd, arg):
+        """Record a tracked command and put it on the worker queue."""
+        with self._lock:
+            self._seq += 1
+            self._state['pending'].append({'seq': self._seq, 'cmd': cmd, 'arg': arg, 'ts': time.time()})
+            cmd_queue.put((cmd, arg))
+        self._dirty.set()
+
+    def ack(self, url, description):
+        """The oldest pending command has been executed; the page is now at url/description."""
+        with self._lock:
+            if self._state['pending']:
+                self._state['pending'].pop(0)
+            self._state['url'] = url
+            self._state['description'] = description
+        self._dirty.set()
+
+    def set_position(self, url, description, save=True):
+        """Update the position outside the pending list; save=False only at startup, so the
+        previous run's checkpoint is not overwritten before the session does anything."""
+        with self._lock:
+            self._state['url'] = url
+            self._state['description'] = description
+        if save:
+            self._dirty.set()
+
+    # ---- resuming ----------------------------------------------------------
+
+    def resume_info(self):
+        """Summary of the previous run's checkpoint, or None if there is nothing to resume."""
+        prev = self.previous
+        if not prev or not photo_id_from_url(prev.get('url')):
+            return None
+        return {'url': prev['url'], 'photo_id': photo_id_from_url(prev['url']),
+                'pending': len(prev.get('pending') or []), 'saved': prev.get('saved'),
+                'clean': bool(prev.get('clean'))}
+
+    def adopt_previous(self):
+        """Continue from the previous run: its pending commands become ours (in front of any new ones).
+
+        Returns the previous state (None if there is none).
+        """
+        with self._lock:
+            prev, self.previous = self.previous, None
+            if not prev:
+                return None
+            carried = [dict(entry) for entry in prev.get('pending') or []]
+            self._state['pending'] = carried + self._state['pending']
+            self._seq = max([self._seq] + [entry.get('seq', 0) for entry in carried])
+            self._state['url'] = prev.get('url')
+            self._state['description'] = prev.get('description')
+        return prev
+
+    def release_previous(self, prev):
+        """Undo adopt_previous() for a resume that could not start: its commands leave the
+        pending list (so ack() keeps matching ours) and it can be offered again."""
+        with self._lock:
+            del self._state['pending'][:len(prev.get('pending') or [])]  # adopt_previous() put them in front
+            self.previous = prev
+        self._dirty.set()
+
+    def discard_previous(self):
+        self.previous = None
+
+    # ---- saving ------------------------------------------------------------
+
+    def close(self):
+        """Final save (marked clean) and stop the writer thread."""
+        self._stop.set()
+        self._thread.join(timeout=5)
+        if self._written or self._dirty.is_set():
+            with self._lock:
+                self._state['clean'] = True
+            self._save()
+
+    def _write_loop(self):
+        while not self._stop.is_set():
+            if self._dirty.wait(0.5):
+                self._dirty.clear()
+                self._save()
+
+    def _save(self):
+        with self._lock:
+            self._state['saved'] = time.time()
+            data = json.dumps(self._state, ensure_ascii=False)
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._written = True
+        except OSError as e:
+            print(f'[RESUME] WARNING: could not save checkpoint: {e}')
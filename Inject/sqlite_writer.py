@@ -0,0 +1,118 @@
+"""SQLite writer - WAL-mode database with a background writer thread and batched commits"""
+import queue
+import sqlite3
+import threading
+import time
+
+
+class SqliteWriter:
+    """Owns one write connection on its own thread; callers only enqueue statements.
+
+    Statements are committed in batches (up to `batch_size`, or whatever
+    arrived within `flush_interval`), so a write costs the caller a
+    queue.put. Reads open their own connection; WAL lets them run while the
+    writer commits.
+    """
+
+    def __init__(self, path, schema, batch_size=200, flush_interval=0.5, name='sqlite-writer'):
+        self.path = path
+        self.schema = schema
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._error = None
+        self.rows = 0
+        self.batches = 0
+        self.commit_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True, name=name)
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def execute(self, sql, params=()):
+        """Queue one statement for the next batch."""
+        self._queue.put((sql, params))
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far is committed. Returns False on timeout."""
+        ev = threading.Event()
+        self._queue.put((None, ev))
+        return ev.wait(timeout)
+
+    def query(self, sql, params=(), attach=None):
+        """Run a read query on a fresh connection; returns a list of dicts.
+
+        attach: optional {schema name: database path} to ATTACH first (read-only use)
+        """
+        self._ready.wait(10)
+        if self._error:
+            raise RuntimeError(self._error)
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            for name, path in (attach or {}).items():
+                conn.execute(f'ATTACH DATABASE ? AS {name}', (path,))
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def close(self, timeout=5.0):
+        """Commit what is queued and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            conn = self._connect()
+            conn.executescript(self.schema)
+            conn.commit()
+        except Exception as e:
+            self._error = f'could not open {self.path}: {e}'
+            print(f'[SQLITE] ERROR: {self._error}')
+            self._ready.set()
+            return
+        self._ready.set()
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            waiters = []
+            start = time.perf_counter()
+            written = 0
+            for entry in batch:
+                if entry is None:
+                    stopping = True
+                    continue
+                sql, arg = entry
+                if sql is None:
+                    waiters.append(arg)
+                    continue
+                try:
+                    conn.execute(sql, arg)
+                    written += 1
+                except Exception as e:
+                    print(f'[SQLITE] ERROR: {e} in {sql[:60]}')
+            if written:
+                try:
+                    conn.commit()
+                except Exception as e:
+                    print(f'[SQLITE] ERROR: commit failed: {e}')
+                self.rows += written
+                self.batches += 1
+                self.commit_seconds += time.perf_counter() - start
+            for ev in waiters:
+                ev.set()
+        conn.close()
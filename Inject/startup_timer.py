@@ -0,0 +1,40 @@
+"""Startup timer - timestamps for each startup phase, printed as a breakdown"""
+import threading
+import time
+
+
+class StartupTimer:
+    """Collects (label, thread, seconds since start) marks from the UI and browser threads."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._marks = []
+
+    def mark(self, label):
+        """Record that a startup phase finished now."""
+        elapsed = time.perf_counter() - self._start
+        with self._lock:
+            self._marks.append((label, threading.current_thread().name, elapsed))
+
+    def elapsed(self, label):
+        """Seconds from start to the first mark with this label (None if not reached)."""
+        with self._lock:
+            for name, _thread, seconds in self._marks:
+                if name == label:
+                    return seconds
+        return None
+
+    def report(self, title='STARTUP'):
+        """Return printable lines: each mark with its offset and the delta from the previous mark."""
+        with self._lock:
+            marks = sorted(self._marks, key=lambda m: m[2])
+        if not marks:
+            return [f'[{title}] (no startup marks recorded)']
+        lines = [f'[{title}] {"phase":<28} {"thread":<14} {"at":>9} {"delta":>9}']
+        previous = 0.0
+        for label, thread, seconds in marks:
+            lines.append(f'[{title}] {label:<28} {thread[:14]:<14} '
+                         f'{seconds * 1000:7.0f}ms {(seconds - previous) * 1000:7.0f}ms')
+            previous = seconds
+        return lines
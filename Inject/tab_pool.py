@@ -0,0 +1,378 @@
+"""Tab pool - apply batch edits on several tabs of the tagger's Chrome at once, with work stealing
+
+Playwright's sync API is bound to the thread that started it, so each tab
+runs its own driver on its own thread and connects to the running Chrome
+over CDP (like read_lane.py). Tabs are opened in the default context, which
+is the persistent tagger profile, so they share its login.
+"""
+import collections
+import queue
+import threading
+import time
+
+from cdp_fast_path import CDPFastPath
+from description_edit import plan_edit, normalize, utf16_offset
+from photo_ids import photo_id_from_url, photo_url
+import textarea_registry
+from textarea_registry import ACTIVE_DESCRIPTION_EXPR
+import throttle_guard
+
+
+WINDOW = 20              # recent records per tab used for error rate / slowdown
+SHRINK_ERROR_RATE = 0.3  # retire a tab when this share of its recent records failed
+SHRINK_SLOWDOWN = 2.0    # ... or when its recent p50 is this many times the best p50 seen
+SHRINK_COOLDOWN = 30.0   # seconds between two shrinks
+MAX_ATTEMPTS = 2         # a failed record is retried once, on whichever tab takes it
+
+
+class TabStats:
+    """Throughput, error rate and recent latency of one tab."""
+
+    def __init__(self, index):
+        self.index = index
+        self.done = 0
+        self.errors = 0
+        self.recent = collections.deque(maxlen=WINDOW)  # (seconds, ok)
+        self.started = time.perf_counter()
+        self.stopped = None
+        self.retired = None  # reason
+
+    def record(self, seconds, ok):
+        """Called by the tab's worker under the pool lock (the runner reads `recent` under it too)."""
+        self.done += 1
+        self.errors += 0 if ok else 1
+        self.recent.append((seconds, ok))
+
+    def error_rate(self, recent=None):
+        recent = self.recent if recent is None else recent
+        return sum(1 for _s, ok in recent if not ok) / len(recent) if recent else 0.0
+
+    def p50(self, recent=None):
+        times = sorted(s for s, _ok in (self.recent if recent is None else recent))
+        return times[len(times) // 2] if times else None
+
+    def rate(self):
+        """Records per minute while the tab was running."""
+        minutes = ((self.stopped or time.perf_counter()) - self.started) / 60
+        return self.done / minutes if minutes > 0 else 0.0
+
+
+class TabEditor:
+    """One tab on its own Playwright driver; applies edits with the CDP fast path."""
+
+    def __init__(self, endpoint, index, catalog=None, journal=None):
+        self.endpoint = endpoint
+        self.index = index
+        self.catalog = catalog
+        self.journal = journal
+        self._playwright = None
+        self._browser = None
+        self.page = None
+        self._fast = None
+        self._guard = None
+
+    def open(self):
+        from playwright.sync_api import sync_playwright
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.connect_over_cdp(self.endpoint)
+        self.page = self._browser.contexts[0].new_page()
+        # Background tabs are throttled and unfocused; pin this one active so inserts land
+        self._guard = throttle_guard.attach(self.page)
+        self._fast = CDPFastPath(self.page)
+        if not self._fast.attach():
+            raise RuntimeError('CDP session unavailable')
+
+    def close(self):
+        for step in (lambda: self._fast and self._fast.detach(),
+                     lambda: self._guard and self._guard.detach(),
+                     lambda: self.page and self.page.close(),
+                     lambda: self._browser and self._browser.close(),  # disconnect only
+                     lambda: self._playwright and self._playwright.stop()):
+            try:
+                step()
+            except Exception:
+                pass
+
+    def load(self, photo):
+        url = photo if '://' in photo else photo_url(photo)
+        target = photo_id_from_url(url)
+        if not target:
+            raise ValueError(f'not a photo ID or URL: {photo!r}')
+        if photo_id_from_url(self.page.url) == target:
+            return
+        response = self.page.goto(url, wait_until='domcontentloaded')
+        if response is not None and response.status >= 400:
+            raise RuntimeError(f'HTTP {response.status} loading {url}')
+        self._fast.invalidate()
+        textarea_registry.install(self.page)
+        self.page.wait_for_function('() => !!(' + ACTIVE_DESCRIPTION_EXPR + ')', timeout=15000)
+
+    def apply(self, photo, op, text=None, verify=False):
+        """Apply one edit. Returns the same dict as BrowserController.apply_edit()."""
+        start = time.perf_counter()
+        text = text or ''
+        try:
+            self.load(photo)
+        except Exception as e:
+            return {'status': 'error', 'error': f'could not load photo: {e}'}
+        current = self._fast.position_cursor_at_end()
+        if current is None:
+            return {'status': 'error', 'error': 'description textarea not found'}
+        if op == 'append':
+            desired = current + text
+        elif op in ('set', 'ensure'):
+            desired = text
+        elif op == 'delete_all':
+            desired = ''
+        elif op == 'remove_name' and self.catalog:
+            desired, removed = self.catalog.refresh().remove(current, text or None)
+            if removed is None:
+                return {'status': 'skipped', 'before': current, 'after': current,
+                        'error': f'{text!r} is not in the description' if text else 'nothing to remove'}
+        else:
+            return {'status': 'error', 'error': f'unknown op {op!r}'}
+        kind, offset, insert = plan_edit(current, desired)
+        if kind == 'none':
+            return {'status': 'skipped' if op == 'ensure' else 'ok', 'edit': kind,
+                    'before': current, 'after': current}
+        if kind == 'append':
+            written = self._fast.append_text(insert)
+        else:
+            written = self._fast.replace_text(insert, utf16_offset(current, offset))
+        if written is None:
+            return {'status': 'error', 'edit': kind, 'before': current, 'error': 'CDP edit failed'}
+        # Partial replaces are always read back: the selection is the one step that can land wrong
+        after = self._fast.read_description() if verify or kind == 'suffix' else desired
+        if self.journal:
+            self.journal.record(self.page.url, op, current, after, time.perf_counter() - start,
+                                text=text, path=f'tab{self.index}')
+        if normalize(after) != normalize(desired):
+            return {'status': 'error', 'edit': kind, 'before': current, 'after': after,
+                    'error': f'description is {after!r}, expected {desired!r}'}
+        return {'status': 'ok', 'edit': kind, 'before': current, 'after': after}
+
+
+class TabPool:
+    """N tabs, one worker thread and one deque each; idle tabs steal from the longest deque."""
+
+    def __init__(self, endpoint, tabs=4, catalog=None, journal=None, verify=False, min_tabs=1, backlog=8):
+        """Args:
+            endpoint: DevTools HTTP endpoint of the running tagger Chrome
+            tabs: Tabs to open
+            catalog / journal: NameCatalog for remove_name, EditJournal for the edits (optional)
+            verify: Read every description back after editing it
+            min_tabs: Never shrink below this
+            backlog: Records queued per active tab ahead of the workers
+        """
+        self.endpoint = endpoint
+        self.tabs = tabs
+        self.catalog = catalog
+        self.journal = journal
+        self.verify = verify
+        self.min_tabs = min_tabs
+        self.backlog = backlog
+        self.stats = [TabStats(i) for i in range(tabs)]
+        self._deques = [collections.deque() for _ in range(tabs)]
+        self._active = [False] * tabs
+        self._cond = threading.Condition()
+        self._results = queue.Queue()
+        self._feeding = True
+        self._stop = False
+        self._threads = []
+        self._opened = threading.Semaphore(0)
+        self._best_p50 = None
+        self._last_shrink = 0.0
+        self.steals = 0
+        self.retries = 0
+
+    # ---- caller side --------------------------------------------------------
+
+    def run(self, records, on_result, progress=None):
+        """Apply every (key, record) and call on_result(key, record, result) on this thread.
+
+        Records are {'photo', 'op', 'text'} dicts, as in batch manifests.
+        """
+        for i in range(self.tabs):
+            t = threading.Thread(target=self._worker, args=(i,), daemon=True, name=f'tab-{i}')
+            t.start()
+            self._threads.append(t)
+        for _ in range(self.tabs):
+            self._opened.acquire()
+        if not any(self._active):
+            raise RuntimeError('no tab could be opened')
+        print(f'[POOL] {sum(self._active)} tabs open')
+
+        records = iter(records)
+        in_flight = 0
+        try:
+            while True:
+                with self._cond:
+                    room = self.backlog * max(1, sum(self._active)) - sum(len(d) for d in self._deques)
+                while room > 0 and self._feeding:
+                    item = next(records, None)
+                    if item is None:
+                        with self._cond:
+                            self._feeding = False
+                            self._cond.notify_all()
+                        break
+                    key, record = item
+                    self._push((key, record, 0))
+                    in_flight += 1
+                    room -= 1
+                if not self._feeding and in_flight == 0:
+                    break
+                if not any(self._active):
+                    raise RuntimeError('all tabs have failed')
+                try:
+                    key, record, result = self._results.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                in_flight -= 1
+                on_result(key, record, result)
+                self._maybe_shrink()
+                if progress:
+                    progress()
+        finally:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            for t in self._threads:
+                t.join(timeout=60)
+            # Edits finished after an interrupt still get recorded, so a resume does not redo them
+            while True:
+                try:
+                    key, record, result = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                on_result(key, record, result)
+
+    def _push(self, item):
+        """Queue on the active tab with the shortest deque."""
+        with self._cond:
+            active = [i for i in range(self.tabs) if self._active[i]]
+            target = min(active, key=lambda i: len(self._deques[i])) if active else 0
+            self._deques[target].append(item)
+            self._cond.notify_all()
+
+    def _maybe_shrink(self):
+        now = time.perf_counter()
+        # Snapshot under the lock: tab workers append to `recent` while this runs
+        with self._cond:
+            active = [s for s in self.stats if self._active[s.index]]
+            recent = {s.index: list(s.recent) for s in active}
+        full = [s for s in active if len(recent[s.index]) == WINDOW]
+        for s in full:
+            p50 = s.p50(recent[s.index])
+            if self._best_p50 is None or p50 < self._best_p50:
+                self._best_p50 = p50
+        if len(active) <= self.min_tabs or not full or now - self._last_shrink < SHRINK_COOLDOWN:
+            return
+        worst = max(full, key=lambda s: (s.error_rate(recent[s.index]), s.p50(recent[s.index])))
+        error_rate, p50 = worst.error_rate(recent[worst.index]), worst.p50(recent[worst.index])
+        reason = None
+        if error_rate > SHRINK_ERROR_RATE:
+            reason = f'{error_rate:.0%} of its last {WINDOW} records failed'
+        elif self._best_p50 and p50 > SHRINK_SLOWDOWN * self._best_p50:
+            reason = f'p50 {p50 * 1000:.0f} ms vs best {self._best_p50 * 1000:.0f} ms'
+        if reason:
+            self._last_shrink = now
+            self._retire(worst.index, reason)
+
+    def _retire(self, index, reason):
+        with self._cond:
+            self._active[index] = False
+            self.stats[index].retired = reason
+            leftovers = list(self._deques[index])
+            self._deques[index].clear()
+            self._cond.notify_all()
+        print(f'[POOL] Shrinking to {sum(self._active)} tabs: tab {index} {reason}')
+        for item in leftovers:
+            self._push(item)
+
+    # ---- tab workers ------------------------------------------------------------
+
+    def _take(self, index):
+        """Next item for tab `index`: its own deque first, else the back of the longest one."""
+        with self._cond:
+            while True:
+                if self._stop or not self._active[index]:
+                    return None
+                if self._deques[index]:
+                    return self._deques[index].popleft()
+                victim = max(range(self.tabs), key=lambda i: len(self._deques[i]))
+                if self._deques[victim]:
+                    self.steals += 1
+                    return self._deques[victim].pop()
+                if not self._feeding:
+                    return None
+                self._cond.wait(0.5)
+
+    def _worker(self, index):
+        editor = TabEditor(self.endpoint, index, self.catalog, self.journal)
+        stats = self.stats[index]
+        try:
+            editor.open()
+            with self._cond:
+                self._active[index] = True
+        except Exception as e:
+            print(f'[POOL] tab {index} could not open: {e}')
+            stats.retired = f'failed to open: {e}'
+        finally:
+            self._opened.release()
+        try:
+            while True:
+                item = self._take(index)
+                if item is None:
+                    break
+                key, record, attempt = item
+                start = time.perf_counter()
+                try:
+                    result = editor.apply(record['photo'], record['op'], record.get('text'), self.verify)
+                except Exception as e:
+                    result = {'status': 'error', 'error': str(e)}
+                seconds = time.perf_counter() - start
+                ok = result.get('status') != 'error'
+                with self._cond:
+                    stats.record(seconds, ok)
+                result = dict(result, tab=index, attempt=attempt + 1, seconds=seconds)
+                if not ok and attempt + 1 < MAX_ATTEMPTS and not str(result.get('error', '')).startswith('unknown op'):
+                    with self._cond:
+                        self.retries += 1
+                    self._push((key, record, attempt + 1))
+                    continue
+                self._results.put((key, record, result))
+        finally:
+            stats.stopped = time.perf_counter()
+            with self._cond:
+                self._active[index] = False
+                leftovers = list(self._deques[index])
+                self._deques[index].clear()
+                self._cond.notify_all()
+            for item in leftovers:
+                self._push(item)
+            editor.close()
+
+    # ---- reporting ----------------------------------------------------------------
+
+    def report(self):
+        """Printable per-tab throughput, error rate and latency, and the combined rate."""
+        lines = []
+        for s in self.stats:
+            with self._cond:
+                p50 = s.p50(list(s.recent))
+            rate = s.rate()
+            line = (f'[POOL] tab {s.index}: {s.done} records, {s.errors} errors '
+                    f'({s.errors / s.done if s.done else 0:.1%}), '
+                    f'recent p50 {p50 * 1000 if p50 else 0:.0f} ms, {rate:.1f} photos/min')
+            if s.retired:
+                line += f', retired ({s.retired})'
+            lines.append(line)
+        used = [s for s in self.stats if s.done]
+        if used:
+            minutes = (max(s.stopped or time.perf_counter() for s in used) - min(s.started for s in used)) / 60
+            total = sum(s.done for s in used)
+            rate = total / minutes if minutes > 0 else 0.0
+            lines.append(f'[POOL] Combined {rate:.1f} photos/min on {len(used)} tabs '
+                         f'({rate / len(used):.1f} per tab; compare with a --tabs 1 run), '
+                         f'{self.steals} steals, {self.retries} retries')
+        return lines
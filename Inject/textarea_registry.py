@@ -0,0 +1,234 @@
+"""Textarea registry - in-page tracker of the visible slide's Description textarea"""
+
+
+# Installed as an init script (every document) and evaluated once on the live
+# page. Google Photos keeps one Description textarea per preloaded slide; the
+# registry tracks them incrementally with a MutationObserver and only re-picks
+# the visible one (the only step that reads layout) after a relevant mutation
+# or a URL change. A clean lookup is a field read with no forced reflow.
+REGISTRY_INSTALL_JS = r"""(() => {
+    if (window.__gpDescRegistry) return;
+    const SELECTOR = 'textarea[aria-label="Description"]';
+
+    function isElementVisuallyHidden(element) {
+        let current = element;
+        while (current && current.tagName !== 'BODY') {
+            if (current.getAttribute('aria-hidden') === 'true') {
+                return true;
+            }
+            const style = current.getAttribute('style') || '';
+            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
+                return true;
+            }
+            current = current.parentElement;
+        }
+        return false;
+    }
+
+    const reg = {
+        textareas: new Set(),
+        active: null,
+        url: null,
+        dirty: true,
+        rebuilds: 0,
+        hits: 0,
+        misses: 0,
+        empty: 0,
+        lastRebuildMs: 0,
+        selectors: [SELECTOR],
+        selectorStats: {},
+    };
+
+    function anySelector() {
+        return reg.selectors.join(', ');
+    }
+
+    function track(node) {
+        if (!node || node.nodeType !== 1) return;
+        const selector = anySelector();
+        if (node.matches(selector)) {
+            reg.textareas.add(node);
+            reg.dirty = true;
+        }
+        if (node.firstElementChild) {
+            for (const ta of node.querySelectorAll(selector)) {
+                reg.textareas.add(ta);
+                reg.dirty = true;
+            }
+        }
+    }
+
+    function untrack(node) {
+        if (!node || node.nodeType !== 1) return;
+        for (const ta of reg.textareas) {
+            if (ta === node || node.contains(ta)) {
+                reg.textareas.delete(ta);
+                if (ta === reg.active) reg.dirty = true;
+            }
+        }
+    }
+
+    function onMutations(mutations) {
+        for (const m of mutations) {
+            if (m.type === 'childList') {
+                m.addedNodes.forEach(track);
+                m.removedNodes.forEach(untrack);
+            } else if (!reg.dirty) {
+                // aria-hidden / style flip on an ancestor changes which slide is visible
+                for (const ta of reg.textareas) {
+                    if (m.target === ta || m.target.contains(ta)) {
+                        reg.dirty = true;
+                        break;
+                    }
+                }
+            }
+        }
+    }
+
+    reg.rebuild = function () {
+        const t0 = performance.now();
+        reg.rebuilds++;
+        // Seed from the DOM if nodes arrived before the observer started
+        if (reg.textareas.size === 0) {
+            for (const ta of document.querySelectorAll(anySelector())) reg.textareas.add(ta);
+        }
+        for (const ta of reg.textareas) {
+            if (!ta.isConnected) reg.textareas.delete(ta);
+        }
+        reg.active = null;
+        // Selectors in profile order; the first one with a visible match wins
+        for (const selector of reg.selectors) {
+            const s0 = performance.now();
+            for (const ta of reg.textareas) {
+                if (ta.matches(selector) && ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
+                    reg.active = ta;
+                    break;
+                }
+            }
+            const st = reg.selectorStats[selector] || (reg.selectorStats[selector] = {tries: 0, hits: 0, ms: 0});
+            st.tries++;
+            if (reg.active) st.hits++;
+            st.ms += performance.now() - s0;
+            if (reg.active) break;
+        }
+        reg.url = location.href;
+        reg.dirty = false;
+        reg.lastRebuildMs = performance.now() - t0;
+        if (!reg.active) reg.empty++;
+        return reg.active;
+    };
+
+    reg.get = function () {
+        if (!reg.dirty && reg.url === location.href && reg.active && reg.active.isConnected) {
+            reg.hits++;
+            return reg.active;
+        }
+        reg.misses++;
+        return reg.rebuild();
+    };
+
+    reg.invalidate = function () { reg.dirty = true; };
+
+    reg.setSelectors = function (selectors) {
+        if (!selectors || !selectors.length) return;
+        const changedSet = selectors.slice().sort().join('|') !== reg.selectors.slice().sort().join('|');
+        reg.selectors = selectors.slice();
+        if (changedSet) reg.textareas.clear();
+        reg.dirty = true;
+    };
+
+    reg.stats = function () {
+        const lookups = reg.hits + reg.misses;
+        return {
+            rebuilds: reg.rebuilds,
+            hits: reg.hits,
+            misses: reg.misses,
+            emptyRebuilds: reg.empty,
+            missRate: lookups ? reg.misses / lookups : 0,
+            tracked: reg.textareas.size,
+            lastRebuildMs: reg.lastRebuildMs,
+            selectors: reg.selectors,
+            selectorStats: reg.selectorStats,
+        };
+    };
+
+    new MutationObserver(onMutations).observe(document, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        attributeFilter: ['aria-hidden', 'style', 'aria-label'],
+    });
+    for (const method of ['pushState', 'replaceState']) {
+        const original = history[method];
+        history[method] = function () {
+            reg.dirty = true;
+            return original.apply(this, arguments);
+        };
+    }
+    window.addEventListener('popstate', () => { reg.dirty = true; });
+
+    window.__gpDescRegistry = reg;
+})()"""
+
+REGISTRY_STATS_JS = "() => window.__gpDescRegistry ? window.__gpDescRegistry.stats() : null"
+
+REGISTRY_SET_SELECTORS_JS = "(selectors) => { if (window.__gpDescRegistry) window.__gpDescRegistry.setSelectors(selectors); }"
+
+# Expression yielding the active Description textarea element (or null).
+# Uses the registry when present; isolated worlds (read lane) cannot see page
+# globals and fall back to the full scan.
+ACTIVE_DESCRIPTION_EXPR = """(window.__gpDescRegistry ? window.__gpDescRegistry.get() : (() => {
+    function isElementVisuallyHidden(element) {
+        let current = element;
+        while (current && current.tagName !== 'BODY') {
+            if (current.getAttribute('aria-hidden') === 'true') {
+                return true;
+            }
+            const style = current.getAttribute('style') || '';
+            if (style.toLowerCase().includes('display: none') || style.toLowerCase().includes('display:none')) {
+                return true;
+            }
+            current = current.parentElement;
+        }
+        return false;
+    }
+    const textareas = document.querySelectorAll('textarea[aria-label="Description"]');
+    for (const ta of textareas) {
+        if (ta.offsetHeight > 0 && !isElementVisuallyHidden(ta)) {
+            return ta;
+        }
+    }
+    return null;
+})())"""
+
+
+def install_init_script(context):
+    """Install the registry into every future document of the context."""
+    try:
+        context.add_init_script(script=REGISTRY_INSTALL_JS)
+        return True
+    except Exception as e:
+        print(f'[REGISTRY] WARNING: could not add init script: {e}')
+        return False
+
+
+def install(page):
+    """Install the registry on the page's current document (no-op if already there)."""
+    try:
+        page.evaluate(REGISTRY_INSTALL_JS)
+        print('[REGISTRY] Description textarea registry installed')
+        return True
+    except Exception as e:
+        print(f'[REGISTRY] WARNING: could not install registry, using full scans: {e}')
+        return False
+
+
+def format_stats(stats):
+    """Return printable lines for a registry stats dict."""
+    if not stats:
+        return ['[REGISTRY] (registry not installed on this page)']
+    return [
+        f'[REGISTRY] Lookups: {stats["hits"] + stats["misses"]} (hits={stats["hits"]}, misses={stats["misses"]}, miss rate={stats["missRate"]:.1%})',
+        f'[REGISTRY] Rebuilds: {stats["rebuilds"]} (found nothing: {stats["emptyRebuilds"]}, last took {stats["lastRebuildMs"]:.2f} ms)',
+        f'[REGISTRY] Tracked textareas: {stats["tracked"]} (selectors in order: {stats["selectors"]})',
+    ]
@@ -0,0 +1,89 @@
+"""Throttle guard - keep Chrome running at full speed while the Tk window has focus"""
+
+
+# Chrome flags that stop background/occluded-window throttling. Playwright's
+# defaults already carry some of these for bundled Chromium; they are repeated
+# here so the profile holds for channel='chrome' and for attached browsers.
+# (--disable-features is deliberately not used: Chrome keeps only the last
+# occurrence and would drop Playwright's own --disable-features list.)
+ANTI_THROTTLE_ARGS = [
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+# Awaitable probe: page visibility/focus plus measured timer and frame lag.
+# A 10 ms timeout that takes ~1 s, or rAF that never fires, means throttled.
+THROTTLE_PROBE_EXPR = """(async () => {
+    const t0 = performance.now();
+    await new Promise(r => setTimeout(r, 10));
+    const timerLag = performance.now() - t0 - 10;
+    const t1 = performance.now();
+    const rafFired = await Promise.race([
+        new Promise(r => requestAnimationFrame(() => r(true))),
+        new Promise(r => setTimeout(() => r(false), 250)),
+    ]);
+    return {
+        visibilityState: document.visibilityState,
+        hasFocus: document.hasFocus(),
+        timerLagMs: timerLag,
+        rafMs: rafFired ? performance.now() - t1 : null,
+    };
+})()"""
+
+
+def launch_args():
+    """Extra Chrome command-line flags for the anti-throttling profile."""
+    return list(ANTI_THROTTLE_ARGS)
+
+
+def attach(page):
+    """Open a CDP session that keeps the page 'focused' and active. Returns the session or None.
+
+    The session must stay open: focus emulation ends when it detaches.
+    """
+    try:
+        session = page.context.new_cdp_session(page)
+        session.send('Emulation.setFocusEmulationEnabled', {'enabled': True})
+        session.send('Page.enable')
+        session.send('Page.setWebLifecycleState', {'state': 'active'})
+        print('[THROTTLE] Focus emulation on, page lifecycle pinned to active')
+        return session
+    except Exception as e:
+        print(f'[THROTTLE] WARNING: could not pin page active: {e}')
+        return None
+
+
+def probe(page, session=None):
+    """Return throttle status dict ({visibilityState, hasFocus, timerLagMs, rafMs, throttled})."""
+    if session:
+        resp = session.send('Runtime.evaluate', {
+            'expression': THROTTLE_PROBE_EXPR,
+            'awaitPromise': True,
+            'returnByValue': True,
+        })
+        return classify(resp.get('result', {}).get('value'), 'cdp')
+    return classify(page.evaluate(THROTTLE_PROBE_EXPR), 'page')
+
+
+def classify(status, source):
+    """Add the 'throttled' verdict and probe source to a raw THROTTLE_PROBE_EXPR result."""
+    status = dict(status or {})
+    status['source'] = source
+    status['throttled'] = (status.get('visibilityState') != 'visible'
+                           or status.get('timerLagMs', 0) > 100
+                           or status.get('rafMs') is None)
+    return status
+
+
+def format_status(status):
+    """Return printable lines for a probe() result."""
+    if not status:
+        return ['[THROTTLE] (status unavailable)']
+    raf = f'{status["rafMs"]:.1f} ms' if status.get('rafMs') is not None else 'did not fire'
+    verdict = 'THROTTLED' if status.get('throttled') else 'running at full speed'
+    return [
+        f'[THROTTLE] Page is {verdict} (via {status.get("source")})',
+        f'[THROTTLE]   visibilityState={status.get("visibilityState")}, hasFocus={status.get("hasFocus")}',
+        f'[THROTTLE]   timer lag={status.get("timerLagMs", 0):.1f} ms, animation frame={raf}',
+    ]
@@ -0,0 +1,266 @@
+"""Tmpfs profile - run Chrome from a RAM copy of the profile and sync it back to disk"""
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+
+TMPFS_ROOT = '/dev/shm'
+SYNC_INTERVAL = 300  # seconds between periodic sync-backs while Chrome runs
+
+# Never copied in either direction: locks/ports belong to the running Chrome
+EXCLUDE = ['Singleton*', 'DevToolsActivePort', '.tmpfs-*']
+# Skipped by periodic syncs (Chrome rebuilds them); the sync after Chrome closes copies them
+CACHE_DIRS = ['Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache', 'DawnCache']
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+SQLITE_SIDE_FILES = ('-journal', '-wal', '-shm')
+
+SYNC_COMPLETE = '.tmpfs-sync-complete'
+
+
+class TmpfsProfile:
+    """Copies the profile to tmpfs at startup and syncs it back periodically and once Chrome has closed.
+
+    Chrome's SQLite and LevelDB files are only consistent while no Chrome is
+    writing them. Periodic syncs therefore take those from the last complete
+    disk copy and only bring the rest (preferences, bookmarks, extension files)
+    up to date; the sync after Chrome closes copies everything. A run that ends
+    without stop() (crash, --keep-browser) leaves the tmpfs copy behind and the
+    next prepare() syncs it back before copying it out again.
+
+    Sync-back never writes into the on-disk profile in place: it builds
+    `<profile>.syncing` as a full copy (no hard links: Chrome rewrites its
+    databases in place, and a run without --tmpfs-profile would change both
+    copies), marks it complete, then swaps it in with two renames. The previous
+    profile is kept as `<profile>.last-good`, so a crash at any point leaves at
+    least one complete copy for prepare() to recover.
+    """
+
+    def __init__(self, source, tmp_root=TMPFS_ROOT):
+        self.source = os.path.abspath(source)
+        self.runtime_dir = os.path.join(tmp_root, f'{os.path.basename(self.source)}-{os.getuid()}')
+        self.staging = self.source + '.syncing'
+        self.last_good = self.source + '.last-good'
+        self._rsync = shutil.which('rsync')
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.sync_interval = SYNC_INTERVAL
+        self.syncs = 0
+        self.last_sync_seconds = None
+
+    @staticmethod
+    def available(tmp_root=TMPFS_ROOT):
+        return hasattr(os, 'getuid') and os.path.isdir(tmp_root) and os.access(tmp_root, os.W_OK)
+
+    # ---- startup ------------------------------------------------------------
+
+    def prepare(self):
+        """Recover from interrupted syncs, copy the profile to tmpfs and return the runtime dir."""
+        start = time.perf_counter()
+        self._recover()
+        if os.path.isdir(self.runtime_dir):
+            # Left by a run that never reached stop(): it holds newer state than the disk copy
+            print(f'[TMPFS] Found unsynced profile in {self.runtime_dir}, syncing it back first')
+            self.sync_back()
+        os.makedirs(self.source, exist_ok=True)
+        self._copy(self.source, self.runtime_dir, delete=True)
+        print(f'[TMPFS] Profile copied to {self.runtime_dir} in {time.perf_counter() - start:.2f} s '
+              f'({_tree_size(self.runtime_dir) / 1e6:.0f} MB)')
+        return self.runtime_dir
+
+    def _recover(self):
+        """Put a complete profile back in place after a crash during sync_back()."""
+        if os.path.isdir(self.source):
+            if os.path.isdir(self.staging):
+                shutil.rmtree(self.staging, ignore_errors=True)
+            return
+        if os.path.exists(os.path.join(self.staging, SYNC_COMPLETE)):
+            print('[TMPFS] Recovering profile from a completed but unswapped sync')
+            os.rename(self.staging, self.source)
+        elif os.path.isdir(self.last_good):
+            print(f'[TMPFS] Recovering profile from last-good copy {self.last_good}')
+            shutil.rmtree(self.staging, ignore_errors=True)
+            os.rename(self.last_good, self.source)
+
+    # ---- sync-back ----------------------------------------------------------
+
+    def start_periodic_sync(self, interval=None):
+        """Sync back every `interval` seconds while Chrome runs (live databases excluded)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self.sync_interval = interval or self.sync_interval
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sync_loop, daemon=True, name='tmpfs-sync')
+        self._thread.start()
+
+    def stop_periodic_sync(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=60)
+            self._thread = None
+
+    def _sync_loop(self):
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync_back(live=True)
+            except Exception as e:
+                print(f'[TMPFS] Periodic sync failed (last-good copy kept): {e}')
+
+    def sync_back(self, live=False):
+        """Copy the tmpfs profile back to disk atomically.
+
+        live=True while Chrome is running: its SQLite/LevelDB files (and caches) keep
+        the version from the current disk copy. Otherwise Chrome must be closed.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            shutil.rmtree(self.staging, ignore_errors=True)
+            if live:
+                skipped = _live_databases(self.runtime_dir)
+                if os.path.isdir(self.source):
+                    self._copy(self.source, self.staging, copy_dest=self.source)
+                self._copy(self.runtime_dir, self.staging, copy_dest=self.source,
+                           exclude=EXCLUDE + CACHE_DIRS + ['/' + path for path in skipped])
+            else:
+                self._copy(self.runtime_dir, self.staging, copy_dest=self.source)
+            with open(os.path.join(self.staging, SYNC_COMPLETE), 'w') as f:
+                f.write(time.strftime('%Y-%m-%d %H:%M:%S'))
+            shutil.rmtree(self.last_good, ignore_errors=True)
+            if os.path.isdir(self.source):
+                os.rename(self.source, self.last_good)
+            os.rename(self.staging, self.source)
+            os.remove(os.path.join(self.source, SYNC_COMPLETE))
+            self.syncs += 1
+            self.last_sync_seconds = time.perf_counter() - start
+            detail = f' ({len(skipped)} live databases kept from the last copy)' if live else ''
+            print(f'[TMPFS] Synced profile back to disk in {self.last_sync_seconds:.2f} s{detail}')
+
+    def stop(self):
+        """Stop periodic syncs, sync back (Chrome must be closed) and free the tmpfs copy."""
+        self.stop_periodic_sync()
+        try:
+            self.sync_back()
+        except Exception as e:
+            print(f'[TMPFS] ERROR: final sync failed, tmpfs copy kept in {self.runtime_dir}: {e}')
+            return False
+        shutil.rmtree(self.runtime_dir, ignore_errors=True)
+        return True
+
+    # ---- copying ------------------------------------------------------------
+
+    def _copy(self, src, dst, delete=False, exclude=EXCLUDE, copy_dest=None):
+        """rsync src/ to dst/ (shutil fallback without rsync).
+
+        Patterns starting with '/' are paths relative to src; others match names anywhere.
+        """
+        if self._rsync:
+            cmd = [self._rsync, '-a']
+            if delete:
+                cmd.append('--delete')
+            if copy_dest and os.path.isdir(copy_dest) and os.path.abspath(copy_dest) != os.path.abspath(src):
+                # Unchanged files are copied locally from the disk copy (real copies, never hard links)
+                cmd.append(f'--copy-dest={copy_dest}')
+            for pattern in exclude or []:
+                cmd += ['--exclude', pattern]
+            subprocess.run(cmd + [src.rstrip('/') + '/', dst.rstrip('/') + '/'], check=True,
+                           stdout=subprocess.DEVNULL)
+            return
+        if delete:
+            shutil.rmtree(dst, ignore_errors=True)
+        names = [p for p in exclude or [] if not p.startswith('/')]
+        paths = {os.path.join(src, p.lstrip('/')) for p in exclude or [] if p.startswith('/')}
+        by_name = shutil.ignore_patterns(*names)
+
+        def ignore(directory, entries):
+            return set(by_name(directory, entries)) | {e for e in entries if os.path.join(directory, e) in paths}
+
+        shutil.copytree(src, dst, dirs_exist_ok=True, symlinks=True, ignore=ignore)
+
+
+def _live_databases(root):
+    """Paths (relative to root) of the SQLite files and LevelDB directories Chrome writes while running."""
+    found = []
+    for directory, dirs, files in os.walk(root):
+        rel = os.path.relpath(directory, root)
+        if 'CURRENT' in files and any(name.startswith('MANIFEST-') for name in files):
+            found.append(rel)  # LevelDB: the directory is one database
+            dirs[:] = []
+            continue
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                with open(path, 'rb') as f:
+                    is_sqlite = f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+            except OSError:
+                continue
+            if is_sqlite:
+                found.append(os.path.normpath(os.path.join(rel, name)))
+                found += [os.path.normpath(os.path.join(rel, name + side)) for side in SQLITE_SIDE_FILES
+                          if name + side in files]
+    return found
+
+
+def _tree_size(path):
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+# ---- I/O measurement (Linux /proc) -----------------------------------------
+
+def _chrome_pids(user_data_dir):
+    """Pids of the Chrome started on `user_data_dir` and all of its descendants."""
+    flag = f'--user-data-dir={user_data_dir}'.encode()
+    parents = {}
+    roots = set()
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                ppid = int(f.read().rsplit(b')', 1)[1].split()[1])
+            parents[int(entry)] = ppid
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                if flag in f.read().split(b'\0'):
+                    roots.add(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+    pids = set(roots)
+    changed = True
+    while changed:
+        changed = False
+        for pid, ppid in parents.items():
+            if ppid in pids and pid not in pids:
+                pids.add(pid)
+                changed = True
+    return pids
+
+
+def profile_io(user_data_dir):
+    """Return {'read_bytes', 'write_bytes', 'processes'} of block-device I/O by Chrome on this profile.
+
+    Writes that land on tmpfs never reach a block device and are not counted.
+    None when /proc/<pid>/io is unavailable (non-Linux).
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    totals = {'read_bytes': 0, 'write_bytes': 0, 'processes': 0}
+    for pid in _chrome_pids(user_data_dir):
+        try:
+            with open(f'/proc/{pid}/io') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    if key in ('read_bytes', 'write_bytes'):
+                        totals[key] += int(value)
+            totals['processes'] += 1
+        except (OSError, ValueError):
+            continue
+    return totals
@@ -1,19 +1,27 @@
 """UI components - extracted from inject_v3.py"""
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 import threading
 import re
+import time
+
+
+def _messagebox():
+    """Import tkinter.messagebox on first use; it is not needed to get the window up."""
+    from tkinter import messagebox
+    return messagebox
 
 
 class AssistantUI:
     """Minimal UI for Google Photos tagger."""
     
-    def __init__(self, root, browser_controller, keystroke_handler, debug_mode=False):
+    def __init__(self, root, browser_controller, keystroke_handler, debug_mode=False, startup_timer=None):
         print('[UI] Initializing...')
         self.root = root
         self.browser = browser_controller
         self.keystroke = keystroke_handler
         self.debug_mode = debug_mode
+        self.startup_timer = startup_timer
         
         root.title('Google Photos Tagger - Old Device Mode')
         
@@ -62,9 +70,12 @@ class AssistantUI:
         self.reload_btn = ttk.Button(nav_frame, text='↻', command=self.reload_names, 
                                      state='disabled')
         self.reload_btn.grid(row=0, column=5, sticky='ew', padx=1)
+
+        self.ff_btn = ttk.Button(nav_frame, text='⏭', command=self.fast_forward, state='disabled')
+        self.ff_btn.grid(row=0, column=6, sticky='ew', padx=1)
         
         # Debug buttons (optional) - create only if debug_mode at init, otherwise create lazily
-        debug_col = 6
+        debug_col = 7
         if self.debug_mode:
             self.dump_btn = ttk.Button(self.nav_frame, text='DMP', command=self.dump_html, 
                                        state='disabled')
@@ -108,6 +119,19 @@ class AssistantUI:
                                           font=('Courier', 9), foreground='blue')
         self.keyboard_status.grid(row=4, column=0, columnspan=4, sticky='w', pady=(4, 0))
 
+        # Jump to a photo ID/URL or a date - row 5 (keys typed here stay out of the shortcuts)
+        jump_frame = ttk.Frame(main)
+        jump_frame.grid(row=5, column=0, columnspan=4, sticky='ew', pady=(4, 0))
+        ttk.Label(jump_frame, text='Jump to (photo ID/URL or date, e.g. 12/1/1998):').grid(row=0, column=0, padx=(0, 4))
+        self.jump_entry = ttk.Entry(jump_frame, width=32)
+        self.jump_entry.grid(row=0, column=1, sticky='ew')
+        self.jump_entry.bind('<Return>', lambda _e: self.jump_to())
+        self.jump_entry.bind('<Escape>', lambda _e: main.focus_set())
+        self.jump_btn = ttk.Button(jump_frame, text='Jump', command=self.jump_to, state='disabled')
+        self.jump_btn.grid(row=0, column=2, padx=(4, 0))
+        jump_frame.columnconfigure(1, weight=1)
+        self._main_frame = main
+
         # Bind keyboard events
         root.bind('<KeyPress>', self.on_key_press)
         main.bind('<KeyPress>', self.on_key_press)
@@ -124,7 +148,8 @@ class AssistantUI:
         main.focus_set()
         
         print(f'[UI] Registered {len(self.keystroke.get_all_shortcuts())} keyboard shortcuts')
-        print(f'[UI] Shortcuts: {list(self.keystroke.get_all_shortcuts().keys())}')
+        if self.debug_mode:
+            print(f'[UI] Shortcuts: {list(self.keystroke.get_all_shortcuts().keys())}')
         
         print('[UI] Starting poll loop')
         self.poll_browser_state()
@@ -169,6 +194,7 @@ class AssistantUI:
             btn = ttk.Button(self.shortcut_frame, text=label, 
                             command=(lambda p=pushed: self.add_name(p)), 
                             state='disabled' if not self.browser._running else 'normal')
+            btn.bind('<Button-3>', lambda _e, p=pushed: self.remove_name(p.strip()))  # right-click removes
             btn.grid(row=0, column=idx, sticky='ew', padx=1, pady=1)
             self.name_buttons.append(btn)
         
@@ -187,6 +213,7 @@ class AssistantUI:
             btn = ttk.Button(self.shortcut_frame, text=label, 
                             command=(lambda p=pushed: self.add_name(p)), 
                             state='disabled' if not self.browser._running else 'normal')
+            btn.bind('<Button-3>', lambda _e, p=pushed: self.remove_name(p.strip()))
             btn.grid(row=1, column=idx, sticky='ew', padx=1, pady=1)
             self.name_buttons.append(btn)
         
@@ -203,7 +230,7 @@ class AssistantUI:
             # Rebuild name buttons
             self._create_name_buttons()
             
-            messagebox.showinfo('Reload Complete', 
+            _messagebox().showinfo('Reload Complete', 
                               f'Reloaded {len(new_names)} names from names.json')
             print(f'[RELOAD] Successfully reloaded {len(new_names)} names')
             
@@ -211,7 +238,7 @@ class AssistantUI:
             print(f'[RELOAD] ERROR: {e}')
             import traceback
             traceback.print_exc()
-            messagebox.showerror('Reload Failed', f'Failed to reload names.json: {str(e)}')
+            _messagebox().showerror('Reload Failed', f'Failed to reload names.json: {str(e)}')
     
     def toggle_debug(self):
         """Toggle debug mode on/off and update UI accordingly."""
@@ -283,6 +310,8 @@ class AssistantUI:
 
     def on_key_press(self, event):
         """Handle keyboard shortcuts and natural typing."""
+        if event.widget is getattr(self, 'jump_entry', None):
+            return  # typing a jump target, not shortcuts
         # Extract keycode if available (from event.keysym_num on some systems)
         keycode = getattr(event, 'keysym_num', None)
         keysym = event.keysym
@@ -336,6 +365,14 @@ class AssistantUI:
                 self.delete_all_description()
             elif action_type == 'cursor_to_end':
                 self.position_cursor_at_end()
+            elif action_type == 'remove_last_name':
+                self.remove_name(None)
+            elif action_type == 'fast_forward':
+                self.fast_forward()
+            elif action_type == 'undo':
+                self.undo()
+            elif action_type == 'redo':
+                self.redo()
             elif action_type == 'tab_dennis':
                 self.add_name('Dennis ')
                 self.next_photo()
@@ -355,15 +392,18 @@ class AssistantUI:
                 
                 self.browser._launch_mode = mode
                 
+                # Joins a launch already started by inject.py instead of starting a second one
                 self.browser.start(headful=True)
                 print('[LAUNCH] Browser started')
+                if self.startup_timer:
+                    self.startup_timer.mark('browser ready')
                 self.root.after(0, self._on_browser_ready)
             except Exception as e:
                 print(f'[LAUNCH] ERROR: {e}')
                 import traceback
                 traceback.print_exc()
                 error_msg = str(e)
-                self.root.after(0, lambda msg=error_msg: messagebox.showerror('Error', msg))
+                self.root.after(0, lambda msg=error_msg: _messagebox().showerror('Error', msg))
 
         threading.Thread(target=_launch, daemon=True).start()
 
@@ -375,6 +415,8 @@ class AssistantUI:
         self.next_btn.config(state='normal')
         self.backspace_btn.config(state='normal')
         self.reload_btn.config(state='normal')
+        self.ff_btn.config(state='normal')
+        self.jump_btn.config(state='normal')
         if hasattr(self, 'read_btn'):
             self.read_btn.config(state='normal')
         if hasattr(self, 'dump_btn'):
@@ -394,12 +436,51 @@ class AssistantUI:
         self.keyboard_status.config(text='Keyboard: READY - Press ← → arrows for navigation, or name keys', 
                                      foreground='green')
         
-        messagebox.showinfo('Browser Ready', 'Browser launched. Please log into Google Photos if needed.\n\nKeyboard shortcuts are active!')
+        if self.startup_timer and self.debug_mode:
+            for line in self.startup_timer.report():
+                print(line)
+        
+        if not self._offer_resume():
+            _messagebox().showinfo('Browser Ready', 'Browser launched. Please log into Google Photos if needed.\n\nKeyboard shortcuts are active!')
+
+    def _offer_resume(self):
+        """Ask whether to go back to the last session's photo. Returns True if the question was shown."""
+        try:
+            info = self.browser.resume_info()
+        except Exception as e:
+            print(f'[RESUME] Could not read the last session checkpoint: {e}')
+            return False
+        if not info:
+            return False
+        saved = time.strftime('%Y-%m-%d %H:%M', time.localtime(info['saved'])) if info.get('saved') else 'unknown'
+        message = f'Go back to where the last session stopped?\n\nPhoto: {info["photo_id"]}\nSaved: {saved}'
+        if not info.get('clean'):
+            message += '\n\nThe last session did not shut down cleanly.'
+        if info.get('pending'):
+            message += (f'\n\n{info["pending"]} commands never ran; they will be replayed, '
+                        'skipping edits the description already shows.')
+        if _messagebox().askyesno('Resume Session', message):
+            self.browser.resume_session()
+        else:
+            self.browser.discard_resume()
+        return True
 
     def next_photo(self):
         """Go to next photo."""
         threading.Thread(target=self.browser.goto_next_photo, daemon=True).start()
 
+    def fast_forward(self):
+        """Skip ahead to the next photo with an empty description or a missing face name."""
+        threading.Thread(target=self.browser.fast_forward, daemon=True).start()
+
+    def jump_to(self):
+        """Go to the photo ID/URL or date typed in the jump field."""
+        target = self.jump_entry.get().strip()
+        if not target:
+            return
+        self._main_frame.focus_set()  # arrows and names work again right away
+        threading.Thread(target=lambda: self.browser.jump_to(target), daemon=True).start()
+
     def prev_photo(self):
         """Go to previous photo."""
         threading.Thread(target=self.browser.goto_prev_photo, daemon=True).start()
@@ -412,6 +493,20 @@ class AssistantUI:
         """Delete entire description."""
         threading.Thread(target=self.browser.delete_all_description, daemon=True).start()
 
+    def remove_name(self, name):
+        """Remove `name` (None = the last name) from the description in one edit."""
+        if name == '':
+            return  # empty number group button
+        threading.Thread(target=lambda: self.browser.remove_name(name), daemon=True).start()
+
+    def undo(self):
+        """Undo the last edit on this photo."""
+        threading.Thread(target=self.browser.undo, daemon=True).start()
+
+    def redo(self):
+        """Redo the last undone edit on this photo."""
+        threading.Thread(target=self.browser.redo, daemon=True).start()
+
     def dump_html(self):
         """Dump current page HTML for debugging."""
         threading.Thread(target=self.browser.dump_html, daemon=True).start()
@@ -421,17 +516,36 @@ class AssistantUI:
         threading.Thread(target=self.browser.dump_analysis, daemon=True).start()
 
     def poll_browser_state(self):
-        """Poll browser state and update UI."""
+        """Poll browser state and update UI.
+
+        The fetch runs on a background thread (with the daemon client it is a socket
+        round trip that a busy daemon can hold for seconds); the labels are updated
+        back on the Tk thread and the next poll is scheduled only after that.
+        """
+        def fetch():
+            try:
+                self.browser.refresh_state()
+                state = self.browser.get_state()
+            except Exception as e:
+                print(f'[POLL] ERROR: {e}')
+                state = None
+            try:
+                self.root.after(0, lambda: self._show_browser_state(state))
+            except Exception:
+                pass  # window already closed
+
+        threading.Thread(target=fetch, daemon=True, name='ui-poll').start()
+
+    def _show_browser_state(self, state):
+        """Put a polled state in the labels (Tk thread) and schedule the next poll."""
         try:
-            state = self.browser.get_state()
-            
-            if self.photo_label:  # Only update if it exists
+            if state and self.photo_label:  # Only update if it exists
                 url = state.get('url')
                 if url:
                     short = url.split('/')[-1]
                     self.photo_label.config(text=f'Photo: {short}')
             
-            if self.desc_label:  # Only update if it exists
+            if state and self.desc_label:  # Only update if it exists
                 desc = state.get('description')
                 if desc:
                     preview = desc if len(desc) < 200 else (desc[:197] + '...')
@@ -0,0 +1,68 @@
+"""Undo history - per-photo undo/redo stacks of description values, LRU-bounded over photos"""
+from collections import OrderedDict
+
+
+class UndoHistory:
+    """Description values before each edit, per photo, for one-write undo and redo.
+
+    Stacks hold whole description values, not keystrokes, so undoing any
+    edit is one replace however many characters differ. Photos are kept in
+    LRU order; past `max_photos` the least recently edited photo's history
+    is dropped, and each stack keeps at most `max_depth` values.
+    """
+
+    def __init__(self, max_photos=200, max_depth=50):
+        self.max_photos = max_photos
+        self.max_depth = max_depth
+        self._photos = OrderedDict()  # photo key -> {'undo': [...], 'redo': [...]}
+        self.evicted = 0
+
+    def _entry(self, key, create=True):
+        entry = self._photos.get(key)
+        if entry is None:
+            if not create:
+                return None
+            entry = self._photos[key] = {'undo': [], 'redo': []}
+            while len(self._photos) > self.max_photos:
+                self._photos.popitem(last=False)
+                self.evicted += 1
+        self._photos.move_to_end(key)
+        return entry
+
+    def record(self, key, before, after):
+        """A regular edit changed the description from `before` to `after`."""
+        if key is None or before is None or before == after:
+            return
+        entry = self._entry(key)
+        entry['undo'].append(before)
+        del entry['undo'][:-self.max_depth]
+        entry['redo'].clear()
+
+    def step(self, key, apply, redo=False):
+        """Undo (or redo) one edit on photo `key`.
+
+        Args:
+            apply: Called with the value to restore; returns the value it replaced, or None on failure
+        Returns:
+            The restored value, or None if there was nothing to undo or apply() failed
+        """
+        entry = self._entry(key, create=False)
+        source, dest = ('redo', 'undo') if redo else ('undo', 'redo')
+        if not entry or not entry[source]:
+            return None
+        target = entry[source].pop()
+        replaced = apply(target)
+        if replaced is None:
+            entry[source].append(target)
+            return None
+        entry[dest].append(replaced)
+        del entry[dest][:-self.max_depth]
+        return target
+
+    def depth(self, key):
+        """Return (undo steps, redo steps) available for photo `key`."""
+        entry = self._photos.get(key)
+        return (len(entry['undo']), len(entry['redo'])) if entry else (0, 0)
+
+    def __len__(self):
+        return len(self._photos)